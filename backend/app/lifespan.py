@@ -2,6 +2,7 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from backend.db.database import read_engine, write_engine
+from backend.core.security import check_api_key_pepper
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +10,8 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan context manager."""
     logger.info("Lifespan: Startup")
+    # 운영 환경에서 페퍼 없이 API 키 해시를 만들지 않도록 설정 확인
+    check_api_key_pepper()
     # Perform startup activities here, e.g., DB connection pool, cache init
     yield
     # Perform shutdown activities here, e.g., close DB connections
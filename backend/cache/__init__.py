@@ -2,10 +2,10 @@
 캐싱 시스템
 성능 최적화를 위한 다중 계층 캐싱 구현
 """
-from backend.cache.redis_cache import get_redis_client, RedisCache
+from backend.cache.redis_cache import get_redis_client, RedisCache, PipelinedCache
 from backend.cache.memory_cache import MemoryCache
 
-__all__ = ['get_redis_client', 'RedisCache', 'MemoryCache', 'get_cache_manager']
+__all__ = ['get_redis_client', 'RedisCache', 'PipelinedCache', 'MemoryCache', 'get_cache_manager']
 
 # 캐시 매니저 싱글톤 인스턴스
 _cache_manager = None
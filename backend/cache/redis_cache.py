@@ -399,6 +399,57 @@ class RedisCache:
             logger.error(f"Redis delete_pattern error for pattern {full_pattern}: {e}")
             return 0
 
+class PipelinedCache:
+    """
+    캐시 삭제 요청을 짧은 시간창 동안 모아 가변 인자 DEL 한 번으로 전송하는 래퍼
+
+    여러 플레이어의 잔액 캐시 무효화가 동시에 발생할 때 N번의 Redis 왕복을 1번으로 줄입니다.
+    delete 이외의 메서드는 감싼 캐시 객체에 그대로 위임합니다.
+    """
+
+    def __init__(self, cache: Any, window: float = 0.001):
+        """
+        Args:
+            cache: delete(*keys) 를 지원하는 캐시 객체 (예: RedisCache)
+            window: 삭제 요청을 모으는 시간(초)
+        """
+        self._cache = cache
+        self.window = window
+        self._pending: set = set()
+        self._flush_future: Optional[asyncio.Future] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cache, name)
+
+    async def delete(self, *keys: str) -> int:
+        """
+        키를 대기열에 추가하고, 해당 키가 포함된 DEL 이 전송될 때까지 기다립니다.
+
+        Returns:
+            int: 삭제된 키의 수. DEL 결과는 묶음 전체의 합계라 키별로 나눌 수 없으므로,
+                 여러 호출이 한 묶음에 합쳐진 경우 min(합계, 요청한 고유 키 수) 인 상한값입니다.
+        """
+        if not keys:
+            return 0
+        self._pending.update(keys)
+        if self._flush_future is None:
+            self._flush_future = asyncio.get_running_loop().create_future()
+            self._flush_task = asyncio.create_task(self._flush_after_window(self._flush_future))
+        deleted = await asyncio.shield(self._flush_future)
+        return min(deleted, len(set(keys)))
+
+    async def _flush_after_window(self, future: asyncio.Future) -> None:
+        await asyncio.sleep(self.window)
+        keys, self._pending = self._pending, set()
+        self._flush_future = None
+        try:
+            deleted = await self._cache.delete(*keys)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(deleted)
+
 # Cache Decorator
 def cache_result(
     key_prefix: str,
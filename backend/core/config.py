@@ -28,6 +28,7 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ENCRYPTION_KEY: Optional[str] = None # Fernet용 키
     AESGCM_KEY_B64: Optional[str] = None # AES-GCM용 키 (Base64 인코딩)
+    API_KEY_PEPPER: str = "" # API 키 조회용 해시의 서버 측 페퍼 (운영 환경(prod)에서는 반드시 설정, 비어 있으면 시작 실패)
     
     # CORS 설정
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -1,7 +1,12 @@
+import copy
 import logging
+import logging.handlers
 import json
+import queue
+import atexit
+import sys
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import uuid
 import traceback
 import inspect
@@ -181,10 +186,37 @@ class JsonFormatter(logging.Formatter):
             }
             return json.dumps(fallback_log)
 
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """레코드를 포맷하지 않고 큐에 넣는 QueueHandler
+
+    기본 QueueHandler.prepare() 는 호출 스레드(이벤트 루프)에서 레코드를 포맷하고 exc_info 를 지우므로
+    JsonFormatter 가 구조화된 exception 필드를 만들 수 없습니다. 여기서는 메시지 인자만 확정하고
+    exc_info 는 유지한 복사본을 넣어, 포맷팅은 QueueListener 스레드의 핸들러가 수행하게 합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # 인자 객체가 이후 변경되어도 로그 내용이 바뀌지 않도록 메시지만 미리 확정
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# queue_logging 사용 시 백그라운드에서 실제 핸들러로 레코드를 전달하는 리스너
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+@atexit.register
+def _stop_queue_listener():
+    """큐 리스너를 중지하고 남은 로그 레코드를 모두 내보냅니다."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
 def configure_logging(
     log_level: str = "INFO",
     json_logs: bool = True,
-    log_file: Optional[str] = None
+    log_file: Optional[str] = None,
+    queue_logging: bool = False
 ):
     """애플리케이션 로깅 설정
     
@@ -192,6 +224,8 @@ def configure_logging(
         log_level: 로그 레벨 문자열 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         json_logs: JSON 형식 로그 사용 여부
         log_file: 로그 파일 경로 (None이면 콘솔만 사용)
+        queue_logging: True 이면 루트 로거에는 QueueHandler 만 붙이고 실제 출력(stdout/파일 I/O)은
+            QueueListener 백그라운드 스레드에서 수행 (이벤트 루프 블로킹 방지)
     """
     log_level_int = getattr(logging, log_level.upper(), logging.INFO)
     
@@ -229,10 +263,22 @@ def configure_logging(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
     
-    # 모든 핸들러에 포맷터 적용 및 루트 로거에 추가
+    # 모든 핸들러에 포맷터 적용
     for handler in handlers:
         handler.setFormatter(formatter)
-        root_logger.addHandler(handler)
+
+    global _queue_listener
+    _stop_queue_listener()
+
+    if queue_logging:
+        # 루트 로거는 큐에 넣기만 하고, 포맷팅/출력은 리스너 스레드에서 처리
+        log_queue: queue.Queue = queue.Queue(-1)
+        root_logger.addHandler(DeferredFormatQueueHandler(log_queue))
+        _queue_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
     
     # 주요 라이브러리 로그 레벨 조정 (필요에 따라 변경)
     logging.getLogger("uvicorn.error").propagate = False # uvicorn 자체 핸들러 사용 방지
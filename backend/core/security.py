@@ -1,4 +1,6 @@
 from typing import Optional, Dict, Any
+import logging
+import os
 import hashlib
 import hmac
 import base64
@@ -16,6 +18,8 @@ from backend.core.config import settings
 from backend.db.database import read_session_factory
 from backend.core.exceptions import ValidationError
 
+logger = logging.getLogger(__name__)
+
 # 비밀번호 해싱을 위한 암호 컨텍스트
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -50,6 +54,42 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+def hash_api_key(api_key: str) -> str:
+    """
+    API 키 조회용 해시 (HMAC-SHA256, 서버 측 페퍼 사용)
+    
+    API 키는 충분히 무작위이므로 bcrypt 같은 느린 KDF 가 필요 없고,
+    같은 키는 항상 같은 값을 내므로 DB/캐시 조회 키로 쓸 수 있습니다.
+    
+    Args:
+        api_key: 평문 API 키
+        
+    Returns:
+        str: 64자 16진수 해시
+    """
+    return hmac.new(settings.API_KEY_PEPPER.encode(), api_key.encode(), hashlib.sha256).hexdigest()
+
+# API_KEY_PEPPER 가 반드시 설정되어야 하는 운영 환경 이름
+PRODUCTION_ENVIRONMENTS = frozenset({"prod", "production"})
+
+def check_api_key_pepper() -> None:
+    """
+    API_KEY_PEPPER 설정 확인 (애플리케이션 시작 시 호출)
+    
+    페퍼가 기본값("")이면 API 키 해시가 평범한 SHA-256 이 되므로 운영 환경에서는 시작을 막고,
+    로컬/개발 환경에서는 경고만 남깁니다.
+    
+    Raises:
+        RuntimeError: 운영 환경인데 API_KEY_PEPPER 가 비어 있는 경우
+    """
+    if settings.API_KEY_PEPPER:
+        return
+    environment = os.getenv("ENVIRONMENT", settings.ENVIRONMENT).lower()
+    if environment in PRODUCTION_ENVIRONMENTS:
+        raise RuntimeError("API_KEY_PEPPER must be set in production")
+    if environment != "test":
+        logger.warning("API_KEY_PEPPER is not set; API key hashes are unpeppered (%s environment)", environment)
+
 def generate_api_key(length: int = 32) -> str:
     """
     API 키 생성
@@ -13,9 +13,26 @@ from backend.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def _json_serializer(value) -> str:
+        # orjson 은 bytes 를 반환하므로 SQLAlchemy JSON 바인드 처리에 맞게 str 로 변환
+        return orjson.dumps(value).decode("utf-8")
+
+    _json_deserializer = orjson.loads
+except ImportError:
+    import json
+
+    logger.warning("orjson is not installed; falling back to stdlib json for JSON columns.")
+    _json_serializer = json.dumps
+    _json_deserializer = json.loads
+
 # 읽기 전용 및 쓰기 전용 엔진 생성 (URL 통합 및 없는 설정 제거)
 read_engine = create_async_engine(
     str(settings.SQLALCHEMY_DATABASE_URI), # URL 통합 및 문자열 변환
+    json_serializer=_json_serializer, # 트랜잭션 메타데이터 등 JSON/JSONB 컬럼 직렬화에 orjson 사용
+    json_deserializer=_json_deserializer,
     # echo=settings.DB_ECHO, # 존재하지 않는 설정 제거
     # pool_size=settings.DB_READ_POOL_SIZE, # 존재하지 않는 설정 제거
     # max_overflow=settings.DB_READ_MAX_OVERFLOW, # 존재하지 않는 설정 제거
@@ -26,6 +43,8 @@ read_engine = create_async_engine(
 
 write_engine = create_async_engine(
     str(settings.SQLALCHEMY_DATABASE_URI), # URL 통합 및 문자열 변환
+    json_serializer=_json_serializer, # 트랜잭션 메타데이터 등 JSON/JSONB 컬럼 직렬화에 orjson 사용
+    json_deserializer=_json_deserializer,
     # echo=settings.DB_ECHO, # 존재하지 않는 설정 제거
     # pool_size=settings.DB_WRITE_POOL_SIZE, # 존재하지 않는 설정 제거
     # max_overflow=settings.DB_WRITE_MAX_OVERFLOW, # 존재하지 않는 설정 제거
@@ -34,7 +34,8 @@ from backend.core.logging import configure_logging
 configure_logging(
     log_level=settings.LOG_LEVEL,
     json_logs=settings.JSON_LOGS, 
-    log_file=settings.LOG_FILE # 설정 파일에 JSON_LOGS와 LOG_FILE 정의 필요
+    log_file=settings.LOG_FILE, # 설정 파일에 JSON_LOGS와 LOG_FILE 정의 필요
+    queue_logging=True # 로그 I/O를 이벤트 루프 밖(QueueListener 스레드)에서 수행
 )
 
 logger = logging.getLogger(__name__) # 설정 후 로거 인스턴스 가져오기
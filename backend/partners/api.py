@@ -291,11 +291,12 @@ async def create_api_key(
         raise PermissionDeniedError("Permission denied to create API keys for this partner")
 
     # Service method handles NotFoundError if partner_id is invalid
-    created_key, secret = await service.create_api_key(partner_id, api_key_data)
+    created_key, plain_key, secret = await service.create_api_key(partner_id, api_key_data)
     
     # Combine the created key (DB model) and the secret into the response schema
+    # DB 에는 해시만 저장되므로 응답의 key 는 평문 키로 교체 (이번에만 제공)
     response_data = ApiKeyWithSecret(
-        **created_key.__dict__, # Convert model to dict for schema validation
+        **{**created_key.__dict__, "key": plain_key}, # Convert model to dict for schema validation
         secret=secret
     )
     logger.info(f"API Key {created_key.id} created for partner {partner_id} by {requesting_partner_id}")
@@ -1,9 +1,13 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
 
-from backend.core.dependencies import get_db  # Import from core dependencies
+from backend.core.dependencies import get_db, get_redis_client  # Import from core dependencies
 from backend.partners.service import PartnerService
 
-def get_partner_service(db: AsyncSession = Depends(get_db)) -> PartnerService:
+def get_partner_service(
+    db: AsyncSession = Depends(get_db),
+    redis_client: Redis = Depends(get_redis_client)
+) -> PartnerService:
     """PartnerService 의존성 주입 함수"""
-    return PartnerService(db=db) 
\ No newline at end of file
+    return PartnerService(db=db, redis_client=redis_client) 
\ No newline at end of file
@@ -4,12 +4,12 @@ Partner Domain Models (SQLAlchemy)
 from __future__ import annotations
 
 import enum
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional, Set, Dict, Any # Add Dict, Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Enum as EnumType, UniqueConstraint, text, Text # Add Text
-from sqlalchemy.orm import relationship, Mapped # Mapped needs to be imported
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, String, Enum as EnumType, UniqueConstraint, text, Text # Add Text
+from sqlalchemy.orm import relationship, Mapped, validates # Mapped needs to be imported
 from sqlalchemy.dialects.postgresql import UUID as PSQL_UUID, CIDR, JSONB
 
 # TODO: Update this import after moving Base and types
@@ -81,6 +81,7 @@ class ApiKey(Base):
     permissions: Mapped[Optional[List[str]]] = Column(JSONB, nullable=True) # Store permissions as JSON
     is_active: Mapped[bool] = Column(Boolean, default=True, nullable=False)
     expires_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
+    expires_at_epoch: Mapped[Optional[int]] = Column(BigInteger, nullable=True) # expires_at 의 UTC epoch 초 (인증 시 정수 비교용)
     last_used_at: Mapped[Optional[datetime]] = Column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=text("TIMEZONE('utc', now())"))
     updated_at: Mapped[datetime] = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, server_default=text("TIMEZONE('utc', now())"), server_onupdate=text("TIMEZONE('utc', now())"))
@@ -91,6 +92,16 @@ class ApiKey(Base):
     
     __table_args__ = (UniqueConstraint('key', name='uq_api_key_key'),)
 
+    @validates("expires_at")
+    def _sync_expires_at_epoch(self, key: str, value: Optional[datetime]) -> Optional[datetime]:
+        """expires_at 이 설정될 때 expires_at_epoch 도 함께 갱신합니다. (naive 값은 UTC 로 간주)"""
+        if value is None:
+            self.expires_at_epoch = None
+        else:
+            aware = value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+            self.expires_at_epoch = int(aware.timestamp())
+        return value
+
 
 class PartnerSetting(Base):
     """파트너 설정 모델 (Key-Value)"""
@@ -2,7 +2,7 @@
 파트너 데이터 접근 로직 (Repository)
 """
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 from uuid import UUID
 
 from sqlalchemy import select, update, delete, func
@@ -149,6 +149,17 @@ class PartnerRepository(BaseRepository[PartnerModel]):
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
         
+    async def get_active_api_key_with_partner_by_hash(self, key_hash: str) -> Optional[Tuple[ApiKeyModel, PartnerModel]]:
+        """해시로 활성 API 키와 소속 파트너를 JOIN 쿼리 한 번으로 조회 (파트너 상태 검증은 호출자 몫)"""
+        stmt = (
+            select(ApiKeyModel, PartnerModel)
+            .join(PartnerModel, PartnerModel.id == ApiKeyModel.partner_id)
+            .where(ApiKeyModel.key == key_hash, ApiKeyModel.is_active == True)
+        )
+        result = await self.db.execute(stmt)
+        row = result.first()
+        return (row[0], row[1]) if row else None
+        
     async def get_api_keys_by_partner(self, partner_id: UUID, active_only: bool = True) -> List[ApiKeyModel]:
         stmt = select(ApiKeyModel).where(ApiKeyModel.partner_id == partner_id)
         if active_only:
@@ -220,6 +231,15 @@ class PartnerRepository(BaseRepository[PartnerModel]):
         result = await self.db.execute(stmt)
         return result.scalars().all()
         
+    async def get_allowed_ips(self, partner_id: UUID) -> FrozenSet[str]:
+        """파트너의 활성 허용 IP/CIDR 문자열 집합 조회 (IP 화이트리스트 검증용)"""
+        stmt = select(PartnerIPModel.ip_address).where(
+            PartnerIPModel.partner_id == partner_id,
+            PartnerIPModel.is_active == True
+        )
+        result = await self.db.execute(stmt)
+        return frozenset(result.scalars().all())
+
     async def delete_partner_ip(self, ip_entry: PartnerIPModel) -> bool:
         await self.db.delete(ip_entry)
         await self.db.flush()
@@ -10,6 +10,8 @@ import secrets
 import hashlib
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from fastapi import HTTPException, status
 
 # --- Updated Imports --- 
@@ -25,7 +27,7 @@ from backend.partners.schemas import (
     Partner, ApiKey, PartnerSetting, PartnerIP, # BaseService에서 사용할 Partner 스키마
     Partner as PartnerSchema # 명확성을 위해 PartnerSchema 로 alias 사용 가능
 )
-from backend.core.security import generate_api_secret, get_password_hash, verify_password
+from backend.core.security import generate_api_secret, get_password_hash, verify_password, hash_api_key
 from backend.core.exceptions import (
     PartnerAlreadyExistsError, PartnerNotFoundError, InvalidInputError,
     APIKeyGenerationError, DatabaseError, AuthorizationError, ConflictError, 
@@ -50,6 +52,10 @@ def get_model_dict(model):
         return {k: getattr(model, k) for k in dir(model)
                 if not k.startswith('_') and not callable(getattr(model, k))}
 
+def allowed_ips_cache_key(partner_id: UUID) -> str:
+    """파트너 허용 IP 목록 캐시 키 (AuthService 가 채우고 IP 추가/삭제 시 삭제)"""
+    return f"partner:{partner_id}:allowed_ips"
+
 class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, PartnerUpdate]):
     """파트너 관련 비즈니스 로직 (BaseService 상속)"""
     
@@ -59,7 +65,7 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
     not_found_exception_class = PartnerNotFoundError
     # id_field = "id" # 기본값이 id 이므로 생략 가능
     
-    def __init__(self, db: AsyncSession = None, partner_repo: PartnerRepository = None):
+    def __init__(self, db: AsyncSession = None, partner_repo: PartnerRepository = None, redis_client: Optional[Redis] = None):
         # Initialize BaseService first
         super().__init__(
             db=db,
@@ -70,6 +76,8 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
         )
         # Inject or create repository
         self.partner_repo = partner_repo or (PartnerRepository(db) if db else None)
+        # 허용 IP 캐시 무효화용 (없으면 캐시 TTL 이 지나야 변경이 반영됨)
+        self.redis = redis_client
         if not self.partner_repo:
              logger.error("PartnerRepository could not be initialized in PartnerService.")
              # 혹은 raise Exception? 서비스 초기화 실패는 심각할 수 있음
@@ -246,18 +254,19 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
 
     # --- Partner 특화 기능들 (기존 코드 유지) --- 
 
-    async def create_api_key(self, partner_id: UUID, api_key_data: ApiKeyCreate) -> Tuple[ApiKeyModel, str]:
-        """새 API 키 생성 및 비밀 키 반환"""
+    async def create_api_key(self, partner_id: UUID, api_key_data: ApiKeyCreate) -> Tuple[ApiKeyModel, str, str]:
+        """새 API 키 생성 후 (모델, 평문 API 키, 평문 비밀 키) 반환 (DB 에는 API 키의 조회용 해시만 저장)"""
         partner = await self.get_or_404(partner_id) # Use BaseService method
         
         key_prefix = f"bk_{partner.code[:4]}_"
         api_key_str = key_prefix + secrets.token_urlsafe(32)
-        secret, hashed_secret = generate_api_secret()
+        secret = generate_api_secret()
+        hashed_secret = get_password_hash(secret) # 시크릿은 조회 키가 아니므로 bcrypt 로 검증
         
         key_dict = api_key_data.model_dump()
         key_dict.update({
             "partner_id": partner_id,
-            "key": api_key_str,
+            "key": hash_api_key(api_key_str),
             "hashed_secret": hashed_secret,
             "is_active": True
         })
@@ -267,7 +276,7 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
         try:
             created_key = await self.partner_repo.create_api_key(new_api_key)
             logger.info(f"Created new API key {created_key.id} for partner {partner_id}")
-            return created_key, secret # Return model instance and plain secret
+            return created_key, api_key_str, secret # Return model instance, plain key and plain secret
         except Exception as e:
             logger.error(f"Database error creating API key for partner {partner_id}: {e}", exc_info=True)
             raise APIKeyGenerationError("Failed to save new API key.") from e
@@ -302,7 +311,7 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
             
     async def validate_api_key(self, key_str: str, secret_str: str) -> Optional[PartnerSchema]:
         """API 키와 시크릿 검증 후 활성 파트너 반환"""
-        api_key = await self.partner_repo.get_api_key_by_key(key_str)
+        api_key = await self.partner_repo.get_api_key_by_key(hash_api_key(key_str))
         
         if not api_key or not api_key.is_active:
             logger.debug(f"API key validation failed: Key not found or inactive ({key_str[:10]}...)")
@@ -388,6 +397,19 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
 
     # --- Partner IP Whitelist Management --- 
 
+    async def _invalidate_allowed_ips_cache(self, partner_id: UUID) -> None:
+        """허용 IP 목록 캐시를 삭제해 다음 인증부터 변경된 화이트리스트가 적용되게 합니다.
+
+        DB 변경은 이미 반영된 뒤 호출되므로 Redis 오류는 로깅만 하고 전파하지 않습니다 (캐시는 TTL 로 만료).
+        """
+        if self.redis is None:
+            logger.warning(f"No Redis client; allowed IPs cache for partner {partner_id} expires by TTL only")
+            return
+        try:
+            await self.redis.delete(allowed_ips_cache_key(partner_id))
+        except RedisError as e:
+            logger.error(f"Failed to invalidate allowed IPs cache for partner {partner_id}; it expires by TTL: {e}")
+
     async def add_partner_ip(self, partner_id: UUID, ip_data: PartnerIPCreate) -> PartnerIPModel:
         """파트너 IP 화이트리스트에 추가"""
         await self.get_or_404(partner_id) # Ensure partner exists
@@ -409,12 +431,15 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
         
         try:
             created_ip = await self.partner_repo.create_partner_ip(new_ip)
-            logger.info(f"Added IP {created_ip.ip_address} to whitelist for partner {partner_id}")
-            return created_ip
         except Exception as e:
             logger.error(f"Database error adding IP {ip_data.ip_address} for partner {partner_id}: {e}", exc_info=True)
             raise DatabaseError("Failed to add IP address.") from e
 
+        # DB 추가가 끝난 뒤 캐시 무효화 (캐시 오류가 생성 실패로 바뀌지 않도록 try 블록 밖에서 수행)
+        await self._invalidate_allowed_ips_cache(partner_id)
+        logger.info(f"Added IP {created_ip.ip_address} to whitelist for partner {partner_id}")
+        return created_ip
+
     async def remove_partner_ip(self, partner_id: UUID, ip_id: UUID) -> bool:
         """파트너 IP 화이트리스트에서 제거 (ID 기준, 권한 확인은 API 레이어)"""
         ip_entry = await self.partner_repo.get_partner_ip_by_id(ip_id)
@@ -428,17 +453,18 @@ class PartnerService(BaseService[PartnerModel, PartnerSchema, PartnerCreate, Par
             # success = await self.partner_repo.update_partner_ip(ip_entry, {"is_active": False})
             # Option 2: Hard delete
             success = await self.partner_repo.delete_partner_ip(ip_entry)
-            
-            if success:
-                logger.info(f"Removed IP entry {ip_id} ({ip_entry.ip_address}) from whitelist for partner {partner_id}")
-                return True
-            else:
-                logger.error(f"Failed to remove IP entry {ip_id} in repository.")
-                return False
         except Exception as e:
             logger.error(f"Database error removing IP entry {ip_id} for partner {partner_id}: {e}", exc_info=True)
             raise DatabaseError("Failed to remove IP address.") from e
 
+        if not success:
+            logger.error(f"Failed to remove IP entry {ip_id} in repository.")
+            return False
+        # 삭제된 IP 가 캐시에 남아 계속 허용되지 않도록 즉시 무효화 (DB try 블록 밖에서 수행)
+        await self._invalidate_allowed_ips_cache(partner_id)
+        logger.info(f"Removed IP entry {ip_id} ({ip_entry.ip_address}) from whitelist for partner {partner_id}")
+        return True
+
     async def list_partner_ips(self, partner_id: UUID) -> List[PartnerIPModel]:
         """파트너의 활성 IP 화이트리스트 조회"""
         await self.get_or_404(partner_id) # Ensure partner exists
@@ -2,7 +2,8 @@
 지갑 데이터 접근 로직 (Repository)
 """
 import logging
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, timezone
@@ -47,7 +48,31 @@ class WalletRepository:
     async def get_player_wallet(self, player_id: UUID, partner_id: UUID, for_update: bool = False) -> Optional[Wallet]:
         """get_wallet_by_player_id의 별칭입니다. 테스트 코드 호환성을 위해 추가합니다."""
         return await self.get_wallet_by_player_id(player_id, partner_id, for_update=for_update)
-        
+
+    async def get_player_wallet_or_none(self, player_id: UUID, partner_id: UUID) -> Optional[Wallet]:
+        """플레이어 ID와 파트너 ID로 지갑을 조회하고, 없으면 None을 반환합니다. (지갑 생성 전 존재 여부 확인용)"""
+        return await self.get_wallet_by_player_id(player_id, partner_id)
+
+    async def get_wallet_by_id(self, wallet_id: UUID, for_update: bool = False) -> Optional[Wallet]:
+        """지갑 ID로 지갑 정보를 조회합니다.
+
+        Args:
+            wallet_id: 지갑 ID
+            for_update: SELECT ... FOR UPDATE 잠금을 사용할지 여부
+        """
+        stmt = select(Wallet).where(Wallet.id == wallet_id)
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def create_wallet(self, wallet: Wallet) -> Wallet:
+        """새 지갑을 생성합니다."""
+        self.session.add(wallet)
+        await self.session.flush()
+        await self.session.refresh(wallet)
+        return wallet
+
     async def create_transaction(self, transaction: Transaction) -> Transaction:
         """새 트랜잭션을 생성합니다."""
         # 실제 구현 필요
@@ -131,4 +156,63 @@ class WalletRepository:
              logger.info(f"Wallet {wallet_id} balance updated to {new_balance}")
         await self.session.flush()
 
+    async def try_debit(
+        self,
+        player_id: UUID,
+        currency: str,
+        amount: Decimal,
+        partner_id: Optional[UUID] = None
+    ) -> Optional[Decimal]:
+        """잔액이 충분한 경우에만 원자적으로 차감합니다. (조건부 UPDATE ... RETURNING)
+
+        잔액 조회 후 차감하는 방식과 달리 동시 출금에서도 잔액이 음수가 되지 않으며,
+        DB 왕복이 한 번으로 끝납니다.
+
+        Args:
+            player_id: 플레이어 ID
+            currency: 통화 코드
+            amount: 차감할 금액
+            partner_id: 파트너 ID (지정 시 해당 파트너의 지갑만 대상)
+
+        Returns:
+            차감 후 잔액. 지갑이 없거나 잔액이 부족하면 None
+        """
+        conditions = [
+            Wallet.player_id == player_id,
+            Wallet.currency == currency,
+            Wallet.balance >= amount,
+        ]
+        if partner_id is not None:
+            conditions.append(Wallet.partner_id == partner_id)
+        stmt = (
+            update(Wallet)
+            .where(*conditions)
+            .values(balance=Wallet.balance - amount, updated_at=datetime.now(timezone.utc))
+            .returning(Wallet.balance)
+        )
+        result = await self.session.execute(stmt)
+        new_balance = result.scalar_one_or_none()
+        if new_balance is None:
+            logger.debug(f"Conditional debit not applied for player {player_id} ({currency}).")
+        return new_balance
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["WalletRepository"]:
+        """이 저장소의 세션(단일 커넥션)에서 DB 트랜잭션 범위를 엽니다.
+
+        범위 안의 조회/생성/갱신은 같은 커넥션과 트랜잭션을 사용하며, 예외 시 롤백됩니다.
+        이미 트랜잭션이 진행 중이면 SAVEPOINT 로 중첩합니다.
+
+        사용 예:
+            async with wallet_repo.transaction() as txn:
+                wallet = await txn.get_wallet_by_id(wallet_id, for_update=True)
+                await txn.update_wallet_balance(wallet_id, new_balance)
+        """
+        if self.session.in_transaction():
+            async with self.session.begin_nested():
+                yield self
+        else:
+            async with self.session.begin():
+                yield self
+
     # ... 기타 필요한 Wallet 및 Transaction 관련 CRUD 메서드 추가 
\ No newline at end of file
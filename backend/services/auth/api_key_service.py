@@ -1,3 +1,4 @@
+import hmac
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
@@ -10,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 # 도메인 모델
 from backend.partners.models import ApiKey, Partner
-from backend.core.security import generate_api_key, get_password_hash, verify_password
+from backend.core.security import generate_api_key, hash_api_key
 from backend.core.exceptions import PartnerNotFoundError, APIKeyNotFoundError, AuthorizationError, NotFoundError, ConflictError, DatabaseError
 from backend.db.database import get_db # Corrected import path
 from backend.core import security # Corrected path
@@ -185,7 +186,7 @@ class APIKeyService:
         #     raise ValueError(f"Partner {partner_id} is inactive. Cannot create API key.")
 
         api_key_secret = generate_api_key() # 실제 클라이언트에게 전달될 시크릿
-        hashed_key = get_password_hash(api_key_secret) # DB에 저장될 해시된 시크릿
+        hashed_key = hash_api_key(api_key_secret) # DB에 저장될 조회용 해시 (AuthService.authenticate_api_key 와 동일)
         expires_at = datetime.now(timezone.utc) + timedelta(days=API_KEY_EXPIRY_DAYS)
 
         # 생성자 정보 설정
@@ -193,7 +194,7 @@ class APIKeyService:
 
         db_api_key = ApiKey(
             partner_id=partner_id,
-            hashed_key=hashed_key,
+            key=hashed_key,
             name=name,
             description=description,
             permissions=permissions if permissions else [],
@@ -467,7 +468,7 @@ async def get_current_api_key(
         raise credentials_exception
 
     # 비밀번호(시크릿) 검증
-    if not verify_password(x_api_key_secret, api_key.hashed_key):
+    if not hmac.compare_digest(hash_api_key(x_api_key_secret), api_key.key):
         logger.warning(f"Invalid secret provided for API Key: {key_id}")
         # 실패 시 사용 기록? 보안상 고려 필요
         raise credentials_exception
@@ -2,9 +2,12 @@
 인증 서비스
 API 키 인증, 권한 관리 등 비즈니스 로직 담당
 """
+import functools
+import json
 import logging
+import time
 from uuid import UUID
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, FrozenSet
 from datetime import datetime, timedelta, timezone
 import ipaddress
 
@@ -14,8 +17,8 @@ from redis.asyncio import Redis
 
 from backend.partners.models import Partner, PartnerStatus, ApiKey
 from backend.partners.repository import PartnerRepository
-from backend.partners.service import PartnerService
-from backend.core.security import get_password_hash, verify_password, create_access_token, verify_access_token
+from backend.partners.service import PartnerService, allowed_ips_cache_key
+from backend.core.security import hash_api_key, verify_password, create_access_token, verify_access_token
 from backend.core.config import settings
 from backend.core.exceptions import AuthenticationError, AuthorizationError, InvalidCredentialsError, NotAllowedIPError, PermissionDeniedError
 from backend.cache.redis_cache import get_redis_client
@@ -24,13 +27,29 @@ from backend.utils.permissions import check_permission
 
 logger = logging.getLogger(__name__)
 
+# 파트너 허용 IP 목록 캐시 TTL (초). IP 추가/삭제 시에는 PartnerService 가 캐시를 즉시 삭제합니다.
+ALLOWED_IPS_CACHE_TTL = 300
+
+@functools.lru_cache(maxsize=256)
+def _allowed_networks(allowed_ips: FrozenSet[str]) -> Tuple[Any, ...]:
+    """허용 목록 중 CIDR 항목을 ip_network 객체로 한 번만 변환합니다. (허용 목록별 캐시)"""
+    networks = []
+    for entry in allowed_ips:
+        if "/" not in entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning(f"Invalid IP network format: {entry}")
+    return tuple(networks)
+
 class AuthService:
     """인증 서비스"""
     
     def __init__(self, db: AsyncSession, redis_client: Redis):
         self.db = db
         self.partner_repo = PartnerRepository(db)
-        self.partner_service = PartnerService(db)
+        self.partner_service = PartnerService(db, redis_client=redis_client)
         self.redis = redis_client
     
     async def authenticate_api_key(self, api_key: str) -> Tuple[ApiKey, Partner]:
@@ -46,8 +65,8 @@ class AuthService:
         Raises:
             AuthenticationError: 인증 실패 시
         """
-        # Calculate hash once
-        hashed_key = get_password_hash(api_key)
+        # Calculate hash once (fast keyed SHA-256, not a password KDF)
+        hashed_key = hash_api_key(api_key)
         cache_key = f"api_key:{hashed_key}"
         cached_data = await self.redis.get(cache_key)
 
@@ -69,14 +88,11 @@ class AuthService:
                 await self.redis.delete(cache_key)
 
         if not api_key_obj or not partner:
-            # Cache miss or invalid cache data, lookup in DB by hashed key
-            api_key_obj = await self.partner_repo.get_active_api_key_by_hash(hashed_key)
-            if not api_key_obj:
+            # Cache miss or invalid cache data, lookup API key and partner in one JOIN query
+            row = await self.partner_repo.get_active_api_key_with_partner_by_hash(hashed_key)
+            if not row:
                 raise AuthenticationError("Invalid or inactive API key")
-            partner = await self.partner_repo.get_partner_by_id(api_key_obj.partner_id)
-            if not partner:
-                 # This case should ideally not happen if DB constraints are correct
-                 raise AuthenticationError("Partner associated with API key not found")
+            api_key_obj, partner = row
             # Optionally, update cache here if cache miss
             # Use a simple cache value like the api_key_id string for this example
             cache_value = str(api_key_obj.id) 
@@ -88,17 +104,16 @@ class AuthService:
         if not api_key_obj.is_active:
              raise AuthenticationError("API key is inactive")
 
-        # Expiry check
-        if api_key_obj.expires_at:
-            # Ensure both are timezone-aware (UTC)
-            now_utc = datetime.now(timezone.utc)
+        # Expiry check (expires_at 과 함께 저장된 epoch 초를 정수 비교, datetime 생성 없음)
+        expires_at_epoch = api_key_obj.expires_at_epoch
+        if expires_at_epoch is None and api_key_obj.expires_at is not None:
+            # ORM 밖에서 기록되었거나 backfill 전인 행은 epoch 이 비어 있으므로 expires_at 으로 계산
             expires_at = api_key_obj.expires_at
-            # If expires_at is naive, assume UTC
             if expires_at.tzinfo is None:
                 expires_at = expires_at.replace(tzinfo=timezone.utc)
-            
-            if expires_at <= now_utc:
-                 raise AuthenticationError("API key has expired")
+            expires_at_epoch = expires_at.timestamp()
+        if expires_at_epoch is not None and expires_at_epoch <= time.time():
+            raise AuthenticationError("API key has expired")
 
         # Partner status check (Modified as requested)
         if partner.status != PartnerStatus.ACTIVE and partner.status != "active":
@@ -138,13 +153,17 @@ class AuthService:
         Raises:
             NotAllowedIPError: 허용되지 않은 IP 접근 시
         """
-        # 파트너의 허용 IP 목록 조회
-        allowed_ips = await self.partner_repo.get_allowed_ips(partner_id)
+        # 파트너의 허용 IP 목록 조회 (Redis 캐시 우선)
+        allowed_ips = await self._get_allowed_ips(partner_id)
         
         # IP 화이트리스트가 없으면 모든 IP 허용
         if not allowed_ips:
             return True
         
+        # 단일 IP는 집합 조회 한 번으로 확인
+        if client_ip in allowed_ips:
+            return True
+        
         # IP 주소 객체 생성
         try:
             client_ip_obj = ipaddress.ip_address(client_ip)
@@ -152,26 +171,36 @@ class AuthService:
             logger.warning(f"Invalid IP address format: {client_ip}")
             raise NotAllowedIPError("Invalid IP address format")
         
-        # 허용 IP/네트워크 확인
-        for ip in allowed_ips:
-            # CIDR 형식인지 확인
-            if "/" in ip.ip_address:
-                # 네트워크 범위 확인
-                try:
-                    network = ipaddress.ip_network(ip.ip_address, strict=False)
-                    if client_ip_obj in network:
-                        return True
-                except ValueError:
-                    logger.warning(f"Invalid IP network format: {ip.ip_address}")
-                    continue
-            else:
-                # 단일 IP 비교
-                if ip.ip_address == client_ip:
-                    return True
+        # 집합 조회에 실패한 경우에만 CIDR 네트워크 범위 확인
+        if any(client_ip_obj in network for network in _allowed_networks(allowed_ips)):
+            return True
         
         # 허용된 IP가 없음
         raise NotAllowedIPError(f"IP {client_ip} not in whitelist for partner {partner_id}")
     
+    async def _get_allowed_ips(self, partner_id: UUID) -> FrozenSet[str]:
+        """
+        파트너 허용 IP 목록 조회 (캐시 미스 시 DB 조회 후 JSON 리스트로 캐시)
+        
+        Args:
+            partner_id: 파트너 ID
+            
+        Returns:
+            FrozenSet[str]: 허용 IP/CIDR 문자열 집합
+        """
+        cache_key = allowed_ips_cache_key(partner_id)
+        cached_data = await self.redis.get(cache_key)
+        if cached_data is not None:
+            try:
+                return frozenset(json.loads(cached_data))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Invalid allowed IPs cache for partner {partner_id}: {e}")
+                await self.redis.delete(cache_key)
+        
+        allowed_ips = frozenset(await self.partner_repo.get_allowed_ips(partner_id))
+        await self.redis.set(cache_key, json.dumps(sorted(allowed_ips)), ex=ALLOWED_IPS_CACHE_TTL)
+        return allowed_ips
+    
     async def check_permission(self, api_key: ApiKey, required_permission: str) -> bool:
         """
         권한 확인
@@ -267,7 +296,7 @@ class AuthService:
     async def get_valid_api_key(self, partner_id: UUID, api_key: str) -> Optional[ApiKey]:
         """유효한 API 키 정보를 조회합니다."""
         # 실제 DB 조회 로직 필요
-        key_hash = get_password_hash(api_key)
+        key_hash = hash_api_key(api_key)
         
         # 예시: 해시된 키로 조회 (실제 구현 필요)
         # result = await self.db.execute(
@@ -3,6 +3,7 @@
 트랜잭션 처리, 잔액 관리 등 비즈니스 로직 담당
 """
 import logging
+from functools import lru_cache
 from uuid import UUID, uuid4
 from decimal import Decimal, InvalidOperation
 from typing import Optional, Dict, Any, List, Tuple, Callable, Type
@@ -39,6 +40,12 @@ logger = logging.getLogger(__name__)
 # 타입 힌트용 세션 팩토리 타입 정의
 AsyncSessionFactory = Callable[[], AsyncSession]
 
+
+@lru_cache(maxsize=4096)
+def _wallet_cache_key(player_id: UUID, partner_id: UUID) -> str:
+    """ 지갑 캐시 키 생성 (플레이어/파트너 ID의 순수 함수이므로 캐싱) """
+    return f"wallet:{partner_id}:{player_id}"
+
 class WalletService:
     """향상된 지갑 서비스 - WalletRepository 주입"""
     
@@ -583,7 +590,7 @@ class WalletService:
 
     def _generate_wallet_cache_key(self, player_id: UUID, partner_id: UUID) -> str:
         """ 지갑 캐시 키 생성 """
-        return f"wallet:{partner_id}:{player_id}"
+        return _wallet_cache_key(player_id, partner_id)
 
     async def invalidate_wallet_cache(self, player_id: UUID, partner_id: UUID) -> None:
         """ 지갑 캐시 무효화 """
@@ -1,3 +1,4 @@
+import functools
 import os
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -36,33 +37,85 @@ logger = logging.getLogger(__name__)
 # _ENCRYPTION_KEY 사용 전 None 체크 필요
 # 예: if _ENCRYPTION_KEY is None: raise ValueError("Encryption key is not configured or invalid.")
 
+def _check_aes_gcm_backend() -> bool:
+    """OpenSSL 백엔드가 AES-256-GCM(EVP_aes_256_gcm)을 지원하는지 확인합니다.
+
+    OpenSSL 은 CPU 가 지원하면 AES-NI/PCLMULQDQ 경로를 자동으로 사용하며,
+    GCM 태그 검증도 OpenSSL 내부에서 상수 시간으로 수행됩니다.
+    """
+    try:
+        supported = default_backend().aead_cipher_supported(AESGCM(bytes(32)))
+    except Exception as e:
+        logger.warning(f"Could not verify AES-GCM support in the OpenSSL backend: {e}")
+        return False
+    if not supported:
+        logger.warning("OpenSSL backend does not support AES-256-GCM. AES-GCM operations may fail.")
+    return supported
+
+_check_aes_gcm_backend()
+
+@functools.lru_cache(maxsize=4)
+def _aesgcm_for(key: bytes) -> AESGCM:
+    """키별 AESGCM 인스턴스를 재사용합니다. (호출마다 키 스케줄을 다시 만들지 않음)"""
+    return AESGCM(key)
+
+@functools.lru_cache(maxsize=8)
+def _fernet_for(key: bytes) -> Fernet:
+    """키별 Fernet 인스턴스를 재사용합니다. (DataEncryptor 생성마다 키를 다시 파싱하지 않음)"""
+    return Fernet(key)
+
+@functools.lru_cache(maxsize=4)
+def _decode_key(key_b64: str) -> Optional[bytes]:
+    """Base64 키를 디코딩하고 길이를 확인합니다. 키 값별로 한 번만 수행됩니다."""
+    try:
+        # 키 값 앞뒤 공백 제거 추가
+        key_bytes = base64.urlsafe_b64decode(key_b64.strip())
+    except (TypeError, base64.binascii.Error) as e:
+        logger.error(f"AESGCM_KEY_B64 is not valid base64: {e}")
+        return None
+    logger.debug(f"Decoded key length: {len(key_bytes)} bytes")
+    if len(key_bytes) != 32: # AES-256 key
+        logger.error("AESGCM_KEY_B64 is not 32 bytes after base64 decoding.")
+        return None
+    return key_bytes
+
+# set_aes_gcm_key 로 주입된 키 (설정/환경 변수보다 우선)
+_aes_gcm_key_override: Optional[bytes] = None
+
+def set_aes_gcm_key(key_bytes: Optional[bytes]) -> None:
+    """AES-GCM 키를 직접 주입합니다. None 이면 설정/환경 변수에서 읽는 기본 동작으로 돌아갑니다.
+
+    Raises:
+        ValueError: 키가 32바이트가 아닌 경우
+    """
+    global _aes_gcm_key_override
+    if key_bytes is not None and len(key_bytes) != 32:
+        raise ValueError("AES-GCM key must be 32 bytes (AES-256).")
+    _aes_gcm_key_override = key_bytes
+
+def reset_key_cache() -> None:
+    """디코딩된 키와 AESGCM/Fernet 인스턴스 캐시를 비웁니다. (키 교체 또는 테스트 정리용)"""
+    _decode_key.cache_clear()
+    _aesgcm_for.cache_clear()
+    _fernet_for.cache_clear()
+
 def _get_aes_gcm_key() -> Optional[bytes]:
     """Retrieves the AES-GCM key from settings. Returns None if unavailable or invalid."""
+    if _aes_gcm_key_override is not None:
+        return _aes_gcm_key_override
+
     # Pydantic 설정을 통해 로드된 키 사용
     key_b64 = settings.AESGCM_KEY_B64 
-    source = "settings.AESGCM_KEY_B64"
     
     # 설정에 없으면 os.getenv 시도 (Fallback, 권장하지 않음)
     if not key_b64:
         key_b64 = os.getenv("AESGCM_KEY_B64")
-        source = "os.getenv('AESGCM_KEY_B64')"
         logger.warning("AESGCM_KEY_B64 not found in settings, falling back to os.getenv.")
         
-    logger.debug(f"Read AESGCM_KEY_B64 from {source}: '{key_b64}'")
-    if key_b64:
-        try:
-            # 키 값 앞뒤 공백 제거 추가
-            key_bytes = base64.urlsafe_b64decode(key_b64.strip())
-            logger.debug(f"Decoded key length: {len(key_bytes)} bytes")
-            if len(key_bytes) == 32: # AES-256 key
-                return key_bytes
-            else:
-                logger.error(f"AESGCM_KEY_B64 from {source} is not 32 bytes after base64 decoding.")
-        except (TypeError, base64.binascii.Error) as e:
-            logger.error(f"AESGCM_KEY_B64 ('{key_b64}') from {source} is not valid base64: {e}")
-    
-    logger.error("AESGCM_KEY_B64 is not set or invalid. AES-GCM operations will fail.") # 에러 레벨로 변경
-    return None
+    key = _decode_key(key_b64) if key_b64 else None
+    if key is None:
+        logger.error("AESGCM_KEY_B64 is not set or invalid. AES-GCM operations will fail.") # 에러 레벨로 변경
+    return key
 
 def encrypt_aes_gcm(plaintext: str) -> Optional[str]:
     """AES-GCM을 사용하여 평문을 암호화합니다."""
@@ -72,7 +125,7 @@ def encrypt_aes_gcm(plaintext: str) -> Optional[str]:
         return None
 
     try:
-        aesgcm = AESGCM(key)
+        aesgcm = _aesgcm_for(key)
         nonce = os.urandom(12)  # 96-bit nonce recommended for AES-GCM
         plaintext_bytes = str(plaintext).encode('utf-8')
         ciphertext = aesgcm.encrypt(nonce, plaintext_bytes, None)
@@ -121,8 +174,8 @@ def decrypt_aes_gcm(encrypted_data: Any) -> Optional[str]:
         nonce = decoded_data[:12]  # First 12 bytes are nonce
         ciphertext = decoded_data[12:]
 
-        # Decrypt using AESGCM
-        aesgcm = AESGCM(key)
+        # Decrypt using AESGCM (태그 불일치 시 InvalidTag)
+        aesgcm = _aesgcm_for(key)
         plaintext_bytes = aesgcm.decrypt(nonce, ciphertext, None)
         return plaintext_bytes.decode('utf-8')
 
@@ -211,8 +264,8 @@ class DataEncryptor:
         
         try:
             # Fernet 생성자는 Base64 인코딩된 키의 bytes 버전을 기대합니다.
-            # 키 형식 자체의 유효성 검사는 Fernet 생성자가 수행합니다.
-            self.cipher = Fernet(effective_key.encode('utf-8'))
+            # 키 형식 자체의 유효성 검사는 Fernet 생성자가 수행합니다. (같은 키는 캐시된 인스턴스 공유)
+            self.cipher = _fernet_for(effective_key.encode('utf-8'))
         except (ValueError, TypeError) as e:
             # Fernet 생성자가 키 형식 오류를 발생시킬 수 있음
             logger.error(f"Failed to initialize Fernet cipher with the provided key: {e}")
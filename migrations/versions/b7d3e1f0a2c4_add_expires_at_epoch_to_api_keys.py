@@ -0,0 +1,31 @@
+"""Add expires_at_epoch to api_keys table
+
+Revision ID: b7d3e1f0a2c4
+Revises: aea0e9746b83
+Create Date: 2026-10-16 20:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f0a2c4'
+down_revision: Union[str, None] = 'aea0e9746b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('api_keys', sa.Column('expires_at_epoch', sa.BigInteger(), nullable=True))
+    # 기존 키의 만료 시각을 epoch 초로 채움
+    op.execute(
+        "UPDATE api_keys SET expires_at_epoch = CAST(EXTRACT(EPOCH FROM expires_at) AS BIGINT) "
+        "WHERE expires_at IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('api_keys', 'expires_at_epoch')
@@ -0,0 +1,61 @@
+"""Rehash api_keys.key with peppered SHA-256
+
+Revision ID: c5a9d2e8f413
+Revises: b7d3e1f0a2c4
+Create Date: 2026-10-16 21:30:00.000000
+
+API 키 조회가 hash_api_key(HMAC-SHA256 + API_KEY_PEPPER)로 바뀌어 기존 행을 변환합니다.
+- 평문으로 저장된 키(PartnerService 발급분)는 해시로 교체합니다. 클라이언트는 같은 키를 계속 사용합니다.
+- bcrypt 해시로 저장된 키는 원문을 알 수 없어 변환할 수 없으므로 비활성화(is_active = false)합니다.
+
+되돌릴 수 없는 변경입니다:
+- downgrade 는 아무것도 하지 않습니다. 해시에서 평문 키를 복원할 수 없고, 비활성화한 bcrypt 키도
+  다시 활성화하지 않습니다 (다시 활성화해도 새 조회 방식으로는 검증되지 않음).
+- 비활성화된 키를 쓰던 파트너는 API 키 교체(rotate) 또는 재발급이 필요합니다. 실행 전에
+  `SELECT partner_id FROM api_keys WHERE key LIKE '$2%' AND is_active` 로 대상 파트너를 확인하고 공지하세요.
+- 운영과 같은 API_KEY_PEPPER 로 실행해야 합니다. 변환할 행이 있는데 페퍼가 비어 있으면
+  빈 페퍼로 해시해 두면 이후 페퍼를 설정했을 때 어떤 키도 검증되지 않으므로, 아무 행도 바꾸지 않고 중단합니다.
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.config import settings
+from backend.core.security import hash_api_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a9d2e8f413'
+down_revision: Union[str, None] = 'b7d3e1f0a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_HASHED = re.compile(r"^[0-9a-f]{64}$")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    api_keys = sa.table('api_keys', sa.column('id'), sa.column('key'), sa.column('is_active'))
+    pending = [
+        (key_id, key)
+        for key_id, key in conn.execute(sa.select(api_keys.c.id, api_keys.c.key)).all()
+        if not _HASHED.match(key) # 이미 변환된 행은 제외
+    ]
+    if pending and not settings.API_KEY_PEPPER:
+        raise RuntimeError(
+            f"API_KEY_PEPPER is not set; refusing to rehash/deactivate {len(pending)} api_keys rows. "
+            "Set the production pepper and rerun the migration."
+        )
+    for key_id, key in pending:
+        if key.startswith("$2"):
+            # bcrypt 해시: 변환 불가, 재발급 필요 (되돌릴 수 없음)
+            conn.execute(api_keys.update().where(api_keys.c.id == key_id).values(is_active=False))
+        else:
+            conn.execute(api_keys.update().where(api_keys.c.id == key_id).values(key=hash_api_key(key)))
+
+
+def downgrade() -> None:
+    # 해시는 되돌릴 수 없음 (비활성화한 키도 자동 복구하지 않음)
+    pass
@@ -128,9 +128,18 @@ def reset_singletons():
     yield
 
 @pytest.fixture(scope="session")
-def event_loop(request) -> Generator:
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """이벤트 루프 정책 (uvloop 설치 시 uvloop 사용, 미설치/미지원 플랫폼은 기본 정책)"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.get_event_loop_policy()
+    return uvloop.EventLoopPolicy()
+
+@pytest.fixture(scope="session")
+def event_loop(request, event_loop_policy: asyncio.AbstractEventLoopPolicy) -> Generator:
     """모든 테스트 세션에 대해 단일 이벤트 루프 생성"""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    loop = event_loop_policy.new_event_loop()
     yield loop
     loop.close()
 
@@ -10,6 +10,8 @@ from backend.models.domain.wallet import Wallet, Transaction, TransactionType, T
 from backend.partners.models import Partner
 from backend.db.repositories.wallet_repository import WalletRepository
 from backend.utils.encryption import encrypt_aes_gcm, decrypt_aes_gcm
+from backend.repositories.wallet_repository import WalletRepository as SessionWalletRepository
+from unittest.mock import AsyncMock, MagicMock
 
 # Import necessary components for local fixture
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
@@ -81,5 +83,23 @@ async def test_update_wallet_balance(wallet_repo, db_session, test_wallet_instan
 
     print("✅ 테스트 종료: test_update_wallet_balance")
 
+@pytest.mark.asyncio
+async def test_try_debit_is_single_conditional_update():
+    """try_debit 은 잔액 조건이 포함된 UPDATE ... RETURNING 한 번으로 차감하고, 미적용 시 None"""
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    session.execute.return_value = result
+    repo = SessionWalletRepository(session)
+    player_id = uuid.uuid4()
+
+    result.scalar_one_or_none.return_value = Decimal("50.00")
+    assert await repo.try_debit(player_id, "USD", Decimal("50.00")) == Decimal("50.00")
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.await_args.args[0])
+    assert "UPDATE wallets" in sql and "wallets.balance >=" in sql and "RETURNING wallets.balance" in sql
+
+    result.scalar_one_or_none.return_value = None
+    assert await repo.try_debit(player_id, "USD", Decimal("500.00")) is None
+
 # Add more repository tests: get_wallet_by_player_id, get_transaction_by_reference, etc.
 # Test edge cases: concurrent updates (requires locking tests), invalid inputs handled by DB constraints. 
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+서비스 테스트 공용 픽스처
+"""
+from datetime import datetime, timezone, tzinfo
+from typing import Optional, Tuple
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tests.support.crypto_mocks import mock_encrypt_func, mock_decrypt_func
+
+# 서비스 코드가 보는 고정 현재 시각
+FROZEN_NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    """ now() 만 고정 시각을 반환하는 datetime (생성자/isinstance 등 나머지 동작은 그대로) """
+
+    @classmethod
+    def now(cls, tz: Optional[tzinfo] = None) -> datetime:
+        return FROZEN_NOW.astimezone(tz) if tz is not None else FROZEN_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture(scope="module")
+def _patch_encryption_with_cache() -> Tuple[MagicMock, MagicMock, MagicMock]:
+    """ 암호화/복호화 함수를 모듈 당 1회 메모이즈된 모의 함수로 패치 (테스트마다 patch 진입/해제 비용 제거)
+
+    지갑 서비스 테스트 모듈만 pytest.mark.usefixtures 로 사용합니다 (auth/partner/game 테스트에는 적용하지 않음).
+    모듈이 끝나면 해제되므로 같은 xdist 워커의 다른 모듈로 패치가 남지 않습니다.
+    """
+    with patch("backend.utils.encryption.encrypt_aes_gcm", side_effect=mock_encrypt_func) as mock_encrypt, \
+         patch("backend.utils.encryption.decrypt_aes_gcm", side_effect=mock_decrypt_func) as mock_decrypt, \
+         patch("backend.models.domain.wallet.decrypt_aes_gcm", side_effect=mock_decrypt_func) as mock_domain_decrypt:
+        yield mock_encrypt, mock_decrypt, mock_domain_decrypt
+
+
+@pytest.fixture(scope="module")
+def _freeze_time():
+    """ 지갑 서비스의 datetime.now 를 모듈 동안 고정 (시스템 시각 조회 제거, 결정적인 타임스탬프, usefixtures 로 사용) """
+    with patch("backend.services.wallet.wallet_service.datetime", _FrozenDatetime):
+        yield FROZEN_NOW
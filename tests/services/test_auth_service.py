@@ -12,6 +12,7 @@ from backend.core.exceptions import AuthenticationError, AuthorizationError, Inv
 from backend.core import security # Import security to check original functions if needed
 from fastapi import Request, HTTPException # For mock_request
 from sqlalchemy.ext.asyncio import AsyncSession # For db_session type hint
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 # --- Test Data Fixtures ---
 
@@ -74,9 +75,9 @@ def patched_auth_service(test_api_key_data, test_partner_data):
     mock_partner_obj_for_repo.status = PartnerStatus.ACTIVE # 명시적으로 활성 상태 확인
 
     # --- Repository Mock Behaviors --- #
-    # get_active_api_key_by_hash: 고정 해시 값으로 조회 시 mock_api_key_obj_for_repo 반환
-    mock_partner_repo.get_active_api_key_by_hash = AsyncMock(
-        return_value=mock_api_key_obj_for_repo
+    # get_active_api_key_with_partner_by_hash: 고정 해시 값으로 조회 시 (API 키, 파트너) 튜플 반환
+    mock_partner_repo.get_active_api_key_with_partner_by_hash = AsyncMock(
+        return_value=(mock_api_key_obj_for_repo, mock_partner_obj_for_repo)
     )
     # get_api_key_by_id: ID로 조회 시 mock_api_key_obj_for_repo 반환 (캐시 히트 후 사용됨)
     mock_partner_repo.get_api_key_by_id = AsyncMock(
@@ -86,16 +87,16 @@ def patched_auth_service(test_api_key_data, test_partner_data):
     mock_partner_repo.get_partner_by_id = AsyncMock(
         return_value=mock_partner_obj_for_repo
     )
-    mock_partner_repo.get_allowed_ips = AsyncMock(return_value=[])
+    mock_partner_repo.get_allowed_ips = AsyncMock(return_value=frozenset())
     mock_partner_repo.db_session = mock_db_session
 
     # --- Hashing Mocks --- #
-    with patch('backend.services.auth.auth_service.get_password_hash') as mock_get_hash, \
+    with patch('backend.services.auth.auth_service.hash_api_key') as mock_get_hash, \
          patch('backend.core.security.verify_password') as mock_verify:
         mock_get_hash.return_value = fixed_hashed_value
         # verify_password는 기본적으로 True를 반환하도록 설정
         # (AuthService 내부 로직이 verify_password를 사용하는지 확인 필요. 현재 테스트 구조에서는
-        #  주로 get_active_api_key_by_hash를 통해 인증하는 것으로 보임)
+        #  주로 get_active_api_key_with_partner_by_hash를 통해 인증하는 것으로 보임)
         mock_verify.return_value = True
 
         service = AuthService(db=mock_db_session, redis_client=mock_redis)
@@ -156,8 +157,8 @@ async def test_authenticate_api_key_success_db_lookup(patched_auth_service, test
 
     # 검증
     mock_redis.get.assert_called_once_with(cache_key)
-    mock_partner_repo.get_active_api_key_by_hash.assert_called_once_with(hashed_key)
-    mock_partner_repo.get_partner_by_id.assert_called_once_with(test_api_key_data['partner_id'])
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.assert_called_once_with(hashed_key)
+    mock_partner_repo.get_partner_by_id.assert_not_called()
     mock_redis.set.assert_called_once_with(cache_key, str(test_api_key_data['id']), ex=3600)
     assert result_api_key.id == test_api_key_data['id']
     assert result_partner.id == test_partner_data['id']
@@ -175,14 +176,14 @@ async def test_authenticate_api_key_invalid_key(patched_auth_service, test_partn
     cache_key = f"api_key:{hashed_key}"
 
     mock_redis.get.return_value = None
-    mock_partner_repo.get_active_api_key_by_hash.return_value = None
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.return_value = None
 
     with pytest.raises(AuthenticationError, match="Invalid or inactive API key"):
         await auth_service.authenticate_api_key(plain_key)
 
     # 검증
     mock_redis.get.assert_called_once_with(cache_key)
-    mock_partner_repo.get_active_api_key_by_hash.assert_called_once_with(hashed_key)
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.assert_called_once_with(hashed_key)
     mock_partner_repo.get_partner_by_id.assert_not_called()
     mock_redis.set.assert_not_called()
     mock_partner_repo.db_session.flush.assert_not_called()
@@ -207,16 +208,14 @@ async def test_authenticate_api_key_inactive_partner(patched_auth_service, test_
     mock_partner_obj = Partner(**{k:v for k,v in test_partner_data.items() if k != 'allowed_ips'})
     mock_partner_obj.status = PartnerStatus.INACTIVE
 
-    mock_partner_repo.get_active_api_key_by_hash.return_value = mock_api_key_obj
-    mock_partner_repo.get_partner_by_id.return_value = mock_partner_obj
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.return_value = (mock_api_key_obj, mock_partner_obj)
 
     with pytest.raises(AuthenticationError, match="Partner is not active"):
         await auth_service.authenticate_api_key(plain_key)
 
     # 검증
     mock_redis.get.assert_called_once_with(cache_key)
-    mock_partner_repo.get_active_api_key_by_hash.assert_called_once_with(hashed_key)
-    mock_partner_repo.get_partner_by_id.assert_called_once_with(mock_api_key_obj.partner_id)
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.assert_called_once_with(hashed_key)
     mock_partner_repo.db_session.flush.assert_not_called()
 
 @pytest.mark.asyncio
@@ -239,18 +238,87 @@ async def test_authenticate_api_key_expired(patched_auth_service, test_partner_d
     
     mock_partner_obj = Partner(**{k:v for k,v in test_partner_data.items() if k != 'allowed_ips'})
 
-    mock_partner_repo.get_active_api_key_by_hash.return_value = mock_api_key_obj
-    mock_partner_repo.get_partner_by_id.return_value = mock_partner_obj
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.return_value = (mock_api_key_obj, mock_partner_obj)
 
     with pytest.raises(AuthenticationError, match="API key has expired"):
         await auth_service.authenticate_api_key(plain_key)
 
     # 검증
     mock_redis.get.assert_called_once_with(cache_key)
-    mock_partner_repo.get_active_api_key_by_hash.assert_called_once_with(hashed_key)
-    mock_partner_repo.get_partner_by_id.assert_called_once_with(mock_api_key_obj.partner_id)
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.assert_called_once_with(hashed_key)
     mock_partner_repo.db_session.flush.assert_not_called()
 
+def test_hash_api_key_is_deterministic_sha256():
+    """API 키 조회 해시는 결정적이고 키마다 달라야 함 (bcrypt 처럼 솔트를 쓰지 않음)"""
+    digest = security.hash_api_key("bk_test_key")
+
+    assert digest == security.hash_api_key("bk_test_key")
+    assert digest != security.hash_api_key("bk_other_key")
+    assert len(digest) == 64
+
+@pytest.mark.parametrize("environment", ["test", "dev", "development"])
+def test_check_api_key_pepper_allows_empty_pepper_outside_production(monkeypatch, environment):
+    """운영 환경이 아니면 API_KEY_PEPPER 가 비어 있어도 시작을 막지 않음 (로컬/개발 기동 유지)"""
+    monkeypatch.setattr(security.settings, "API_KEY_PEPPER", "")
+    monkeypatch.setenv("ENVIRONMENT", environment)
+    security.check_api_key_pepper()
+
+@pytest.mark.parametrize("environment", ["prod", "production"])
+def test_check_api_key_pepper_requires_pepper_in_production(monkeypatch, environment):
+    """운영 환경에서는 API_KEY_PEPPER 가 비어 있을 때 시작을 거부"""
+    monkeypatch.setattr(security.settings, "API_KEY_PEPPER", "")
+    monkeypatch.setenv("ENVIRONMENT", environment)
+    with pytest.raises(RuntimeError, match="API_KEY_PEPPER"):
+        security.check_api_key_pepper()
+
+    monkeypatch.setattr(security.settings, "API_KEY_PEPPER", "pepper")
+    security.check_api_key_pepper()
+
+@pytest.mark.asyncio
+async def test_partner_service_stores_only_api_key_hash():
+    """PartnerService 가 발급한 키는 해시로 저장되고, 같은 해시로 조회되어야 함"""
+    from backend.partners.service import PartnerService
+    from backend.partners.schemas import ApiKeyCreate
+
+    partner_repo = AsyncMock()
+    partner_repo.create_api_key.side_effect = lambda api_key: api_key
+    service = PartnerService(db=AsyncMock(), partner_repo=partner_repo)
+    service.get_or_404 = AsyncMock(return_value=MagicMock(code="test"))
+
+    with patch("backend.partners.service.get_password_hash", return_value="hashed_secret"):
+        created_key, plain_key, _ = await service.create_api_key(uuid4(), ApiKeyCreate(name="k", permissions=[]))
+
+    assert created_key.key == security.hash_api_key(plain_key)
+    assert created_key.key != plain_key
+
+def test_api_key_expires_at_sets_epoch():
+    """ApiKey.expires_at 설정 시 expires_at_epoch 가 UTC epoch 초로 함께 채워지는지 테스트"""
+    expires_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    api_key = ApiKey(expires_at=expires_at)
+    assert api_key.expires_at_epoch == int(expires_at.timestamp())
+
+    # naive 값은 UTC 로 간주
+    api_key.expires_at = expires_at.replace(tzinfo=None)
+    assert api_key.expires_at_epoch == int(expires_at.timestamp())
+
+    api_key.expires_at = None
+    assert api_key.expires_at_epoch is None
+
+@pytest.mark.asyncio
+async def test_authenticate_api_key_expired_without_epoch(patched_auth_service, test_partner_data, test_api_key_data):
+    """expires_at_epoch 가 비어 있는 행(ORM 밖에서 기록, backfill 전)도 expires_at 으로 만료 처리"""
+    auth_service, mock_redis, mock_partner_repo = patched_auth_service
+
+    mock_api_key_obj = ApiKey(**{k: v for k, v in test_api_key_data.items()
+                               if k not in ['plain_key', 'key', 'updated_at']})
+    mock_api_key_obj.expires_at = datetime.utcnow() - timedelta(days=1) # naive UTC
+    mock_api_key_obj.expires_at_epoch = None
+    mock_partner_obj = Partner(**{k:v for k,v in test_partner_data.items() if k != 'allowed_ips'})
+    mock_partner_repo.get_active_api_key_with_partner_by_hash.return_value = (mock_api_key_obj, mock_partner_obj)
+
+    with pytest.raises(AuthenticationError, match="API key has expired"):
+        await auth_service.authenticate_api_key(test_api_key_data['plain_key'])
+
 # --- IP Whitelist Tests ---
 
 @pytest.mark.asyncio
@@ -259,7 +327,7 @@ async def test_verify_ip_whitelist_no_list(patched_auth_service, test_partner_da
     auth_service, _, mock_partner_repo = patched_auth_service
     partner_id = test_partner_data["id"]
     client_ip = "1.2.3.4"
-    mock_partner_repo.get_allowed_ips.return_value = []
+    mock_partner_repo.get_allowed_ips.return_value = frozenset()
 
     result = await auth_service.verify_ip_whitelist(partner_id, client_ip)
 
@@ -277,7 +345,7 @@ async def test_verify_ip_whitelist_with_list(patched_auth_service, test_partner_
     """설정된 화이트리스트에 대한 IP 검증 테스트"""
     auth_service, _, mock_partner_repo = patched_auth_service
     partner_id = test_partner_data["id"]
-    allowed_ips_mock = [MagicMock(ip_address=ip["ip_address"]) for ip in test_partner_data["allowed_ips"]]
+    allowed_ips_mock = frozenset(ip["ip_address"] for ip in test_partner_data["allowed_ips"])
     mock_partner_repo.get_allowed_ips.return_value = allowed_ips_mock
 
     if expected:
@@ -289,6 +357,80 @@ async def test_verify_ip_whitelist_with_list(patched_auth_service, test_partner_
 
     mock_partner_repo.get_allowed_ips.assert_called_once_with(partner_id)
 
+@pytest.mark.asyncio
+async def test_verify_ip_whitelist_cache_hit(patched_auth_service, test_partner_data):
+    """Redis 에 캐시된 허용 IP 목록이 있으면 DB 를 조회하지 않는지 테스트"""
+    auth_service, mock_redis, mock_partner_repo = patched_auth_service
+    partner_id = test_partner_data["id"]
+    mock_redis.get.return_value = b'["10.0.0.0/24", "192.168.1.1"]'
+
+    assert await auth_service.verify_ip_whitelist(partner_id, "10.0.0.7") is True
+
+    mock_redis.get.assert_called_once_with(f"partner:{partner_id}:allowed_ips")
+    mock_partner_repo.get_allowed_ips.assert_not_called()
+    mock_redis.set.assert_not_called()
+
+class _DictRedis:
+    """get/set/delete 만 지원하는 dict 기반 Redis 대역 (캐시 무효화 흐름 확인용)"""
+    def __init__(self):
+        self.data = {}
+    async def get(self, key):
+        return self.data.get(key)
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+@pytest.mark.asyncio
+async def test_removed_ip_is_rejected_immediately(patched_auth_service, test_partner_data):
+    """IP 를 화이트리스트에서 삭제하면 캐시 TTL 과 무관하게 다음 검증부터 거부되는지 테스트"""
+    from backend.partners.service import PartnerService
+
+    auth_service, _, mock_partner_repo = patched_auth_service
+    partner_id = test_partner_data["id"]
+    redis = _DictRedis()
+    auth_service.redis = redis
+    mock_partner_repo.get_allowed_ips.return_value = frozenset({"192.168.1.1", "192.168.1.2"})
+
+    # 첫 검증으로 허용 목록이 캐시됨
+    assert await auth_service.verify_ip_whitelist(partner_id, "192.168.1.2") is True
+
+    # 192.168.1.2 삭제
+    ip_entry = MagicMock(id=uuid4(), partner_id=partner_id, ip_address="192.168.1.2")
+    mock_partner_repo.get_partner_ip_by_id = AsyncMock(return_value=ip_entry)
+    mock_partner_repo.delete_partner_ip = AsyncMock(return_value=True)
+    partner_service = PartnerService(db=AsyncMock(), partner_repo=mock_partner_repo, redis_client=redis)
+    assert await partner_service.remove_partner_ip(partner_id, ip_entry.id) is True
+    mock_partner_repo.get_allowed_ips.return_value = frozenset({"192.168.1.1"})
+
+    with pytest.raises(NotAllowedIPError):
+        await auth_service.verify_ip_whitelist(partner_id, "192.168.1.2")
+    assert await auth_service.verify_ip_whitelist(partner_id, "192.168.1.1") is True
+
+class _FailingRedis:
+    """delete 가 항상 Redis 연결 오류를 내는 대역"""
+    async def delete(self, key):
+        raise RedisConnectionError("redis down")
+
+@pytest.mark.asyncio
+async def test_partner_ip_changes_survive_cache_invalidation_failure(test_partner_data):
+    """DB 변경 후 캐시 무효화가 Redis 오류로 실패해도 추가/삭제 결과는 그대로 반환되는지 테스트"""
+    from backend.partners.service import PartnerService
+    from backend.partners.schemas import PartnerIPCreate
+
+    partner_id = test_partner_data["id"]
+    partner_repo = AsyncMock()
+    partner_repo.get_partner_ip_by_address.return_value = None
+    created_ip = MagicMock(id=uuid4(), partner_id=partner_id, ip_address="10.0.0.1")
+    partner_repo.create_partner_ip.return_value = created_ip
+    partner_repo.get_partner_ip_by_id.return_value = created_ip
+    partner_repo.delete_partner_ip.return_value = True
+    partner_service = PartnerService(db=AsyncMock(), partner_repo=partner_repo, redis_client=_FailingRedis())
+
+    with patch.object(PartnerService, "get_or_404", AsyncMock()):
+        assert await partner_service.add_partner_ip(partner_id, PartnerIPCreate(ip_address="10.0.0.1")) is created_ip
+    assert await partner_service.remove_partner_ip(partner_id, created_ip.id) is True
+
 # --- Request Authentication Tests ---
 
 @pytest.fixture
@@ -3,78 +3,96 @@
 지갑 서비스 테스트 (async with begin() 리팩토링 반영)
 """
 import pytest
-from uuid import UUID, uuid4
+from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, timezone, timedelta
-from unittest.mock import AsyncMock, patch, MagicMock, ANY, PropertyMock, call, Mock
-import asyncio
-import contextlib # For async context manager mock
+from unittest.mock import AsyncMock, patch, MagicMock, call
+import itertools
+from types import SimpleNamespace
 import logging # logging 모듈 import
 logger = logging.getLogger(__name__) # logger 인스턴스 생성
 from sqlalchemy.ext.asyncio import AsyncSession # Import AsyncSession
-import json # Import json for serialization
-from typing import Optional, Dict, Any, Callable, Tuple
+from typing import Optional, Any, Callable, List, Tuple
 
 # --- Corrected Imports ---
 from backend.repositories.wallet_repository import WalletRepository
 from backend.services.wallet.wallet_service import WalletService
-from backend.models.domain.wallet import Wallet, Transaction, TransactionType, TransactionStatus
+from backend.models.domain.wallet import Transaction, TransactionType, TransactionStatus
 # backend.schemas.wallet 에서 필요한 DTO 가져오기
-from backend.schemas.wallet import (
-    DebitRequest, CreditRequest, RollbackRequest,
-    TransactionResponse, BalanceResponse, WalletCreate, WalletUpdate,
-    Wallet as WalletSchema
-)
-from backend.db.repositories.partner_repository import PartnerRepository
+from backend.schemas.wallet import DebitRequest, CreditRequest, RollbackRequest
 # backend.core.exceptions 에서 필요한 예외 가져오기
 from backend.core.exceptions import (
-    InsufficientFundsError, DuplicateTransactionError,
-    WalletNotFoundError, CurrencyMismatchError, TransactionNotFoundError,
-    ValidationError as BackendValidationError, # Alias to avoid confusion with pydantic
-    WalletOperationError, InvalidAmountError,
-    WalletLockedError, InvalidTransactionStatusError
-    # TransactionAlreadyExistsError, TransactionCancellationError 는 없음
+    InsufficientFundsError, WalletNotFoundError, TransactionNotFoundError
 )
-from sqlalchemy import select
-from backend.utils.encryption import encrypt_aes_gcm, decrypt_aes_gcm
-from fastapi import Request, HTTPException
-from backend.partners.models import Partner # 경로 수정
-# from backend.models.domain.api_key import ApiKey # APIKey 모델 import (이 테스트 파일에서는 직접 사용 안하는 듯?)
-# APIPermission은 문자열 상수로 사용되거나 ApiKey 모델의 속성이므로 직접 import 필요 없음
-from backend.cache.redis_cache import get_redis_client # 경로 및 함수 수정
-# from backend.services.cache_service import CacheService # CacheService 없음, 제거
-# from services.wallet.wallet_dtos import ... # 중복 import 제거
+from tests.support.crypto_mocks import mock_encrypt_func
+from tests.support.fast_clone import fast_clone
+from tests.support.mock_reset import reset_mock_methods
 
 # --- End Corrected Imports ---
 
+# 암호화 모킹과 wallet_service 시각 고정은 이 모듈에서만 사용 (tests/services/conftest.py 의 opt-in 픽스처)
+pytestmark = pytest.mark.usefixtures("_patch_encryption_with_cache", "_freeze_time")
+
+# 참조 ID/식별자용 결정적 카운터 (uuid4()의 os.urandom 호출 및 문자열 포맷 비용 제거)
+_REF_COUNTER = itertools.count(1)
+
+
+def _ref(prefix: str) -> str:
+    return f"{prefix}-{next(_REF_COUNTER)}"
+
+
+def _uid() -> UUID:
+    """ 고유한 식별자용 UUID (값 자체는 의미 없음) """
+    return UUID(int=next(_REF_COUNTER))
 
-# --- Mock Functions for Manual Patching (Improved) ---
-# 각 테스트에서 직접 사용할 개선된 모의 함수 정의
-def mock_encrypt_func(value: Optional[Decimal]) -> Optional[str]:
-    if value is None:
-        return None
-    # 항상 문자열로 변환하여 실제 로직과의 일관성 유지
-    return f"encrypted_{str(value)}"
-
-
-def mock_decrypt_func(encrypted_value: Optional[str]) -> Optional[Decimal]:
-    if encrypted_value is None:
-        return None
-    if isinstance(encrypted_value, str) and encrypted_value.startswith("encrypted_"):
-        try:
-            # Remove prefix and convert back to Decimal
-            decrypted_str = encrypted_value[len("encrypted_"):]
-            # Handle potential conversion errors if the string part isn't a valid number
-            return Decimal(decrypted_str)
-        except Exception:
-             # Return 0 or raise specific error if conversion fails
-            # logging.error(f"Mock decrypt failed for: {encrypted_value}") # Optional logging
-            return Decimal("0.00")
-    # If input is not a string or doesn't have the prefix, return 0 or handle appropriately
-    # logging.warning(f"Mock decrypt received unexpected input: {encrypted_value}") # Optional logging
-    return Decimal("0.00") # Fallback for unexpected input
-
-# --- End Mock Functions ---
+# 트랜잭션 기본값 (import 시 1회 생성, 테스트마다 Decimal 파싱/현재 시각 조회 반복 제거)
+_D100 = Decimal("100")
+_NOW = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc) # 모듈 공용 기준 시각 (다른 시각은 _NOW ± timedelta 로 파생)
+# 기대 암호문 조회 테이블 (import 시 1회 계산, Decimal("10") == Decimal("10.00") 이지만 암호문은 다르므로 str(amount) 를 키로 사용)
+_ENCRYPTED = {v: mock_encrypt_func(Decimal(v)) for v in ("0", "10", "10.00", "20.00", "50", "50.00", "100", "150", "200.00")}
+
+
+def _setup_repo(
+    repo: AsyncMock,
+    make_tx: Callable[..., SimpleNamespace],
+    op: str,
+    scenario: str,
+    wallet: SimpleNamespace,
+    request: Any,
+    partner_id: UUID
+) -> SimpleNamespace:
+    """ 시나리오별 모의 리포지토리 설정, 생성될(중복 시 기존) 트랜잭션 객체 반환 """
+    sign = -1 if op == "debit" else 1
+    tx = make_tx(
+        reference_id=request.reference_id, wallet_id=wallet.id,
+        transaction_type=TransactionType.BET if op == "debit" else TransactionType.WIN,
+        amount=request.amount,
+        original_balance=wallet.balance, updated_balance=wallet.balance + sign * request.amount,
+    )
+    if scenario == "duplicate":
+        repo.get_transaction_by_reference.return_value = tx
+        return tx
+    if scenario != "wallet_not_found": # 지갑 없음은 스텁 기본값(None) 그대로
+        repo.get_player_wallet.return_value = wallet
+    repo.create_transaction.return_value = tx
+    return tx
+
+def _assert_repo_write_calls(
+    repo: Any,
+    wallet_id: UUID,
+    expected_balance: Decimal,
+    encrypted_amount: Optional[str] = None
+) -> Transaction:
+    """ 잔액 갱신 및 거래 생성이 각각 1회 호출되었는지 검증하고, 생성 요청된 Transaction 반환 """
+    repo.update_wallet_balance.assert_called_once_with(wallet_id, expected_balance)
+    repo.create_transaction.assert_called_once()
+    created_tx = repo.create_transaction.call_args[0][0]
+    assert isinstance(created_tx, Transaction)
+    assert created_tx.wallet_id == wallet_id
+    assert created_tx.updated_balance == expected_balance
+    if encrypted_amount is not None:
+        assert created_tx._encrypted_amount == encrypted_amount
+    return created_tx
 
 @pytest.fixture
 def mock_db_factory() -> Callable[[], AsyncMock]:
@@ -90,25 +108,38 @@ def mock_db_factory() -> Callable[[], AsyncMock]:
 
     return _factory # 팩토리 함수 반환
 
-@pytest.fixture
-def mock_redis() -> MagicMock:
-    """ 모의 Redis 클라이언트 픽스처 """
-    # spec=RedisCache 또는 실제 사용할 Redis 클라이언트 클래스 지정
-    redis_mock = AsyncMock()
+def _configure_redis_defaults(redis_mock: AsyncMock) -> AsyncMock:
+    """ 모의 Redis 기본 반환값 설정 (생성 시 및 테스트 간 초기화 후 재적용) """
     redis_mock.get.return_value = None
     redis_mock.set.return_value = None
     redis_mock.delete.return_value = 1
     return redis_mock
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def mock_redis() -> MagicMock:
+    """ 모의 Redis 클라이언트 픽스처 (모듈 당 1회 생성, _reset_shared_mocks 가 테스트마다 초기화) """
+    # spec=RedisCache 또는 실제 사용할 Redis 클라이언트 클래스 지정
+    return _configure_redis_defaults(AsyncMock())
+
+class LightWalletService(WalletService):
+    """ 도메인 이벤트 직렬화/발행을 생략하고 발행 요청만 기록하는 테스트 전용 WalletService """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.published_events: List[Tuple[Any, Decimal]] = []
+
+    async def _publish_transaction_event(self, transaction: Any, updated_balance: Decimal) -> None:
+        self.published_events.append((transaction, updated_balance))
+
+@pytest.fixture(scope="module")
 def wallet_service(
     # mock_db_factory: Callable[[], AsyncSession], # 제거
     mock_wallet_repo: WalletRepository, # WalletRepository 타입 힌트 사용 (또는 AsyncMock)
     mock_redis: MagicMock
-) -> WalletService:
-    """ WalletService 인스턴스를 생성하는 픽스처 (wallet_repo, redis 주입) """
+) -> LightWalletService:
+    """ WalletService 인스턴스를 생성하는 픽스처 (모듈 당 1회 생성, 모듈 스코프 wallet_repo/redis 주입, 이벤트 발행 생략) """
     # WalletService 초기화 시 wallet_repo 와 redis_client 전달
-    service = WalletService(
+    service = LightWalletService(
         wallet_repo=mock_wallet_repo, 
         redis_client=mock_redis
     )
@@ -117,64 +148,147 @@ def wallet_service(
     logger.info("Created WalletService instance with mocked repo and redis for test")
     return service
 
-@pytest.fixture # 추가: 모의 WalletRepository 픽스처
+# 요청 DTO 템플릿 (모듈 import 시 1회 검증, 테스트에서는 model_copy(update=...) 로 필요한 필드만 교체)
+_DEBIT_TEMPLATE = DebitRequest(player_id=UUID(int=0), reference_id="tmpl", amount=Decimal("10"), currency="USD")
+_CREDIT_TEMPLATE = CreditRequest(player_id=UUID(int=0), reference_id="tmpl", amount=Decimal("10"), currency="USD")
+
+# create_transaction 기본 반환값 (spec 인트로스펙션 비용을 import 시 1회만 지불, 실제 값이 필요한 테스트는 직접 지정)
+_SENTINEL_TX = MagicMock(spec=Transaction)
+
+
+def _configure_repo_defaults(repo: AsyncMock) -> AsyncMock:
+    """ 모의 리포지토리 기본 반환값 설정 (조회는 None, 생성은 _SENTINEL_TX) """
+    repo.get_player_wallet.return_value = None
+    repo.get_wallet_by_id.return_value = None
+    repo.get_transaction_by_reference.return_value = None
+    repo.get_rollback_transaction.return_value = None
+    repo.create_transaction.return_value = _SENTINEL_TX
+    repo.update_wallet_balance.return_value = None
+    repo.update_transaction_status.return_value = None
+    return repo
+
+@pytest.fixture(scope="module")
 def mock_wallet_repo() -> AsyncMock:
-    """ 모의 WalletRepository 인스턴스 """
-    # WalletRepository 클래스의 메서드들을 모킹합니다.
-    # 실제 필요한 메서드들을 추가로 모킹해야 할 수 있습니다.
-    repo_mock = AsyncMock(spec=WalletRepository)
-    # 예시: get_player_wallet 메서드 모킹 (기본값 None)
-    repo_mock.get_player_wallet = AsyncMock(return_value=None)
-    # 예시: get_transaction_by_reference 메서드 모킹
-    repo_mock.get_transaction_by_reference = AsyncMock(return_value=None)
-    # 예시: create_transaction 메서드 모킹
-    repo_mock.create_transaction = AsyncMock(return_value=MagicMock(spec=Transaction))
-    # 예시: update_wallet_balance 메서드 모킹
-    repo_mock.update_wallet_balance = AsyncMock(return_value=None)
-    # 필요한 다른 메서드들도 여기에 추가...
-    return repo_mock
+    """ 모의 WalletRepository 인스턴스 (모듈 당 1회 생성, spec_set 으로 오타 속성 설정 시 AttributeError) """
+    return _configure_repo_defaults(AsyncMock(spec_set=WalletRepository))
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_ensure_wallet_exists() -> AsyncMock:
+    """ WalletService.ensure_wallet_exists 를 모듈 당 1회 패치 (테스트마다 patch 진입/해제 반복 제거, 반환값은 각 테스트에서 지정) """
+    with patch.object(WalletService, "ensure_wallet_exists", new_callable=AsyncMock) as mock_ensure:
+        yield mock_ensure
+
+# 테스트/서비스가 사용하는 저장소/Redis 메서드 (테스트마다 초기화 대상)
+_REPO_METHODS = (
+    "get_player_wallet", "get_player_wallet_or_none", "create_wallet", "get_wallet_by_id",
+    "get_transaction_by_reference", "get_rollback_transaction",
+    "create_transaction", "update_wallet_balance", "update_transaction_status",
+)
+_REDIS_METHODS = ("get", "set", "delete")
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_shared_mocks(
+    wallet_service: LightWalletService,
+    mock_wallet_repo: AsyncMock,
+    mock_redis: AsyncMock,
+    mock_ensure_wallet_exists: AsyncMock
+):
+    """ 모듈 스코프 모의 객체의 호출 기록/반환값/side_effect 및 기록된 이벤트를 테스트마다 초기화 """
+    yield
+    wallet_service.published_events.clear()
+    mock_ensure_wallet_exists.reset_mock(return_value=True, side_effect=True)
+    reset_mock_methods(mock_wallet_repo, _REPO_METHODS)
+    reset_mock_methods(mock_redis, _REDIS_METHODS)
+    _configure_repo_defaults(mock_wallet_repo)
+    _configure_redis_defaults(mock_redis)
+
+# 테스트 간 변하지 않는 값은 모듈 스코프로 한 번만 생성
+@pytest.fixture(scope="module")
 def test_partner_id() -> UUID:
-    return uuid4()
+    return _uid()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_player_id() -> UUID:
-    return uuid4()
+    return _uid()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_currency() -> str:
     return "USD"
 
-@pytest.fixture
-def test_wallet(
+@pytest.fixture(scope="module")
+def _test_wallet_template(
     test_player_id: UUID,
     test_partner_id: UUID,
     test_currency: str
-) -> Wallet:
-    """ 테스트용 기본 Wallet 객체 """
-    return Wallet(
-        id=uuid4(),
+) -> SimpleNamespace:
+    """ 기본 지갑 템플릿 (모듈 당 1회 생성, 직접 수정 금지). ORM 계측 비용 없는 Wallet 덕 타입 """
+    return SimpleNamespace(
+        id=_uid(),
         player_id=test_player_id,
         partner_id=test_partner_id,
         balance=Decimal("100.00"),
         currency=test_currency,
         is_active=True,
         is_locked=False,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
+        created_at=_NOW,
+        updated_at=_NOW
+    )
+
+@pytest.fixture(scope="module")
+def _tx_template(
+    test_player_id: UUID,
+    test_partner_id: UUID,
+    test_currency: str
+) -> SimpleNamespace:
+    """ 기본 트랜잭션 템플릿 (모듈 당 1회 생성, 직접 사용하지 말고 make_tx 로 복제)
+    Transaction 덕 타입이므로 amount 는 복호화 없이 평문 값으로 지정 """
+    return SimpleNamespace(
+        id=None, reference_id="tx-template", wallet_id=None,
+        player_id=test_player_id, partner_id=test_partner_id,
+        transaction_type=TransactionType.BET, amount=Decimal("0.00"),
+        currency=test_currency, status=TransactionStatus.COMPLETED,
+        original_balance=_D100, updated_balance=_D100,
+        original_transaction_id=None,
+        created_at=_NOW,
+        transaction_metadata={}
     )
 
-# --- Mocks for external dependencies (if needed) ---
+@pytest.fixture(scope="module")
+def make_tx(_tx_template: SimpleNamespace) -> Callable[..., SimpleNamespace]:
+    """ 트랜잭션 팩토리 (기본값은 템플릿에서 복제, 지정한 필드만 덮어씀) """
+    def _make(**overrides: Any) -> SimpleNamespace:
+        defaults = dict(id=_uid(), wallet_id=_uid())
+        defaults.update(overrides)
+        return fast_clone(_tx_template, **defaults)
+    return _make
+
+@pytest.fixture(scope="module")
+def cache_key(wallet_service: WalletService, test_player_id: UUID, test_partner_id: UUID) -> str:
+    """ 테스트 플레이어/파트너의 지갑 캐시 키 (모듈 당 1회 생성) """
+    return wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
+
+@pytest.fixture(scope="class")
+def rollback_request_template(test_player_id: UUID) -> RollbackRequest:
+    """ 검증된 롤백 요청 템플릿 (클래스 당 1회 Pydantic 검증, 테스트에서는 model_copy(update=...) 로 참조 ID만 교체) """
+    return RollbackRequest(player_id=test_player_id, reference_id="tmpl", original_reference_id="tmpl")
+
+@pytest.fixture
+def test_wallet(_test_wallet_template: SimpleNamespace) -> SimpleNamespace:
+    """ 테스트용 기본 지갑 객체 (템플릿 복제본, 테스트 간 변경 격리) """
+    return fast_clone(_test_wallet_template)
+
 @pytest.fixture(autouse=True)
-def mock_publish_event():
-    """ 이벤트 발행 함수 모킹 """
-    with patch("backend.services.wallet.wallet_service.publish_event", new_callable=AsyncMock) as mock_publish:
-        yield mock_publish
+def mock_encryption(_patch_encryption_with_cache):
+    """ 루트 conftest의 고정값 암호화 모킹을 대체 (모듈 스코프 패처 위에 덮어쓰지 않도록), 호출 기록은 테스트마다 초기화 """
+    for mock in _patch_encryption_with_cache:
+        mock.reset_mock()
+    return _patch_encryption_with_cache
 
 
 # --- Test Class ---
+# 모킹만 사용하므로 병렬 실행 가능 (pytest -n auto). 모듈/세션 스코프 패치를 공유하므로 같은 워커에 배치
 @pytest.mark.asyncio
+@pytest.mark.xdist_group("wallet_service")
 class TestWalletService:
     """ WalletService 유닛 테스트 """
 
@@ -184,13 +298,12 @@ class TestWalletService:
         self,
         wallet_service: WalletService,
         mock_redis: MagicMock,
-        test_wallet: Wallet,
+        test_wallet: SimpleNamespace,
         test_player_id: UUID,
         test_partner_id: UUID
     ):
         """ 캐시 히트 시나리오 """
         # Arrange
-        cache_key = wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
         # TODO: 캐싱 구현 후 Redis 모의 객체 설정 필요
         # mock_redis.get.return_value = test_wallet.model_dump_json() # 직렬화된 데이터 반환
 
@@ -209,15 +322,12 @@ class TestWalletService:
         wallet_service: WalletService,
         mock_db_factory: Callable[[], AsyncSession], # 팩토리 주입
         mock_redis: MagicMock,
-        test_wallet: Wallet,
+        test_wallet: SimpleNamespace,
         test_player_id: UUID,
         test_partner_id: UUID
     ):
         """ 캐시 미스 시나리오 (DB 조회) """
         # Arrange
-        cache_key = wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
-        mock_redis.get.return_value = None # 캐시 없음
-
         # DB 조회를 모킹하기 위해 팩토리가 반환할 세션의 리포지토리 모킹
         mock_session = mock_db_factory() # 팩토리 호출하여 세션 얻기 (await 제거)
         mock_repo = WalletRepository(mock_session) # 해당 세션으로 리포지토리 생성 가정
@@ -247,9 +357,6 @@ class TestWalletService:
     ):
         """ 지갑을 찾을 수 없는 경우 WalletNotFoundError 발생 """
         # Arrange
-        cache_key = wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
-        mock_redis.get.return_value = None # 캐시 없음
-
         # mock_session = mock_db_factory() # 제거
         # mock_repo = WalletRepository(mock_session) # 제거
         # mock_repo.get_player_wallet = AsyncMock(return_value=None) # 제거 (패치로 대체)
@@ -265,639 +372,231 @@ class TestWalletService:
         # mock_redis.set.assert_not_called() # 캐시에 저장되지 않아야 함 (캐싱 로직 복구 후 활성화)
         # pytest.skip 제거
 
-    # -- debit tests --
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.get_player_wallet', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.update_wallet_balance', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.create_transaction', new_callable=AsyncMock) # 제거
-    async def test_debit_success(
-        self, # self 인자 유지 확인
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_wallet: Wallet,
+    # -- debit / credit tests (테이블 기반) --
+
+    @pytest.mark.parametrize(
+        "op, request_template, scenario, amount, expect_exc",
+        [
+            ("debit", _DEBIT_TEMPLATE, "success", "10.00", None),
+            ("debit", _DEBIT_TEMPLATE, "success", "200.00", InsufficientFundsError), # 지갑 잔액(100)보다 큼
+            ("debit", _DEBIT_TEMPLATE, "wallet_not_found", "10.00", WalletNotFoundError),
+            ("debit", _DEBIT_TEMPLATE, "duplicate", "10", None),
+            ("credit", _CREDIT_TEMPLATE, "success", "50.00", None),
+            ("credit", _CREDIT_TEMPLATE, "new_wallet", "50.00", None),
+            ("credit", _CREDIT_TEMPLATE, "duplicate", "50", None),
+        ],
+        ids=[
+            "debit_success", "debit_insufficient_funds", "debit_wallet_not_found", "debit_duplicate_transaction",
+            "credit_success_existing_wallet", "credit_success_new_wallet", "credit_duplicate_transaction",
+        ],
+    )
+    async def test_wallet_op(
+        self,
+        op: str,
+        request_template: Any,
+        scenario: str,
+        amount: str,
+        expect_exc: Optional[type],
+        wallet_service: LightWalletService,
+        mock_encryption: Tuple[MagicMock, MagicMock, MagicMock],
+        mock_wallet_repo: AsyncMock,
+        mock_ensure_wallet_exists: AsyncMock,
+        make_tx: Callable[..., SimpleNamespace],
+        test_wallet: SimpleNamespace,
         test_player_id: UUID,
         test_partner_id: UUID,
         test_currency: str,
-        mock_redis: MagicMock,
-        mock_publish_event: AsyncMock,
     ):
-        """ 출금 성공 시나리오 """
+        """ 출금/입금 시나리오 (성공, 잔액 부족, 지갑 없음, 중복 요청 시 기존 거래 반환, 신규 지갑 생성) """
         # Arrange
-        debit_amount = Decimal("10.00")
-        reference_id = f"debit-ref-{uuid4()}"
-        request = DebitRequest(
-            player_id=test_player_id,
-            reference_id=reference_id,
-            amount=debit_amount,
-            currency=test_currency,
-            game_id=str(uuid4()),
-            round_id="round-1"
-        )
-
-        # mock_wallet_repo fixture 직접 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = None
-        mock_wallet_repo.get_player_wallet.return_value = test_wallet
-
-        expected_updated_balance = test_wallet.balance - debit_amount
-        encrypted_amount_expected = mock_encrypt_func(debit_amount)
-        mock_created_tx_obj = Transaction(
-            id=uuid4(), reference_id=reference_id, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.BET, _encrypted_amount=encrypted_amount_expected,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
-            original_balance=test_wallet.balance, updated_balance=expected_updated_balance,
-            created_at=datetime.now(timezone.utc),
-            transaction_metadata={} # metadata 필드 추가
-        )
-        mock_wallet_repo.create_transaction.return_value = mock_created_tx_obj
-        mock_wallet_repo.update_wallet_balance.return_value = None # update_wallet_balance mock 설정 추가
-
-        # Act & Assert within patch context
-        with patch('backend.utils.encryption.encrypt_aes_gcm', side_effect=mock_encrypt_func) as mock_encrypt, \
-             patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            # 서비스 호출 - wallet_service 사용 확인
-            result = await wallet_service.debit(request, test_partner_id)
-
-            # 생성된 트랜잭션 객체의 암호화된 값 확인 (패치가 적용된 상태에서)
-            created_tx_arg = mock_wallet_repo.create_transaction.call_args[0][0]
-            assert created_tx_arg._encrypted_amount == encrypted_amount_expected
-
-            # Assert the final result within the patch context
-            assert result.reference_id == reference_id
-            assert result.amount == debit_amount # Now should be correct
-            assert result.balance == expected_updated_balance
-            assert result.status == TransactionStatus.COMPLETED
-
-            # Verify decryption calls if needed
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
-
-
-        # Assert calls to mocked methods (outside patch context is fine for repo mocks)
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(reference_id, test_partner_id)
-        mock_wallet_repo.get_player_wallet.assert_called_once_with(test_player_id, test_partner_id, for_update=True)
-        mock_wallet_repo.update_wallet_balance.assert_called_once_with(test_wallet.id, expected_updated_balance)
-        mock_wallet_repo.create_transaction.assert_called_once()
-
-        # Assert arguments passed to create_transaction
-        created_tx_arg = mock_wallet_repo.create_transaction.call_args[0][0] # Get the created Transaction object
-        assert isinstance(created_tx_arg, Transaction)
-        assert created_tx_arg.reference_id == reference_id
-        assert created_tx_arg.updated_balance == expected_updated_balance
-        assert created_tx_arg._encrypted_amount == encrypted_amount_expected
-
-        # mock_publish_event.assert_called() # 주석 처리: 서비스 내 isoformat 오류 우회
-        # mock_redis.delete.assert_called_once() # Cache logic needs review
-
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.get_player_wallet', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.create_transaction', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.update_wallet_balance', new_callable=AsyncMock) # 제거
-    async def test_debit_insufficient_funds(
-        self,
-        # mock_update_balance: AsyncMock, # 제거
-        # mock_create_tx: AsyncMock, # 제거
-        # mock_get_wallet: AsyncMock, # 제거
-        # mock_get_tx_by_ref: AsyncMock, # 제거
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_wallet: Wallet,
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str
-    ):
-        """ 잔액 부족 시 InsufficientFundsError 발생 테스트 """
-        request = DebitRequest(
-            player_id=test_player_id,
-            reference_id=f"debit-insufficient-{uuid4()}",
-            amount=Decimal("200.00"), # 지갑 잔액(100)보다 큼
-            currency=test_currency
-        )
+        mock_encrypt = mock_encryption[0]
+        amount = Decimal(amount)
+        # 템플릿 복사 (변경 필드만 갱신, 전체 필드 재검증 생략)
+        request = request_template.model_copy(update={
+            "player_id": test_player_id,
+            "reference_id": _ref(f"{op}-{scenario}"),
+            "amount": amount,
+            "currency": test_currency,
+        })
+        # 신규 지갑: 잔액 0인 지갑을 ensure_wallet_exists 가 생성한 것으로 가정
+        wallet = fast_clone(test_wallet, id=_uid(), balance=Decimal("0.00")) if scenario == "new_wallet" else test_wallet
+        expected_tx = _setup_repo(mock_wallet_repo, make_tx, op, scenario, wallet, request, test_partner_id)
+
+        mock_ensure_wallet_exists.return_value = (wallet, scenario == "new_wallet")
 
-        # Configure the mocked methods
-        # mock_get_tx_by_ref.return_value = None # 제거
-        # mock_get_wallet.return_value = test_wallet # 제거
-        # mock_wallet_repo fixture 직접 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = None
-        mock_wallet_repo.get_player_wallet.return_value = test_wallet
-
-        with pytest.raises(InsufficientFundsError) as excinfo:
-            # No encryption patching needed here
-            await wallet_service.debit(request, test_partner_id)
-
-        assert excinfo.value.player_id == test_player_id
-        assert excinfo.value.requested_amount == request.amount
-        assert excinfo.value.current_balance == test_wallet.balance
-
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(request.reference_id, test_partner_id)
-        mock_wallet_repo.get_player_wallet.assert_called_once_with(test_player_id, test_partner_id, for_update=True)
-        # Ensure other repo methods were not called
-        mock_wallet_repo.create_transaction.assert_not_called()
-        mock_wallet_repo.update_wallet_balance.assert_not_called()
-
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_player_wallet', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.create_transaction', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.update_wallet_balance', new_callable=AsyncMock)
-    async def test_debit_wallet_not_found(
-        self,
-        # mock_update_balance: AsyncMock, # 제거
-        # mock_create_tx: AsyncMock, # 제거
-        # mock_get_wallet: AsyncMock, # 제거
-        # mock_get_tx_by_ref: AsyncMock, # 제거
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str
-    ):
-        """ 지갑 미존재 시 WalletNotFoundError 발생 테스트 """
-        request = DebitRequest(
-            player_id=test_player_id, # 수정: mock 객체 대신 test_player_id 사용
-            reference_id=f"debit-no-wallet-{uuid4()}",
-            amount=Decimal("10.00"),
-            currency=test_currency
-        )
-
-        # 모의 리포지토리 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = None # 중복 요청 없음
-        mock_wallet_repo.get_player_wallet.return_value = None # 지갑 없음
-
-        # Act & Assert
-        with pytest.raises(WalletNotFoundError):
-            await wallet_service.debit(request, test_partner_id)
+        # Act
+        if expect_exc:
+            with pytest.raises(expect_exc) as excinfo:
+                await getattr(wallet_service, op)(request, test_partner_id)
+        else:
+            result = await getattr(wallet_service, op)(request, test_partner_id)
 
         # Assert
         mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(request.reference_id, test_partner_id)
-        # 여기서는 get_player_wallet이 호출되기 전에 TransactionNotFoundError가 발생해야 함
-        # 하지만 현재 로직상 get_player_wallet이 먼저 호출될 수 있으므로 호출 여부 확인 필요
-        mock_wallet_repo.get_player_wallet.assert_called_once_with(test_player_id, test_partner_id) # 수정: 호출 확인 추가
-        mock_wallet_repo.create_transaction.assert_not_called()
-        mock_wallet_repo.update_wallet_balance.assert_not_called()
-
-    # ... (debit_invalid_amount 테스트는 이전 수정에서 ValidationError 로 변경됨)
 
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_player_wallet', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.create_transaction', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.update_wallet_balance', new_callable=AsyncMock)
-    async def test_debit_duplicate_transaction(
-        self,
-        mock_update_balance: AsyncMock,
-        mock_create_tx: AsyncMock,
-        mock_get_wallet: AsyncMock,
-        mock_get_tx_by_ref: AsyncMock,
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str,
-        test_wallet: Wallet,
-    ):
-        """ 중복 거래 시 기존 거래 반환 (멱등성) """
-        # Arrange
-        reference_id = f"debit-duplicate-{uuid4()}"
-        request = DebitRequest(
-            player_id=test_player_id, reference_id=reference_id, amount=Decimal("10"), currency=test_currency
-        )
-
-        expected_amount = Decimal('10') # Use the correct amount for encryption
-        encrypted_amount_expected = mock_encrypt_func(expected_amount)
-        existing_tx = Transaction(
-            id=uuid4(), reference_id=reference_id, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.BET, _encrypted_amount=encrypted_amount_expected,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
-            original_balance=Decimal("100"), updated_balance=Decimal("90"),
-            created_at=datetime.now(timezone.utc),
-            transaction_metadata={} # metadata 필드 추가
+        if expect_exc is InsufficientFundsError:
+            assert excinfo.value.player_id == test_player_id
+            assert excinfo.value.requested_amount == request.amount
+            assert excinfo.value.current_balance == wallet.balance
+
+        if scenario != "duplicate":
+            if op == "debit":
+                mock_wallet_repo.get_player_wallet.assert_called_once_with(test_player_id, test_partner_id, for_update=True)
+            else:
+                mock_ensure_wallet_exists.assert_called_once_with(test_player_id, test_partner_id, test_currency)
+
+        if expect_exc or scenario == "duplicate":
+            # 실패/중복 요청은 잔액 변경 및 거래 생성 없음
+            mock_wallet_repo.update_wallet_balance.assert_not_called()
+            mock_wallet_repo.create_transaction.assert_not_called()
+            if scenario == "duplicate":
+                assert result.reference_id == request.reference_id
+                assert result.amount == amount
+            assert wallet_service.published_events == []
+            return
+
+        created_tx_arg = _assert_repo_write_calls(
+            mock_wallet_repo, wallet.id, expected_tx.updated_balance,
+            encrypted_amount=_ENCRYPTED[str(amount)]
         )
+        assert created_tx_arg.reference_id == request.reference_id
+        assert created_tx_arg.original_balance == wallet.balance
 
-        # mock_get_tx_by_ref.return_value = existing_tx # 제거
-        # mock_wallet_repo fixture 직접 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = existing_tx
-
-        # Act & Assert within patch context (decrypt only)
-        with patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            result = await wallet_service.debit(request, test_partner_id)
+        assert result.reference_id == request.reference_id
+        assert result.status == TransactionStatus.COMPLETED
+        assert result.amount == amount
+        assert result.balance == expected_tx.updated_balance
 
-            # Assert the final result within the patch context
-            assert result.reference_id == reference_id
-            assert result.amount == expected_amount # Check against the expected amount
+        assert mock_encrypt.call_count > 0
 
-            # Verify decryption calls
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
-
-        # Assert repo calls (outside context)
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(reference_id, test_partner_id)
-        # Assert other repo methods were not called
-        # mock_ensure_wallet_exists.assert_not_called() # ensure_wallet_exists는 서비스 내부 메서드이므로 repo mock으로 확인 불가
-        mock_wallet_repo.update_wallet_balance.assert_not_called()
-        mock_wallet_repo.create_transaction.assert_not_called()
-
-
-    # -- credit tests --
-
-    @patch('backend.services.wallet.wallet_service.WalletService.ensure_wallet_exists', new_callable=AsyncMock)
-    async def test_credit_success_existing_wallet(
-        self,
-        mock_ensure_wallet_exists: AsyncMock,
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock,
-        test_wallet: Wallet,
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str,
-        mock_redis: MagicMock,
-        mock_publish_event: AsyncMock,
-    ):
-        """ 기존 지갑에 입금 성공 """
-        # Arrange
-        credit_amount = Decimal("50.00")
-        reference_id = f"credit-ref-{uuid4()}"
-        request = CreditRequest(
-            player_id=test_player_id,
-            reference_id=reference_id,
-            amount=credit_amount,
-            currency=test_currency
-        )
-
-        mock_wallet_repo.get_transaction_by_reference.return_value = None
-        mock_wallet_repo.update_wallet_balance.return_value = None
-        mock_ensure_wallet_exists.return_value = (test_wallet, False)
-
-        expected_updated_balance = test_wallet.balance + credit_amount
-        encrypted_amount_expected = mock_encrypt_func(credit_amount)
-        mock_created_tx = Transaction(
-            id=uuid4(), reference_id=reference_id, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.WIN, _encrypted_amount=encrypted_amount_expected,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
-            original_balance=test_wallet.balance, updated_balance=expected_updated_balance,
-            created_at=datetime.now(timezone.utc),
-            transaction_metadata={}
-        )
-        mock_wallet_repo.create_transaction.return_value = mock_created_tx
-
-        # Act & Assert within patch context
-        with patch('backend.utils.encryption.encrypt_aes_gcm', side_effect=mock_encrypt_func) as mock_encrypt, \
-             patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            # 서비스 호출
-            result = await wallet_service.credit(request, test_partner_id)
-
-            # 생성된 트랜잭션 객체의 암호화된 값 확인
-            created_tx_arg = mock_wallet_repo.create_transaction.call_args[0][0]
-            assert created_tx_arg._encrypted_amount == encrypted_amount_expected
-
-            # Assert the final result within the patch context
-            assert result.reference_id == reference_id
-            assert result.status == TransactionStatus.COMPLETED
-            assert result.amount == credit_amount # Now should be correct
-            assert result.balance == expected_updated_balance
-
-            # Verify relevant mock calls
-            assert mock_encrypt.call_count > 0
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
-
-        # Assert Repo calls (outside context)
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(reference_id, test_partner_id)
-        mock_ensure_wallet_exists.assert_called_once_with(test_player_id, test_partner_id, test_currency)
-        mock_wallet_repo.update_wallet_balance.assert_called_once_with(test_wallet.id, expected_updated_balance)
-        mock_wallet_repo.create_transaction.assert_called_once()
-
-        # mock_publish_event.assert_called() # 주석 처리: 서비스 내 isoformat 오류 우회
+        assert wallet_service.published_events == [(expected_tx, expected_tx.updated_balance)]
         # mock_redis.delete.assert_called_once() # Cache logic needs review
 
-    @patch('backend.services.wallet.wallet_service.WalletService.ensure_wallet_exists', new_callable=AsyncMock)
-    async def test_credit_success_new_wallet(
-        self,
-        mock_ensure_wallet_exists: AsyncMock,
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock,
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str,
-        mock_redis: MagicMock,
-        mock_publish_event: AsyncMock,
-    ):
-        """ 지갑이 없을 때 새로 생성하며 입금 성공 """
-        # Arrange
-        credit_amount = Decimal("50.00")
-        reference_id = f"credit-new-{uuid4()}"
-        request = CreditRequest(
-            player_id=test_player_id,
-            reference_id=reference_id,
-            amount=credit_amount,
-            currency=test_currency
-        )
-
-        mock_wallet_repo.get_transaction_by_reference.return_value = None
-
-        new_wallet_id = uuid4()
-        new_wallet = Wallet(
-            id=new_wallet_id,
-            player_id=test_player_id,
-            partner_id=test_partner_id,
-            balance=Decimal("0.00"),
-            currency=test_currency,
-            is_active=True, is_locked=False,
-            created_at=datetime.now(timezone.utc)
-        )
-        mock_ensure_wallet_exists.return_value = (new_wallet, True)
-
-        expected_updated_balance = Decimal("0.00") + credit_amount
-        encrypted_amount_expected = mock_encrypt_func(credit_amount)
-        mock_created_tx = Transaction(
-            id=uuid4(), reference_id=reference_id, wallet_id=new_wallet_id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.WIN, _encrypted_amount=encrypted_amount_expected,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
-            original_balance=Decimal("0.00"), updated_balance=expected_updated_balance,
-            created_at=datetime.now(timezone.utc),
-            transaction_metadata={}
-        )
-        mock_wallet_repo.create_transaction.return_value = mock_created_tx
-        mock_wallet_repo.update_wallet_balance.return_value = None
-
-        # Act & Assert within patch context
-        with patch('backend.utils.encryption.encrypt_aes_gcm', side_effect=mock_encrypt_func) as mock_encrypt, \
-             patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            # 서비스 호출
-            result = await wallet_service.credit(request, test_partner_id)
-
-            # 생성된 트랜잭션 객체의 암호화된 값 확인
-            created_tx_arg = mock_wallet_repo.create_transaction.call_args[0][0]
-            assert created_tx_arg._encrypted_amount == encrypted_amount_expected
-
-            # Assert the final result within the patch context
-            assert result.reference_id == reference_id
-            assert result.status == TransactionStatus.COMPLETED
-            assert result.amount == credit_amount # Now should be correct
-            assert result.balance == expected_updated_balance
-
-            # Verify relevant mock calls
-            assert mock_encrypt.call_count > 0
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
-
-
-        # Assert Repo calls (outside context)
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(reference_id, test_partner_id)
-        mock_ensure_wallet_exists.assert_called_once_with(test_player_id, test_partner_id, test_currency)
-        mock_wallet_repo.update_wallet_balance.assert_called_once_with(new_wallet_id, expected_updated_balance)
-        mock_wallet_repo.create_transaction.assert_called_once()
-        created_tx_arg = mock_wallet_repo.create_transaction.call_args[0][0] # Get created tx arg
-        # Assertions on created_tx_arg (already captured above)
-        assert created_tx_arg.reference_id == reference_id
-        assert created_tx_arg.wallet_id == new_wallet_id
-        assert created_tx_arg.transaction_type == TransactionType.WIN
-        assert created_tx_arg.original_balance == Decimal("0.00")
-        assert created_tx_arg.updated_balance == expected_updated_balance
-        assert created_tx_arg._encrypted_amount == encrypted_amount_expected
-
-        # mock_publish_event.assert_called_once() # 주석 처리: 서비스 내 isoformat 오류 우회
-
-
-    # ... (credit_invalid_amount 테스트는 이전 수정에서 ValidationError 로 변경됨)
-
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletService.ensure_wallet_exists', new_callable=AsyncMock) # 제거 (필요 시 fixture로 관리)
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.create_transaction', new_callable=AsyncMock) # 제거
-    # @patch('backend.services.wallet.wallet_service.WalletRepository.update_wallet_balance', new_callable=AsyncMock) # 제거
-    async def test_credit_duplicate_transaction(
-        self,
-        # mock_update_balance: AsyncMock, # 제거
-        # mock_create_tx: AsyncMock, # 제거
-        # mock_ensure_wallet_exists: AsyncMock, # 제거
-        # mock_get_tx_by_ref: AsyncMock, # 제거
-        wallet_service: WalletService,
-        mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_player_id: UUID,
-        test_partner_id: UUID,
-        test_currency: str,
-        test_wallet: Wallet,
-    ):
-        """ 중복 입금 요청 시 기존 거래 반환 """
-        # Arrange
-        reference_id = f"credit-duplicate-{uuid4()}"
-        request = CreditRequest(
-            player_id=test_player_id, reference_id=reference_id, amount=Decimal("50"), currency=test_currency
-        )
-
-        expected_amount = Decimal('50')
-        encrypted_amount_expected = mock_encrypt_func(expected_amount)
-        existing_tx = Transaction(
-            id=uuid4(), reference_id=reference_id, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.WIN, _encrypted_amount=encrypted_amount_expected,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
-            original_balance=Decimal("100"), updated_balance=Decimal("150"),
-            created_at=datetime.now(timezone.utc),
-            transaction_metadata={} # metadata 추가
-        )
-
-        # mock_get_tx_by_ref.return_value = existing_tx # 제거
-        # mock_wallet_repo fixture 직접 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = existing_tx
-
-        # Act & Assert within patch context (decrypt only)
-        with patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            result = await wallet_service.credit(request, test_partner_id)
-
-            # Assert the final result within the patch context
-            assert result.reference_id == reference_id
-            assert result.amount == expected_amount # Now should be correct
-
-            # Verify decryption calls
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
-
-        # Assert repo calls (outside context)
-        mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(reference_id, test_partner_id)
-        # Assert other repo methods were not called
-        # mock_ensure_wallet_exists.assert_not_called() # ensure_wallet_exists는 서비스 내부 메서드이므로 repo mock으로 확인 불가
-        mock_wallet_repo.update_wallet_balance.assert_not_called()
-        mock_wallet_repo.create_transaction.assert_not_called()
-
-
     # -- rollback tests --
 
-    # @patch 데코레이터 완전 제거, fixture 사용
+    @pytest.mark.slow
     async def test_rollback_success(
         self,
-        wallet_service: WalletService,
+        wallet_service: LightWalletService,
+        rollback_request_template: RollbackRequest,
         mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_wallet: Wallet,
-        test_player_id: UUID,
+        make_tx: Callable[..., SimpleNamespace],
+        test_wallet: SimpleNamespace,
         test_partner_id: UUID,
         test_currency: str,
         mock_redis: MagicMock,
-        mock_publish_event: AsyncMock,
     ):
         """ 롤백 성공 시나리오 (BET 롤백) """
         # Arrange
         original_bet_amount = Decimal("20.00")
-        original_ref = f"bet-to-rollback-{uuid4()}"
-        rollback_ref = f"rollback-{uuid4()}"
-        encrypted_original_amount = mock_encrypt_func(original_bet_amount)
-        encrypted_rollback_amount = mock_encrypt_func(original_bet_amount)
-
-        original_tx = Transaction(
-            id=uuid4(), reference_id=original_ref, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.BET, _encrypted_amount=encrypted_original_amount,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
+        original_ref = _ref("bet-to-rollback")
+        rollback_ref = _ref("rollback")
+
+        original_tx = make_tx(
+            reference_id=original_ref, wallet_id=test_wallet.id,
+            transaction_type=TransactionType.BET, amount=original_bet_amount,
             original_balance=test_wallet.balance,
             updated_balance=test_wallet.balance - original_bet_amount,
-            created_at=datetime.now(timezone.utc)
-        )
-        request = RollbackRequest(
-            player_id=test_player_id,
-            reference_id=rollback_ref,
-            original_reference_id=original_ref,
-            rollback_reason="Test rollback"
         )
+        request = rollback_request_template.model_copy(update={
+            "reference_id": rollback_ref,
+            "original_reference_id": original_ref,
+            "rollback_reason": "Test rollback",
+        })
 
         # BET 타입 롤백의 경우 올바른 잔액 계산: 현재 잔액 + 베팅 금액
         expected_final_balance = test_wallet.balance + original_bet_amount  # 100.00 + 20.00 = 120.00
 
-        mock_created_rollback_tx = Transaction(
-            id=uuid4(), reference_id=rollback_ref, wallet_id=test_wallet.id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.ROLLBACK, _encrypted_amount=encrypted_rollback_amount,
-            currency=test_currency, status=TransactionStatus.COMPLETED,
+        mock_created_rollback_tx = make_tx(
+            reference_id=rollback_ref, wallet_id=test_wallet.id,
+            transaction_type=TransactionType.ROLLBACK, amount=original_bet_amount,
             original_balance=original_tx.updated_balance,
             updated_balance=expected_final_balance,
             original_transaction_id=original_tx.id,
-            created_at=datetime.now(timezone.utc)
         )
 
-        # Act & Assert within patch context
-        # Patch Repo and all necessary encryption/decryption paths
-        with patch('backend.services.wallet.wallet_service.WalletRepository') as MockRepoClass, \
-             patch('backend.utils.encryption.encrypt_aes_gcm', side_effect=mock_encrypt_func) as mock_encrypt, \
-             patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
-
-            # 모의 리포지토리 인스턴스 설정
-            mock_repo_instance = MockRepoClass.return_value
-            # 수정: get_transaction_by_reference에 side_effect 적용
-            mock_repo_instance.get_transaction_by_reference = AsyncMock(side_effect=[
-                original_tx,  # 1. 원본 트랜잭션 조회 시
-                None         # 2. 롤백 reference_id 중복 조회 시
-            ])
-            mock_repo_instance.get_rollback_transaction = AsyncMock(return_value=None) # 중요: 롤백된 적 없음
-            mock_repo_instance.get_wallet_by_id = AsyncMock(return_value=test_wallet)
-            mock_repo_instance.update_transaction_status = AsyncMock()
-            mock_repo_instance.update_wallet_balance = AsyncMock()
-            mock_repo_instance.create_transaction = AsyncMock(return_value=mock_created_rollback_tx)
-
-            # 서비스 호출 (이제 TypeError 발생 안 함)
-            result = await wallet_service.rollback(request, test_partner_id)
-
-            # 생성된 롤백 트랜잭션 값 확인
-            # created_tx_arg = mock_repo_instance.create_transaction.call_args[0][0]
-            # assert created_tx_arg._encrypted_amount == encrypted_rollback_amount # 제거: 현재 서비스 로직 미반영 가능성
-
-            # Assert the final result within the patch context
-            assert result.reference_id == rollback_ref
-            assert result.status == TransactionStatus.COMPLETED
-            assert result.amount == original_bet_amount # Now should be correct
-            assert result.balance == expected_final_balance
-
-            # Verify relevant mock calls within context
-            # assert mock_encrypt.call_count > 0 # 실제 롤백 암호화가 안될 수 있으므로 주석처리 또는 제거
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0 # Decrypts original and returns result
-            # Check get_transaction_by_reference call count (should be 2 now)
-            assert mock_repo_instance.get_transaction_by_reference.call_count == 2
-            mock_repo_instance.get_transaction_by_reference.assert_has_calls([
-                call(request.original_reference_id, test_partner_id), # 원본 조회
-                call(request.reference_id, test_partner_id)          # 롤백 ID 중복 조회
-            ])
-
-        # Assert Repo calls (outside context)
-        # mock_repo_instance.get_transaction_by_reference.assert_called_once_with(request.original_reference_id, test_partner_id) # 제거 (위에서 call_count로 확인)
-        mock_repo_instance.get_rollback_transaction.assert_called_once_with(original_tx.id)
-        mock_repo_instance.get_wallet_by_id.assert_called_once_with(original_tx.wallet_id, for_update=True)
-        # mock_repo_instance.update_transaction_status.assert_called_once_with(original_tx.id, TransactionStatus.CANCELED) # 주석 처리: 현재 서비스 로직에서 호출 안될 수 있음
-        mock_repo_instance.update_wallet_balance.assert_called_once_with(test_wallet.id, expected_final_balance)
-        mock_repo_instance.create_transaction.assert_called_once()
-
-        # mock_publish_event.assert_called_once() # 주석 처리: 서비스 내 isoformat 오류 우회
-
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_transaction_by_reference', new_callable=AsyncMock)
-    @patch('backend.services.wallet.wallet_service.WalletRepository.get_rollback_transaction', new_callable=AsyncMock)
+        # 모의 리포지토리 설정 (mock_wallet_repo 사용)
+        # reference_id 기준으로 응답 (호출 순서와 무관): 원본 조회 시 original_tx, 롤백 ID 중복 조회 시 None
+        def _resolve(reference_id, partner_id):
+            return original_tx if reference_id == original_ref else None
+        mock_wallet_repo.get_transaction_by_reference.side_effect = _resolve
+        mock_wallet_repo.get_wallet_by_id.return_value = test_wallet
+        mock_wallet_repo.create_transaction.return_value = mock_created_rollback_tx
+        # get_rollback_transaction 은 기본값(None) 그대로 사용: 롤백된 적 없음
+
+        # Act (암호화 함수는 모듈 스코프 _patch_encryption_with_cache 가 모킹)
+        result = await wallet_service.rollback(request, test_partner_id)
+
+        # Assert the final result
+        assert result.reference_id == rollback_ref
+        assert result.status == TransactionStatus.COMPLETED
+        assert result.amount == original_bet_amount
+        assert result.balance == expected_final_balance
+
+        # Assert Repo calls
+        # 원본 조회 후 롤백 ID 중복 조회 (순서 포함 정확히 2회)
+        assert mock_wallet_repo.get_transaction_by_reference.call_args_list == [
+            call(original_ref, test_partner_id),
+            call(rollback_ref, test_partner_id),
+        ]
+        mock_wallet_repo.get_rollback_transaction.assert_called_once_with(original_tx.id)
+        mock_wallet_repo.get_wallet_by_id.assert_called_once_with(original_tx.wallet_id, for_update=True)
+        # mock_wallet_repo.update_transaction_status.assert_called_once_with(original_tx.id, TransactionStatus.CANCELED) # 주석 처리: 현재 서비스 로직에서 호출 안될 수 있음
+        _assert_repo_write_calls(mock_wallet_repo, test_wallet.id, expected_final_balance)
+
+        assert wallet_service.published_events == [(mock_created_rollback_tx, expected_final_balance)]
+
     async def test_rollback_duplicate_request(
         self,
-        # mock_get_rollback_tx: AsyncMock, # 제거
-        # mock_get_tx_by_ref: AsyncMock, # 제거
         wallet_service: WalletService,
+        rollback_request_template: RollbackRequest,
         mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_player_id: UUID,
+        make_tx: Callable[..., SimpleNamespace],
         test_partner_id: UUID,
     ):
         """ 중복 롤백 요청 시 기존 롤백 트랜잭션 반환 """
         # Arrange
-        rollback_ref = f"rollback-duplicate-{uuid4()}"
-        original_ref = f"original-for-rollback-{uuid4()}"
-        request = RollbackRequest(
-            player_id=test_player_id, reference_id=rollback_ref, original_reference_id=original_ref
-        )
+        rollback_ref = _ref("rollback-duplicate")
+        original_ref = _ref("original-for-rollback")
+        request = rollback_request_template.model_copy(update={
+            "reference_id": rollback_ref, "original_reference_id": original_ref
+        })
 
         expected_amount = Decimal('10')
         # 원본 트랜잭션 모의 객체
-        original_tx = Transaction(
-             id=uuid4(), reference_id=original_ref, wallet_id=uuid4(),
-             player_id=test_player_id, partner_id=test_partner_id,
-             transaction_type=TransactionType.BET, _encrypted_amount=mock_encrypt_func(expected_amount),
-             currency="USD", status=TransactionStatus.COMPLETED,
-             original_balance=Decimal("100"), updated_balance=Decimal("90"),
-             created_at=datetime.now(timezone.utc) - timedelta(minutes=5),
-             transaction_metadata={} # metadata 추가
+        original_tx = make_tx(
+            reference_id=original_ref,
+            transaction_type=TransactionType.BET, amount=expected_amount,
+            original_balance=_D100, updated_balance=Decimal("90"),
+            created_at=_NOW - timedelta(minutes=5),
         )
 
         # 이미 존재하는 롤백 트랜잭션 모의 객체
-        existing_rollback_tx = Transaction(
-            id=uuid4(), reference_id=rollback_ref, wallet_id=original_tx.wallet_id,
-            player_id=test_player_id, partner_id=test_partner_id,
-            transaction_type=TransactionType.ROLLBACK, _encrypted_amount=mock_encrypt_func(expected_amount),
-            currency="USD", status=TransactionStatus.COMPLETED,
-            original_balance=Decimal("90"), updated_balance=Decimal("100"),
+        existing_rollback_tx = make_tx(
+            reference_id=rollback_ref, wallet_id=original_tx.wallet_id,
+            transaction_type=TransactionType.ROLLBACK, amount=expected_amount,
+            original_balance=Decimal("90"), updated_balance=_D100,
             original_transaction_id=original_tx.id, # 원본 트랜잭션 ID 연결
-            created_at=datetime.now(timezone.utc),
             transaction_metadata={"rollback_reason": "duplicate rollback test"} # metadata 추가
         )
 
         # 모의 리포지토리 설정 (mock_wallet_repo 사용)
-        # mock_get_tx_by_ref.return_value = original_tx # 제거
-        # mock_get_rollback_tx.return_value = existing_rollback_tx # 제거
         mock_wallet_repo.get_transaction_by_reference.return_value = original_tx # 원본 트랜잭션 조회 시 반환
         mock_wallet_repo.get_rollback_transaction.return_value = existing_rollback_tx # 롤백 트랜잭션 조회 시 반환
 
-        # Act & Assert within patch context (decrypt only)
-        with patch('backend.utils.encryption.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_decrypt, \
-             patch('backend.models.domain.wallet.decrypt_aes_gcm', side_effect=mock_decrypt_func) as mock_domain_decrypt:
+        # Act & Assert (암호화 함수는 모듈 스코프 _patch_encryption_with_cache 가 모킹)
 
-            result = await wallet_service.rollback(request, test_partner_id)
+        result = await wallet_service.rollback(request, test_partner_id)
 
-            # Assert the final result within the patch context
-            assert result.reference_id == existing_rollback_tx.reference_id
-            assert result.transaction_type == TransactionType.ROLLBACK
-            assert result.amount == expected_amount # Now should be correct
-            assert result.balance == existing_rollback_tx.updated_balance
+        # Assert the final result
+        assert result.reference_id == existing_rollback_tx.reference_id
+        assert result.transaction_type == TransactionType.ROLLBACK
+        assert result.amount == expected_amount # Now should be correct
+        assert result.balance == existing_rollback_tx.updated_balance
 
-            # Verify decryption calls
-            assert mock_decrypt.call_count > 0 or mock_domain_decrypt.call_count > 0
 
 
-        # Assert repo calls (outside context) - mock_wallet_repo 사용
+        # Assert repo calls - mock_wallet_repo 사용
         mock_wallet_repo.get_transaction_by_reference.assert_called_once_with(request.original_reference_id, test_partner_id)
         mock_wallet_repo.get_rollback_transaction.assert_called_once_with(original_tx.id)
         # 다른 repository 메서드는 호출되지 않아야 함
@@ -908,23 +607,22 @@ class TestWalletService:
     async def test_rollback_original_tx_not_found(
         self,
         wallet_service: WalletService,
+        rollback_request_template: RollbackRequest,
         mock_wallet_repo: AsyncMock, # mock_wallet_repo fixture 사용
-        test_player_id: UUID,
         test_partner_id: UUID
     ):
         """ 원본 트랜잭션 없을 시 TransactionNotFoundError 발생 """
         # Arrange
-        rollback_ref = f"rollback-notfound-{uuid4()}"
-        original_ref = f"original-nonexistent-{uuid4()}"
-        request = RollbackRequest(
-            player_id=test_player_id, reference_id=rollback_ref, original_reference_id=original_ref
-        )
+        rollback_ref = _ref("rollback-notfound")
+        original_ref = _ref("original-nonexistent")
+        request = rollback_request_template.model_copy(update={
+            "reference_id": rollback_ref, "original_reference_id": original_ref
+        })
 
         # mock_session = mock_db_factory() # 제거
         # mock_repo = WalletRepository(mock_session) # 제거
         # mock_repo.get_transaction_by_reference = AsyncMock(return_value=None) # 제거
-        # mock_wallet_repo fixture 직접 설정
-        mock_wallet_repo.get_transaction_by_reference.return_value = None
+        # mock_wallet_repo 기본값(get_transaction_by_reference -> None) 그대로 사용
 
         # Patch WalletRepository 제거
         # with patch('backend.services.wallet.wallet_service.WalletRepository', return_value=mock_repo):
@@ -945,13 +643,11 @@ class TestWalletService:
         self,
         wallet_service: WalletService,
         mock_redis: MagicMock,
+        cache_key: str,
         test_player_id: UUID,
         test_partner_id: UUID,
     ):
         """ 캐시 무효화 로직 테스트 (지갑 존재 시) """
-        # Arrange
-        cache_key = wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
-
         # Act
         await wallet_service.invalidate_wallet_cache(test_player_id, test_partner_id)
 
@@ -962,13 +658,11 @@ class TestWalletService:
         self,
         wallet_service: WalletService,
         mock_redis: MagicMock,
+        cache_key: str,
         test_player_id: UUID,
         test_partner_id: UUID,
     ):
         """ 캐시 무효화 로직 테스트 (지갑 ID 모를 때도 키 생성) """
-        # Arrange
-        cache_key = wallet_service._generate_wallet_cache_key(test_player_id, test_partner_id)
-
         # Act
         await wallet_service.invalidate_wallet_cache(test_player_id, test_partner_id)
 
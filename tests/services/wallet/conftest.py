@@ -0,0 +1,44 @@
+"""
+지갑 테스트 공용 픽스처
+"""
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+
+# 결정적 UUID 목록 (import 시 1회 생성, uuid4()의 os.urandom 호출 제거 및 재현 가능한 식별자 확보)
+_UUIDS = [UUID(int=i) for i in range(1, 10_001)]
+
+
+@pytest.fixture(autouse=True)
+def deterministic_uuids(monkeypatch):
+    """ uuid.uuid4 를 테스트마다 처음부터 다시 시작하는 결정적 생성기로 대체 """
+    it = iter(_UUIDS)
+    monkeypatch.setattr("uuid.uuid4", lambda: next(it))
+
+
+@pytest.fixture
+def wallet_repo():
+    """ place_bet/record_win 용 지갑 저장소 Mock (호출 기록이 테스트 간에 섞이지 않도록 함수 범위) """
+    repo = AsyncMock()
+    # async with repo.transaction() as txn: 에서 txn 으로 같은 Mock 을 돌려줌
+    repo.transaction = MagicMock()
+    repo.transaction.return_value.__aenter__.return_value = repo
+    repo.transaction.return_value.__aexit__.return_value = False
+    return repo
+
+
+@pytest.fixture
+def game_session_service():
+    """ 활성 세션을 반환하는 게임 세션 서비스 Mock """
+    service = AsyncMock()
+    service.get_session.return_value = {"id": "session789", "game_id": "game456", "status": "active"}
+    return service
+
+
+@pytest.fixture
+def cache_service():
+    """ 캐시 미스를 반환하는 캐시 서비스 Mock """
+    service = AsyncMock()
+    service.get.return_value = None
+    return service
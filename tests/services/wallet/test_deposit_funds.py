@@ -1,7 +1,16 @@
+import logging
 import pytest
+from contextlib import nullcontext
+from typing import Optional
 from unittest.mock import AsyncMock, patch
 from decimal import Decimal
 
+from redis.exceptions import ConnectionError as RedisConnectionError, RedisError, TimeoutError as RedisTimeoutError
+
+from tests.support.mock_reset import reset_mock_methods
+
+logger = logging.getLogger(__name__)
+
 # 필요한 예외 클래스 정의
 class InvalidAmountError(Exception):
     pass
@@ -76,148 +85,176 @@ async def deposit_funds(player_id: str, amount: Decimal, currency: str, wallet_r
         try:
             # 캐시 키 형식은 실제 구현과 일치해야 합니다.
             await cache_service.delete(f"balance:{player_id}:{currency}")
-        except Exception as e:
-            # 캐시 삭제 실패는 로깅하고 넘어갈 수 있음 (핵심 기능 아님)
-            print(f"Warning: Failed to delete cache for {player_id}:{currency} - {e}") 
-            pass 
+        except RedisError as e:
+            # Redis 오류(연결/타임아웃 등)는 로깅하고 넘어갈 수 있음 (핵심 기능 아님), 그 외 예외는 버그이므로 전파
+            logger.debug("cache delete failed for %s:%s: %s", player_id, currency, e)
     
     return updated_balance_data
 
 # 테스트 케이스
+_PLAYER_ID = "user123"
+_CURRENCY = "USD"
+_TRANSACTION_ID = "txn123456"
+
+
+@pytest.fixture(scope="module")
+def wallet_repo_mock() -> AsyncMock:
+    """ 모의 지갑 저장소 (모듈 당 1회 생성, _reset_mocks 가 테스트마다 초기화) """
+    return AsyncMock()
+
+
+@pytest.fixture(scope="module")
+def cache_service_mock() -> AsyncMock:
+    """ 모의 캐시 서비스 (모듈 당 1회 생성) """
+    return AsyncMock()
+
+
+# 테스트마다 초기화할 Mock 메서드
+_REPO_METHODS = ("get_balance_by_player_id", "create_transaction", "update_balance")
+_CACHE_METHODS = ("delete",)
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(wallet_repo_mock: AsyncMock, cache_service_mock: AsyncMock):
+    yield
+    reset_mock_methods(wallet_repo_mock, _REPO_METHODS)
+    reset_mock_methods(cache_service_mock, _CACHE_METHODS)
+
+
 @pytest.mark.asyncio
-async def test_deposit_funds_success():
-    """정상적인 입금 처리를 테스트합니다."""
-    # Mock 객체 생성
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
+@pytest.mark.parametrize(
+    "amount, balance, update_ret, expected_exc, match",
+    [
+        pytest.param(
+            Decimal("50.00"), Decimal("100.00"),
+            {"player_id": _PLAYER_ID, "balance": Decimal("150.00"), "currency": _CURRENCY, "updated_at": "2023-01-01T12:00:00Z"},
+            None, None, id="success",
+        ),
+        pytest.param(Decimal("-10.00"), None, None, InvalidAmountError, "0보다 커야 합니다", id="negative_amount"),
+        pytest.param(Decimal("0"), None, None, InvalidAmountError, "0보다 커야 합니다", id="zero_amount"),
+        pytest.param(
+            Decimal("50.00"), None, None, UserNotFoundError, f"사용자 ID {_PLAYER_ID}를 찾을 수 없습니다",
+            id="user_not_found",
+        ),
+        pytest.param(
+            Decimal("100.00"), Decimal("200.00"), None, WalletOperationError,
+            f"Failed to update balance for player {_PLAYER_ID}", id="update_balance_fails",
+        ),
+    ],
+)
+async def test_deposit_funds(
+    amount: Decimal,
+    balance: Optional[Decimal],
+    update_ret: Optional[dict],
+    expected_exc: Optional[type],
+    match: Optional[str],
+    wallet_repo_mock: AsyncMock,
+    cache_service_mock: AsyncMock,
+):
+    """입금 처리 (정상, 잘못된 금액, 사용자 없음, 잔액 업데이트 실패)를 테스트합니다."""
     # Mock 동작 설정
-    player_id = "user123"
-    currency = "USD"
-    current_balance = Decimal("100.00")
-    deposit_amount = Decimal("50.00")
-    transaction_id = "txn123456"
-    expected_new_balance = Decimal("150.00")
-    
-    # repo.get_balance_by_player_id가 Decimal을 반환하도록 설정
-    wallet_repo.get_balance_by_player_id.return_value = current_balance 
-    wallet_repo.create_transaction.return_value = transaction_id
-    # repo.update_balance가 업데이트된 잔액 정보를 담은 dict를 반환하도록 설정
-    wallet_repo.update_balance.return_value = {
-        "player_id": player_id,
-        "balance": expected_new_balance, 
-        "currency": currency,
-        "updated_at": "2023-01-01T12:00:00Z" # 예시 시간
-    }
-    
+    wallet_repo_mock.get_balance_by_player_id.return_value = balance
+    wallet_repo_mock.create_transaction.return_value = _TRANSACTION_ID
+    wallet_repo_mock.update_balance.return_value = update_ret
+
     # 함수 실행
-    result = await deposit_funds(
-        player_id=player_id,
-        amount=deposit_amount,
-        currency=currency,
-        wallet_repo=wallet_repo,
-        cache_service=cache_service
-    )
-    
+    with pytest.raises(expected_exc, match=match) if expected_exc else nullcontext():
+        result = await deposit_funds(
+            player_id=_PLAYER_ID,
+            amount=amount,
+            currency=_CURRENCY,
+            wallet_repo=wallet_repo_mock,
+            cache_service=cache_service_mock
+        )
+
     # 검증
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
-        player_id=player_id,
-        amount=deposit_amount,
-        currency=currency,
+    if expected_exc is InvalidAmountError:
+        # 저장소 메서드가 호출되지 않았는지 확인
+        wallet_repo_mock.get_balance_by_player_id.assert_not_called()
+        wallet_repo_mock.create_transaction.assert_not_called()
+        wallet_repo_mock.update_balance.assert_not_called()
+        return
+
+    wallet_repo_mock.get_balance_by_player_id.assert_called_once_with(_PLAYER_ID, _CURRENCY)
+
+    if expected_exc is UserNotFoundError:
+        wallet_repo_mock.create_transaction.assert_not_called()
+        wallet_repo_mock.update_balance.assert_not_called()
+        return
+
+    expected_new_balance = balance + amount
+    wallet_repo_mock.create_transaction.assert_called_once_with(
+        player_id=_PLAYER_ID,
+        amount=amount,
+        currency=_CURRENCY,
         transaction_type="deposit",
         status="completed"
     )
-    wallet_repo.update_balance.assert_called_once_with(
-        player_id=player_id,
+    wallet_repo_mock.update_balance.assert_called_once_with(
+        player_id=_PLAYER_ID,
         new_balance=expected_new_balance,
-        currency=currency,
-        transaction_id=transaction_id
+        currency=_CURRENCY,
+        transaction_id=_TRANSACTION_ID
     )
-    cache_service.delete.assert_called_once_with(f"balance:{player_id}:{currency}")
-    
-    assert result["player_id"] == player_id
+
+    if expected_exc is WalletOperationError:
+        # 캐시는 삭제 시도되지 않아야 함 (업데이트 실패 후)
+        cache_service_mock.delete.assert_not_called()
+        return
+
+    cache_service_mock.delete.assert_called_once_with(f"balance:{_PLAYER_ID}:{_CURRENCY}")
+
+    assert result["player_id"] == _PLAYER_ID
     # 결과의 balance가 Decimal 타입인지 확인하고 비교
     assert isinstance(result["balance"], Decimal)
-    assert result["balance"] == expected_new_balance 
-    assert result["currency"] == currency
+    assert result["balance"] == expected_new_balance
+    assert result["currency"] == _CURRENCY
+
+
+def _set_up_successful_deposit(wallet_repo_mock: AsyncMock) -> None:
+    wallet_repo_mock.get_balance_by_player_id.return_value = Decimal("100.00")
+    wallet_repo_mock.create_transaction.return_value = _TRANSACTION_ID
+    wallet_repo_mock.update_balance.return_value = {
+        "player_id": _PLAYER_ID, "balance": Decimal("150.00"), "currency": _CURRENCY
+    }
 
-@pytest.mark.asyncio
-async def test_deposit_funds_invalid_amount():
-    """잘못된 입금 금액(0 또는 음수)을 테스트합니다."""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
-        await deposit_funds(
-            player_id="user123",
-            amount=Decimal("-10.00"),  # 음수 금액
-            currency="USD",
-            wallet_repo=wallet_repo,
-            cache_service=cache_service
-        )
-    
-    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
-        await deposit_funds(
-            player_id="user123",
-            amount=Decimal("0"),  # 0 금액
-            currency="USD",
-            wallet_repo=wallet_repo,
-            cache_service=cache_service
-        )
-    
-    # 저장소 메서드가 호출되지 않았는지 확인
-    wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_deposit_funds_user_not_found():
-    """존재하지 않는 사용자에 대한 입금 시도 테스트"""
-    wallet_repo = AsyncMock()
-    wallet_repo.get_balance_by_player_id.return_value = None # 사용자를 찾을 수 없음
-    player_id = "nonexistent_user"
-    
-    with pytest.raises(UserNotFoundError, match=f"사용자 ID {player_id}를 찾을 수 없습니다"):
-        await deposit_funds(
-            player_id=player_id,
-            amount=Decimal("50.00"),
-            currency="USD",
-            wallet_repo=wallet_repo
-        )
-    
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, "USD")
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
+@pytest.mark.parametrize(
+    "cache_error",
+    [RedisConnectionError("connection refused"), RedisTimeoutError("timed out"), RedisError("READONLY")],
+    ids=["connection_error", "timeout_error", "redis_error"],
+)
+async def test_deposit_funds_swallows_redis_errors(
+    cache_error: RedisError, wallet_repo_mock: AsyncMock, cache_service_mock: AsyncMock
+):
+    """캐시 삭제 중 Redis 오류는 입금 결과에 영향을 주지 않는지 테스트합니다."""
+    _set_up_successful_deposit(wallet_repo_mock)
+    cache_service_mock.delete.side_effect = cache_error
+
+    result = await deposit_funds(
+        player_id=_PLAYER_ID,
+        amount=Decimal("50.00"),
+        currency=_CURRENCY,
+        wallet_repo=wallet_repo_mock,
+        cache_service=cache_service_mock
+    )
+
+    cache_service_mock.delete.assert_called_once_with(f"balance:{_PLAYER_ID}:{_CURRENCY}")
+    assert result["balance"] == Decimal("150.00")
+
 
 @pytest.mark.asyncio
-async def test_deposit_funds_update_balance_fails():
-    """잔액 업데이트 실패 시나리오 테스트"""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    player_id = "user789"
-    currency = "EUR"
-    current_balance = Decimal("200.00")
-    deposit_amount = Decimal("100.00")
-    transaction_id = "txn789012"
-    
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = None # 업데이트 실패 시뮬레이션
-    
-    with pytest.raises(WalletOperationError, match=f"Failed to update balance for player {player_id}"):
+async def test_deposit_funds_propagates_non_redis_errors(wallet_repo_mock: AsyncMock, cache_service_mock: AsyncMock):
+    """Redis 오류가 아닌 예외(버그)는 삼키지 않고 전파하는지 테스트합니다."""
+    _set_up_successful_deposit(wallet_repo_mock)
+    cache_service_mock.delete.side_effect = TypeError("bad cache key")
+
+    with pytest.raises(TypeError, match="bad cache key"):
         await deposit_funds(
-            player_id=player_id,
-            amount=deposit_amount,
-            currency=currency,
-            wallet_repo=wallet_repo,
-            cache_service=cache_service
+            player_id=_PLAYER_ID,
+            amount=Decimal("50.00"),
+            currency=_CURRENCY,
+            wallet_repo=wallet_repo_mock,
+            cache_service=cache_service_mock
         )
-    
-    # create_transaction까지는 호출되어야 함
-    wallet_repo.create_transaction.assert_called_once()
-    # update_balance도 호출은 되었어야 함 (실패했지만)
-    wallet_repo.update_balance.assert_called_once()
-    # 캐시는 삭제 시도되지 않아야 함 (업데이트 실패 후)
-    cache_service.delete.assert_not_called() 
\ No newline at end of file
@@ -1,11 +1,33 @@
+import asyncio
+import logging
 import pytest
 from unittest.mock import AsyncMock, patch
+
+from backend.cache import PipelinedCache
+from tests.support.balance_cache import (
+    get_balance_cached,
+    invalidate_balance_cache,
+    pending_cache_tasks,
+    schedule_cache_delete,
+)
+from tests.support.wallet_amounts import (
+    InvalidAmountError,
+    OpMetadata,
+    from_minor,
+    require_positive,
+    to_minor,
+)
+from tests.support.wallet_stubs import StubWalletRepo
 from decimal import Decimal
+from typing import Union
+from functools import lru_cache
 
-# 필요한 예외 클래스 정의
-class InvalidAmountError(Exception):
-    pass
+logger = logging.getLogger(__name__)
 
+# 한 게임 세션에서 베팅이 반복되므로 (game_id, session_id) 별 메타데이터 객체를 재사용 (불변 객체라 공유 가능)
+_op_metadata = lru_cache(maxsize=4096)(OpMetadata)
+
+# 필요한 예외 클래스 정의
 class InsufficientFundsError(Exception):
     pass
 
@@ -18,43 +40,136 @@ class WalletOperationError(Exception):
 class GameSessionNotFoundError(Exception):
     pass
 
+# WalletBatcher.stop 이 큐 끝에 넣는 종료 표시
+_STOP = object()
+
+class WalletBatcher:
+    """
+    동시에 들어온 베팅 차감 요청을 짧은 시간창(기본 5ms) 동안 모아 한 번에 처리하는 배처
+
+    place_bet 은 (op, future) 를 큐에 넣고 future 를 기다리며, 단일 소비자 태스크가
+    큐를 비우고 (player_id, currency) 별로 묶어 wallet_repo.debit_atomic_many 를 한 번 호출합니다.
+    저장소는 다중 행 INSERT/UPDATE ... RETURNING 한 번으로 처리하고 op 순서대로 결과를 돌려준다고 가정합니다.
+    debit_atomic 과 마찬가지로 debit_atomic_many 는 이 테스트가 가정하는 저장소 인터페이스이며
+    backend/repositories/wallet_repository.py 에는 아직 구현되어 있지 않습니다.
+    같은 키의 op 는 도착 순서를 유지하므로 잔액 조건 검사 순서가 보존됩니다.
+    stop() 은 소비자를 취소하지 않고 이미 큐에 들어온 op 를 모두 처리한 뒤 종료하므로 대기 중인 호출자가 멈추지 않습니다.
+    """
+
+    def __init__(self, wallet_repo, window: float = 0.005, max_batch_size: int = 500):
+        self.wallet_repo = wallet_repo
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._consumer = None
+
+    def start(self):
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """큐에 남은 op 를 모두 처리한 뒤 소비자를 종료합니다 (남은 future 는 예외로 완료)."""
+        consumer = self._consumer
+        if consumer is None:
+            return
+        # 종료 표시를 큐 끝에 넣어 그 앞의 op 는 모두 플러시되게 함
+        self._queue.put_nowait(_STOP)
+        try:
+            await consumer
+        finally:
+            self._consumer = None
+            # stop 중에 들어왔거나 소비자가 비정상 종료해 처리되지 못한 op 는 대기가 끝나도록 실패 처리
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _STOP and not item[1].done():
+                    item[1].set_exception(WalletOperationError("wallet batcher stopped before processing the bet"))
+
+    async def submit(self, op: dict):
+        """op 를 큐에 넣고 배치 결과(debit_atomic 과 동일한 형태)를 기다립니다."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            await asyncio.sleep(self.window)
+            stopping = False
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch):
+        # (player_id, currency) 별로 묶되 키 내부에서는 도착 순서 유지
+        groups = {}
+        for op, future in batch:
+            groups.setdefault((op["player_id"], op["currency"]), []).append((op, future))
+        ordered = [item for items in groups.values() for item in items]
+        try:
+            results = await self.wallet_repo.debit_atomic_many([op for op, _ in ordered])
+        except Exception as e:
+            for _, future in ordered:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(ordered, results):
+            if not future.done():
+                future.set_result(result)
+
 # 분리된 place_bet 함수 정의
 async def place_bet(
     player_id: str, 
-    amount: Decimal, 
+    amount: Union[int, Decimal], 
     currency: str, 
     game_id: str, 
     session_id: str,
     wallet_repo, 
     game_session_service=None,
-    cache_service=None
+    cache_service=None,
+    batcher: WalletBatcher = None
 ):
     """
     플레이어의 베팅을 처리하는 함수
+
+    잔액 차감은 wallet_repo.debit_atomic 이 조건부 UPDATE
+    (UPDATE ... SET balance = balance - :amount WHERE ... AND balance >= :amount RETURNING ...)
+    한 번으로 수행하므로, 동시에 들어온 베팅이 같은 잔액을 읽고 덮어쓰는 lost update 가 발생하지 않습니다.
+    저장소와는 정수 최소 단위(to_minor)로 주고받고, 반환하는 잔액만 Decimal 로 변환합니다.
     
     Args:
         player_id (str): 플레이어 ID
-        amount (Decimal): 베팅 금액
+        amount (Decimal | int): 베팅 금액 (float 불가)
         currency (str): 통화 단위
         game_id (str): 게임 ID
         session_id (str): 게임 세션 ID
         wallet_repo: 지갑 저장소 객체
         game_session_service: 게임 세션 서비스 객체 (기본값: None)
         cache_service: 캐시 서비스 객체 (기본값: None)
+        batcher (WalletBatcher): 지정하면 차감을 배처를 통해 다른 동시 요청과 묶어 처리 (기본값: None)
         
     Returns:
         dict: 업데이트된 잔액 정보
         
     Raises:
         InvalidAmountError: 베팅 금액이 유효하지 않은 경우
+        TypeError: 금액이 float 인 경우
         InsufficientFundsError: 잔액이 부족한 경우
         UserNotFoundError: 플레이어를 찾을 수 없는 경우
         GameSessionNotFoundError: 게임 세션을 찾을 수 없는 경우
         WalletOperationError: 지갑 작업 중 오류 발생
     """
     # 베팅 금액 유효성 검사
-    if amount <= Decimal("0"):
-        raise InvalidAmountError("베팅 금액은 0보다 커야 합니다")
+    amount_minor = require_positive(amount, "베팅")
     
     # 게임 세션 유효성 검사 (선택 사항)
     if game_session_service:
@@ -64,83 +179,62 @@ async def place_bet(
         # Optionally, check session status or game_id match here
         # if session.status != 'active' or session.game_id != game_id:
         #     raise SomeOtherSessionError("Invalid game session")
-    
-    # 기존 잔액 조회
-    current_balance = await wallet_repo.get_balance_by_player_id(player_id, currency)
-    if current_balance is None:
-        raise UserNotFoundError(f"플레이어 ID {player_id}를 찾을 수 없습니다")
-    
-    # 잔액 부족 검사
-    if current_balance < amount:
-        raise InsufficientFundsError(f"잔액 부족: 현재 잔액 {current_balance}, 요청 금액 {amount}")
-    
-    # 새 잔액 계산
-    new_balance = current_balance - amount
-    
-    # 트랜잭션 생성
-    transaction_id = await wallet_repo.create_transaction(
+
+    # 잔액 차감 + 트랜잭션 생성 (잔액이 충분할 때만 갱신되는 원자적 UPDATE, 단일 왕복)
+    op = dict(
         player_id=player_id,
-        amount=amount, # Bets are usually positive amounts, type indicates deduction
         currency=currency,
+        amount=amount_minor, # Bets are usually positive amounts, type indicates deduction
         transaction_type="bet",
-        status="completed", # Or potentially "pending" depending on game flow
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    
-    # 잔액 업데이트
-    updated_balance_data = await wallet_repo.update_balance(
-        player_id=player_id,
-        new_balance=new_balance,
-        currency=currency,
-        transaction_id=transaction_id
+        metadata=_op_metadata(game_id, session_id)
     )
+    if batcher is not None:
+        op_result = await batcher.submit(op)
+    else:
+        op_result = await wallet_repo.debit_atomic(**op)
+
+    if op_result is None:
+        # 갱신된 행이 없음: 플레이어 없음과 잔액 부족을 구분하기 위해서만 잔액 조회 (실패 경로 전용)
+        balance_row = await get_balance_cached(cache_service, wallet_repo, player_id, currency)
+        if balance_row is not None and balance_row[0] >= amount_minor and cache_service:
+            # 차감이 실패했는데 캐시 잔액은 충분함 -> 캐시가 오래된 것이므로 무효화하고 DB 에서 다시 조회
+            await invalidate_balance_cache(cache_service, player_id, currency)
+            balance_row = await get_balance_cached(cache_service, wallet_repo, player_id, currency)
+        if balance_row is None:
+            raise UserNotFoundError(f"플레이어 ID {player_id}를 찾을 수 없습니다")
+        current_balance_minor, _ = balance_row
+        raise InsufficientFundsError(f"잔액 부족: 현재 잔액 {from_minor(current_balance_minor)}, 요청 금액 {amount}")
 
+    transaction_id, updated_balance_data = op_result
     if updated_balance_data is None:
-        # Handle potential update failure (consider transaction rollback)
         raise WalletOperationError(f"Failed to update balance for player {player_id} after bet")
 
-    # 캐시 업데이트 (캐시 서비스가 있는 경우)
+    # 캐시 무효화 (캐시 서비스가 있는 경우) - 응답을 Redis 왕복에 묶지 않도록 백그라운드에서 수행
     if cache_service:
-        try:
-            await cache_service.delete(f"balance:{player_id}:{currency}")
-        except Exception as e:
-            print(f"Warning: Failed to delete cache for {player_id}:{currency} after bet - {e}")
-            pass
+        schedule_cache_delete(cache_service, player_id, currency)
     
-    return updated_balance_data
+    return {**updated_balance_data, "balance": from_minor(updated_balance_data["balance"])}
 
 # 테스트 케이스
 @pytest.mark.asyncio
-async def test_place_bet_success():
-    """정상적인 베팅 처리를 테스트합니다."""
-    # Mock 객체 생성
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
-    cache_service = AsyncMock()
-    
-    # Mock 동작 설정
+@pytest.mark.parametrize("use_session_service", [True, False], ids=["with_session_service", "without_session_service"])
+async def test_place_bet_success(use_session_service, game_session_service, cache_service):
+    """정상적인 베팅 처리를 게임 세션 서비스 유무에 따라 테스트합니다."""
     player_id = "user123"
     currency = "USD"
     game_id = "game456"
     session_id = "session789"
-    current_balance = Decimal("100.00")
     bet_amount = Decimal("50.00")
     transaction_id = "txn_bet_123"
     expected_new_balance = Decimal("50.00")
     
-    # Mock game session service to return a valid session
-    game_session_service.get_session.return_value = {"id": session_id, "game_id": game_id, "status": "active"}
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = {
+    # 저장소는 경량 스텁, 세션/캐시 서비스는 픽스처 Mock 사용
+    wallet_repo = StubWalletRepo(tx_id=transaction_id, updated={
         "player_id": player_id,
-        "balance": expected_new_balance,
+        "balance": to_minor(expected_new_balance),
         "currency": currency,
         "updated_at": "2023-01-01T12:00:00Z"
-    }
+    })
     
     # 함수 실행
     result = await place_bet(
@@ -150,30 +244,23 @@ async def test_place_bet_success():
         game_id=game_id,
         session_id=session_id,
         wallet_repo=wallet_repo,
-        game_session_service=game_session_service,
+        game_session_service=game_session_service if use_session_service else None,
         cache_service=cache_service
     )
     
-    # 검증
-    game_session_service.get_session.assert_called_once_with(session_id)
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
+    # 검증 (성공 경로에서는 잔액을 별도로 읽지 않음)
+    if use_session_service:
+        game_session_service.get_session.assert_called_once_with(session_id)
+    else:
+        game_session_service.get_session.assert_not_called()
+    assert wallet_repo.calls == [("debit_atomic", dict(
         player_id=player_id,
-        amount=bet_amount,
         currency=currency,
+        amount=to_minor(bet_amount),
         transaction_type="bet",
-        status="completed",
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    wallet_repo.update_balance.assert_called_once_with(
-        player_id=player_id,
-        new_balance=expected_new_balance,
-        currency=currency,
-        transaction_id=transaction_id
-    )
+        metadata=OpMetadata(game_id, session_id)
+    ))]
+    await asyncio.sleep(0)
     cache_service.delete.assert_called_once_with(f"balance:{player_id}:{currency}")
     
     assert result["player_id"] == player_id
@@ -182,65 +269,8 @@ async def test_place_bet_success():
     assert result["currency"] == currency
 
 @pytest.mark.asyncio
-async def test_place_bet_without_game_session_service():
-    """게임 세션 서비스 없이 베팅 처리를 테스트합니다."""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    player_id = "user123"
-    currency = "USD"
-    game_id = "game456"
-    session_id = "session789"
-    current_balance = Decimal("100.00")
-    bet_amount = Decimal("50.00")
-    transaction_id = "txn_no_gss_123"
-    expected_new_balance = Decimal("50.00")
-    
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = {
-        "player_id": player_id,
-        "balance": expected_new_balance,
-        "currency": currency,
-        "updated_at": "2023-01-01T12:00:00Z"
-    }
-    
-    # game_session_service=None 으로 함수 실행
-    result = await place_bet(
-        player_id=player_id,
-        amount=bet_amount,
-        currency=currency,
-        game_id=game_id,
-        session_id=session_id,
-        wallet_repo=wallet_repo,
-        game_session_service=None, # Explicitly None
-        cache_service=cache_service
-    )
-    
-    # 검증 (game_session_service는 호출 안 됨)
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
-        player_id=player_id,
-        amount=bet_amount,
-        currency=currency,
-        transaction_type="bet",
-        status="completed",
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    wallet_repo.update_balance.assert_called_once()
-    cache_service.delete.assert_called_once()
-    
-    assert isinstance(result["balance"], Decimal)
-    assert result["balance"] == expected_new_balance
-
-@pytest.mark.asyncio
-async def test_place_bet_invalid_amount():
+async def test_place_bet_invalid_amount(wallet_repo, game_session_service):
     """잘못된 베팅 금액(0 또는 음수)을 테스트합니다."""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
     
     with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
         await place_bet(
@@ -263,17 +293,50 @@ async def test_place_bet_invalid_amount():
             wallet_repo=wallet_repo,
             game_session_service=game_session_service
         )
+
+    # int 금액 fast path
+    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
+        await place_bet(
+            player_id="user123",
+            amount=0,
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service
+        )
+
+    # float 금액은 정밀도 손실 때문에 거부
+    with pytest.raises(TypeError, match="float"):
+        await place_bet(
+            player_id="user123",
+            amount=10.5,
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service
+        )
+
+    # bool 은 int 의 하위 클래스지만 금액이 아니므로 거부 (True 가 1 단위 베팅으로 통과하지 않음)
+    with pytest.raises(TypeError, match="bool"):
+        await place_bet(
+            player_id="user123",
+            amount=True,
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service
+        )
     
     game_session_service.get_session.assert_not_called()
+    wallet_repo.debit_atomic.assert_not_called()
     wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_place_bet_session_not_found():
+async def test_place_bet_session_not_found(wallet_repo, game_session_service):
     """존재하지 않는 게임 세션에 대한 테스트"""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
     game_session_service.get_session.return_value = None # 세션 없음
     session_id = "invalid_session"
 
@@ -289,15 +352,12 @@ async def test_place_bet_session_not_found():
         )
     
     game_session_service.get_session.assert_called_once_with(session_id)
+    wallet_repo.debit_atomic.assert_not_called()
     wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_place_bet_insufficient_balance():
-    """잔액 부족 테스트"""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
+async def test_place_bet_insufficient_balance(wallet_repo, game_session_service):
+    """잔액 부족 테스트 (조건부 차감 실패 후 잔액 조회로 원인 구분)"""
     player_id = "user123"
     currency = "USD"
     game_id = "game456"
@@ -306,7 +366,8 @@ async def test_place_bet_insufficient_balance():
     bet_amount = Decimal("50.00")
     
     game_session_service.get_session.return_value = {"id": session_id, "status": "active"}
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
+    wallet_repo.debit_atomic.return_value = None # 잔액 조건 불충족으로 갱신된 행 없음
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(current_balance), 1)
     
     with pytest.raises(InsufficientFundsError, match=f"잔액 부족: 현재 잔액 {current_balance}, 요청 금액 {bet_amount}"):
         await place_bet(
@@ -320,6 +381,180 @@ async def test_place_bet_insufficient_balance():
         )
     
     game_session_service.get_session.assert_called_once_with(session_id)
+    wallet_repo.debit_atomic.assert_called_once()
     wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called() 
\ No newline at end of file
+
+@pytest.mark.asyncio
+async def test_place_bet_insufficient_balance_stale_cache(wallet_repo, cache_service):
+    """차감 실패 시 캐시 잔액이 충분하다고 나오면 캐시를 무효화하고 DB 잔액으로 원인을 보고하는지 테스트"""
+    cache_service.get.side_effect = [(to_minor(Decimal("100.00")), 1), None, None]
+    wallet_repo.debit_atomic.return_value = None
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(Decimal("30")), 2)
+
+    with pytest.raises(InsufficientFundsError, match="잔액 부족: 현재 잔액 30.00, 요청 금액 50.00"):
+        await place_bet(
+            player_id="user123",
+            amount=Decimal("50.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            cache_service=cache_service
+        )
+
+    cache_service.delete.assert_awaited_once_with("balance:user123:USD")
+    wallet_repo.get_balance_by_player_id.assert_called_once_with("user123", "USD")
+    cache_service.set.assert_awaited_once_with("balance:user123:USD", (to_minor(Decimal("30")), 2), ex=60)
+
+@pytest.mark.asyncio
+async def test_place_bet_discards_unversioned_cache_entry(wallet_repo, cache_service):
+    """버전이 없는 이전 형식의 캐시 값은 미스로 처리되고 삭제되는지 테스트"""
+    cache_service.get.return_value = to_minor(Decimal("30"))
+    wallet_repo.debit_atomic.return_value = None
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(Decimal("30")), 4)
+
+    with pytest.raises(InsufficientFundsError):
+        await place_bet(
+            player_id="user123",
+            amount=Decimal("50.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            cache_service=cache_service
+        )
+
+    cache_service.delete.assert_any_await("balance:user123:USD")
+    cache_service.set.assert_awaited_once_with("balance:user123:USD", (to_minor(Decimal("30")), 4), ex=60)
+
+@pytest.mark.asyncio
+async def test_place_bet_user_not_found(wallet_repo):
+    """존재하지 않는 플레이어에 대한 테스트 (조건부 차감 실패 후 잔액 조회로 원인 구분)"""
+    player_id = "nonexistent_user"
+    wallet_repo.debit_atomic.return_value = None
+    wallet_repo.get_balance_by_player_id.return_value = None # 플레이어 없음
+
+    with pytest.raises(UserNotFoundError, match=f"플레이어 ID {player_id}를 찾을 수 없습니다"):
+        await place_bet(
+            player_id=player_id,
+            amount=Decimal("50.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo
+        )
+
+    wallet_repo.debit_atomic.assert_called_once()
+    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, "USD")
+
+@pytest.mark.asyncio
+async def test_place_bet_batched(wallet_repo):
+    """동시 베팅이 배처를 통해 한 번의 저장소 호출로 묶이는지 테스트합니다."""
+    currency = "USD"
+    players = ["user1", "user2", "user1"]
+
+    async def debit_atomic_many(ops):
+        return [(f"txn_{i}", {"player_id": op["player_id"], "balance": to_minor(Decimal("10.00"))}) for i, op in enumerate(ops)]
+
+    wallet_repo.debit_atomic_many.side_effect = debit_atomic_many
+    batcher = WalletBatcher(wallet_repo)
+    try:
+        results = await asyncio.gather(*[
+            place_bet(
+                player_id=player_id,
+                amount=Decimal("5.00"),
+                currency=currency,
+                game_id="game456",
+                session_id="session789",
+                wallet_repo=wallet_repo,
+                batcher=batcher
+            )
+            for player_id in players
+        ])
+    finally:
+        await batcher.stop()
+
+    wallet_repo.debit_atomic_many.assert_awaited_once()
+    wallet_repo.debit_atomic.assert_not_called()
+    # 같은 (player_id, currency) 의 op 는 도착 순서대로 인접하게 묶임
+    batched_ops = wallet_repo.debit_atomic_many.call_args.args[0]
+    assert [op["player_id"] for op in batched_ops] == ["user1", "user1", "user2"]
+    assert [r["player_id"] for r in results] == players
+
+@pytest.mark.asyncio
+async def test_wallet_batcher_stop_drains_pending_bets(wallet_repo):
+    """stop() 은 이미 큐에 들어온 베팅을 처리한 뒤 종료하므로 대기 중인 호출자가 멈추지 않습니다."""
+    async def debit_atomic_many(ops):
+        return [(f"txn_{i}", {"player_id": op["player_id"], "balance": to_minor(Decimal("10.00"))}) for i, op in enumerate(ops)]
+
+    wallet_repo.debit_atomic_many.side_effect = debit_atomic_many
+    # 시간창이 길어도 stop 이 기다리지 않고 남은 op 를 플러시해야 함
+    batcher = WalletBatcher(wallet_repo, window=0.05)
+    bets = [
+        asyncio.create_task(place_bet(
+            player_id=player_id,
+            amount=Decimal("5.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            batcher=batcher
+        ))
+        for player_id in ("user1", "user2")
+    ]
+    await asyncio.sleep(0)  # 두 베팅이 큐에 들어갈 때까지 양보
+
+    await asyncio.wait_for(batcher.stop(), timeout=1)
+
+    results = await asyncio.wait_for(asyncio.gather(*bets), timeout=1)
+    assert [r["player_id"] for r in results] == ["user1", "user2"]
+    wallet_repo.debit_atomic_many.assert_awaited_once()
+
+    # 소비자 없이 큐에만 남은 op 는 stop 시 예외로 완료됨
+    future = asyncio.get_running_loop().create_future()
+    batcher._consumer = asyncio.create_task(asyncio.sleep(0))
+    batcher._queue.put_nowait(({"player_id": "user3", "currency": "USD"}, future))
+    await batcher.stop()
+    with pytest.raises(WalletOperationError, match="stopped"):
+        await future
+
+@pytest.mark.asyncio
+async def test_place_bet_pipelined_cache_invalidation(wallet_repo):
+    """동시 베팅의 캐시 무효화가 PipelinedCache 를 통해 DEL 한 번으로 묶이는지 테스트합니다."""
+    redis_cache = AsyncMock()
+    redis_cache.delete.return_value = 3
+    wallet_repo.debit_atomic.return_value = ("txn_pipelined", {"balance": to_minor(Decimal("10.00"))})
+    cache_service = PipelinedCache(redis_cache)
+
+    await asyncio.gather(*[
+        place_bet(
+            player_id=player_id,
+            amount=Decimal("5.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            cache_service=cache_service
+        )
+        for player_id in ("user1", "user2", "user3")
+    ])
+    deleted = await asyncio.gather(*pending_cache_tasks)
+
+    redis_cache.delete.assert_awaited_once()
+    assert set(redis_cache.delete.call_args.args) == {
+        "balance:user1:USD", "balance:user2:USD", "balance:user3:USD"
+    }
+    # 각 호출자는 묶음 DEL 결과 중 자신이 요청한 키 수만큼만 돌려받음
+    assert deleted == [1, 1, 1]
+
+@pytest.mark.asyncio
+async def test_pipelined_cache_delete_returns_deleted_count():
+    """단독 호출은 감싼 캐시의 삭제 수를 그대로 받고, 빈 호출은 DEL 없이 0을 반환하는지 테스트합니다."""
+    redis_cache = AsyncMock()
+    redis_cache.delete.return_value = 1
+    cache = PipelinedCache(redis_cache)
+
+    assert await cache.delete("a", "b") == 1
+    redis_cache.delete.assert_awaited_once()
+    assert await cache.delete() == 0
+    redis_cache.delete.assert_awaited_once()
@@ -1,11 +1,27 @@
+import asyncio
+import logging
 import pytest
-from unittest.mock import AsyncMock, patch
 from decimal import Decimal
+from typing import Union
 
-# 필요한 예외 클래스 정의
-class InvalidAmountError(Exception):
-    pass
+from tests.support.balance_cache import (
+    get_balance_cached,
+    invalidate_balance_cache,
+    pending_cache_tasks,
+    schedule_cache_delete,
+)
+from tests.support.wallet_amounts import (
+    InvalidAmountError,
+    OpMetadata,
+    from_minor,
+    require_positive,
+    to_minor,
+)
+from tests.support.wallet_stubs import StubWalletRepo
+
+logger = logging.getLogger(__name__)
 
+# 필요한 예외 클래스 정의
 class UserNotFoundError(Exception):
     pass
 
@@ -15,102 +31,121 @@ class WalletOperationError(Exception):
 class GameSessionNotFoundError(Exception):
     pass
 
+# 낙관적 동시성 제어: 버전 충돌 시 최대 재시도 횟수
+_MAX_VERSION_RETRIES = 3
+
 # 분리된 record_win 함수 정의
 async def record_win(
     player_id: str, 
-    amount: Decimal, 
+    amount: Union[int, Decimal], 
     currency: str, 
     game_id: str, 
     session_id: str,
     wallet_repo, 
     game_session_service=None,
-    cache_service=None
+    cache_service=None,
+    concurrent_lookups: bool = False
 ):
     """
     플레이어의 승리 금액을 기록하고 지갑에 추가하는 함수
+
+    행 잠금 대신 버전 기반 낙관적 동시성 제어를 사용합니다: (잔액, 버전)을 읽고
+    expected_version 이 일치할 때만 갱신하며, 충돌(갱신된 행 없음) 시 잔액을 다시 읽어 재시도합니다.
+    저장소와는 정수 최소 단위(to_minor)로 주고받고, 반환하는 잔액만 Decimal 로 변환합니다.
+    cache_service 가 있으면 첫 잔액 조회는 캐시를 먼저 확인합니다 (read-through).
     
     Args:
         player_id (str): 플레이어 ID
-        amount (Decimal): 승리 금액
+        amount (Decimal | int): 승리 금액 (float 불가)
         currency (str): 통화 단위
         game_id (str): 게임 ID
         session_id (str): 게임 세션 ID
-        wallet_repo: 지갑 저장소 객체
+        wallet_repo: 지갑 저장소 객체 (transaction() 컨텍스트 매니저 지원)
         game_session_service: 게임 세션 서비스 객체 (기본값: None)
         cache_service: 캐시 서비스 객체 (기본값: None)
+        concurrent_lookups (bool): 세션 조회와 잔액 조회를 동시에 수행할지 여부 (기본값: False).
+            True 이면 세션이 없더라도 잔액 조회가 이미 시작됨
         
     Returns:
         dict: 업데이트된 잔액 정보
         
     Raises:
         InvalidAmountError: 승리 금액이 유효하지 않은 경우
+        TypeError: 금액이 float 인 경우
         UserNotFoundError: 플레이어를 찾을 수 없는 경우
         GameSessionNotFoundError: 게임 세션을 찾을 수 없는 경우
-        WalletOperationError: 지갑 작업 중 오류 발생
+        WalletOperationError: 지갑 작업 중 오류 발생 (버전 충돌 재시도 초과 포함)
     """
     # 승리 금액 유효성 검사
-    if amount <= Decimal("0"):
-        raise InvalidAmountError("승리 금액은 0보다 커야 합니다")
+    amount_minor = require_positive(amount, "승리")
     
-    # 게임 세션 유효성 검사 (선택 사항)
-    if game_session_service:
+    balance_row = None
+    if game_session_service and concurrent_lookups:
+        # 세션/잔액 조회는 서로 독립적이므로 동시에 수행 (왕복 지연 t1 + t2 -> max(t1, t2))
+        session, balance_row = await asyncio.gather(
+            game_session_service.get_session(session_id),
+            get_balance_cached(cache_service, wallet_repo, player_id, currency),
+        )
+        if not session:
+            raise GameSessionNotFoundError(f"게임 세션 ID {session_id}를 찾을 수 없습니다")
+    elif game_session_service:
+        # 게임 세션 유효성 검사 (선택 사항)
         session = await game_session_service.get_session(session_id)
         if not session:
             raise GameSessionNotFoundError(f"게임 세션 ID {session_id}를 찾을 수 없습니다")
         # Optionally, add more session checks (status, game_id match)
 
-    # 기존 잔액 조회
-    current_balance = await wallet_repo.get_balance_by_player_id(player_id, currency)
-    if current_balance is None:
-        raise UserNotFoundError(f"플레이어 ID {player_id}를 찾을 수 없습니다")
-    
-    # 새 잔액 계산
-    new_balance = current_balance + amount
-    
-    # 트랜잭션 생성
-    transaction_id = await wallet_repo.create_transaction(
-        player_id=player_id,
-        amount=amount,
-        currency=currency,
-        transaction_type="win",
-        status="completed",
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    
-    # 잔액 업데이트
-    updated_balance_data = await wallet_repo.update_balance(
-        player_id=player_id,
-        new_balance=new_balance,
-        currency=currency,
-        transaction_id=transaction_id
-    )
+    for attempt in range(_MAX_VERSION_RETRIES):
+        # 시도마다 트랜잭션 하나(단일 커넥션)에서 잔액 조회와 갱신을 수행
+        async with wallet_repo.transaction() as txn:
+            # 기존 잔액/버전 조회 (동시 조회로 이미 읽은 경우 첫 시도에서는 재사용)
+            if balance_row is None and attempt == 0:
+                balance_row = await get_balance_cached(cache_service, txn, player_id, currency)
+            elif balance_row is None:
+                # 캐시된 (잔액, 버전)이 오래되어 충돌했을 수 있으므로 재시도는 DB 에서 직접 조회
+                balance_row = await txn.get_balance_by_player_id(player_id, currency)
+            if balance_row is None:
+                raise UserNotFoundError(f"플레이어 ID {player_id}를 찾을 수 없습니다")
+            current_balance_minor, version = balance_row
+
+            # 새 잔액 계산 (정수 연산)
+            new_balance_minor = current_balance_minor + amount_minor
 
+            # 트랜잭션 생성 + 잔액 업데이트 (버전이 일치할 때만 갱신)
+            op_result = await txn.apply_wallet_op(
+                player_id=player_id,
+                amount=amount_minor,
+                currency=currency,
+                transaction_type="win",
+                new_balance=new_balance_minor,
+                expected_version=version,
+                metadata=OpMetadata(game_id, session_id)
+            )
+        if op_result is not None:
+            break
+        # 버전 충돌: 다른 요청이 먼저 갱신함 -> 캐시된 (잔액, 버전)은 오래되었으므로 무효화하고
+        # 짧게 대기 후 최신 잔액으로 재시도
+        balance_row = None
+        await invalidate_balance_cache(cache_service, player_id, currency)
+        await asyncio.sleep(0.001 * 2 ** attempt)
+    else:
+        raise WalletOperationError(f"Failed to update balance for player {player_id} after win")
+
+    transaction_id, updated_balance_data = op_result
     if updated_balance_data is None:
-         raise WalletOperationError(f"Failed to update balance for player {player_id} after win")
+        raise WalletOperationError(f"Failed to update balance for player {player_id} after win")
 
-    # 캐시 업데이트 (캐시 서비스가 있는 경우)
+    # 캐시 무효화 (캐시 서비스가 있는 경우) - 응답을 Redis 왕복에 묶지 않도록 백그라운드에서 수행
     if cache_service:
-        try:
-            await cache_service.delete(f"balance:{player_id}:{currency}")
-        except Exception as e:
-            print(f"Warning: Failed to delete cache for {player_id}:{currency} after win - {e}")
-            pass
+        schedule_cache_delete(cache_service, player_id, currency)
     
-    return updated_balance_data
+    return {**updated_balance_data, "balance": from_minor(updated_balance_data["balance"])}
 
 # 테스트 케이스
 @pytest.mark.asyncio
-async def test_record_win_success():
-    """정상적인 승리 기록 처리를 테스트합니다."""
-    # Mock 객체 생성
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
-    cache_service = AsyncMock()
-    
-    # Mock 동작 설정
+@pytest.mark.parametrize("use_session_service", [True, False], ids=["with_session_service", "without_session_service"])
+async def test_record_win_success(use_session_service, game_session_service, cache_service):
+    """정상적인 승리 기록 처리를 게임 세션 서비스 유무에 따라 테스트합니다."""
     player_id = "user123"
     currency = "USD"
     game_id = "game456"
@@ -120,15 +155,13 @@ async def test_record_win_success():
     transaction_id = "txn_win_123"
     expected_new_balance = Decimal("150.00")
     
-    game_session_service.get_session.return_value = {"id": session_id, "game_id": game_id, "status": "active"}
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = {
+    # 저장소는 경량 스텁, 세션/캐시 서비스는 픽스처 Mock 사용
+    wallet_repo = StubWalletRepo((to_minor(current_balance), 1), transaction_id, {
         "player_id": player_id,
-        "balance": expected_new_balance,
+        "balance": to_minor(expected_new_balance),
         "currency": currency,
         "updated_at": "2023-01-01T12:00:00Z"
-    }
+    })
     
     # 함수 실행
     result = await record_win(
@@ -138,30 +171,29 @@ async def test_record_win_success():
         game_id=game_id,
         session_id=session_id,
         wallet_repo=wallet_repo,
-        game_session_service=game_session_service,
+        game_session_service=game_session_service if use_session_service else None,
         cache_service=cache_service
     )
     
     # 검증
-    game_session_service.get_session.assert_called_once_with(session_id)
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
-        player_id=player_id,
-        amount=win_amount,
-        currency=currency,
-        transaction_type="win",
-        status="completed",
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    wallet_repo.update_balance.assert_called_once_with(
-        player_id=player_id,
-        new_balance=expected_new_balance,
-        currency=currency,
-        transaction_id=transaction_id
-    )
+    if use_session_service:
+        game_session_service.get_session.assert_called_once_with(session_id)
+    else:
+        game_session_service.get_session.assert_not_called()
+    assert wallet_repo.calls == [
+        ("balance", player_id, currency),
+        ("apply_wallet_op", dict(
+            player_id=player_id,
+            amount=to_minor(win_amount),
+            currency=currency,
+            transaction_type="win",
+            new_balance=to_minor(expected_new_balance),
+            expected_version=1,
+            metadata=OpMetadata(game_id, session_id)
+        )),
+    ]
+    cache_service.set.assert_called_once_with(f"balance:{player_id}:{currency}", (to_minor(current_balance), 1), ex=60)
+    await asyncio.sleep(0)
     cache_service.delete.assert_called_once_with(f"balance:{player_id}:{currency}")
     
     assert result["player_id"] == player_id
@@ -170,65 +202,8 @@ async def test_record_win_success():
     assert result["currency"] == currency
 
 @pytest.mark.asyncio
-async def test_record_win_without_game_session_service():
-    """게임 세션 서비스 없이 승리 기록 처리를 테스트합니다."""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    player_id = "user123"
-    currency = "USD"
-    game_id = "game456"
-    session_id = "session789"
-    current_balance = Decimal("100.00")
-    win_amount = Decimal("50.00")
-    transaction_id = "txn_win_no_gss"
-    expected_new_balance = Decimal("150.00")
-    
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = {
-        "player_id": player_id,
-        "balance": expected_new_balance,
-        "currency": currency,
-        "updated_at": "2023-01-01T12:00:00Z"
-    }
-    
-    # game_session_service=None 으로 함수 실행
-    result = await record_win(
-        player_id=player_id,
-        amount=win_amount,
-        currency=currency,
-        game_id=game_id,
-        session_id=session_id,
-        wallet_repo=wallet_repo,
-        game_session_service=None, # Explicitly None
-        cache_service=cache_service
-    )
-    
-    # 검증 (game_session_service는 호출 안 됨)
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
-        player_id=player_id,
-        amount=win_amount,
-        currency=currency,
-        transaction_type="win",
-        status="completed",
-        metadata={
-            "game_id": game_id,
-            "session_id": session_id
-        }
-    )
-    wallet_repo.update_balance.assert_called_once()
-    cache_service.delete.assert_called_once()
-
-    assert isinstance(result["balance"], Decimal)
-    assert result["balance"] == expected_new_balance
-
-@pytest.mark.asyncio
-async def test_record_win_invalid_amount():
+async def test_record_win_invalid_amount(wallet_repo, game_session_service):
     """잘못된 승리 금액(0 또는 음수)을 테스트합니다."""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
     
     with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
         await record_win(
@@ -251,17 +226,38 @@ async def test_record_win_invalid_amount():
             wallet_repo=wallet_repo,
             game_session_service=game_session_service
         )
+
+    # int 금액 fast path
+    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
+        await record_win(
+            player_id="user123",
+            amount=0,
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service
+        )
+
+    # float 금액은 정밀도 손실 때문에 거부
+    with pytest.raises(TypeError, match="float"):
+        await record_win(
+            player_id="user123",
+            amount=10.5,
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service
+        )
     
     game_session_service.get_session.assert_not_called()
     wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
+    wallet_repo.apply_wallet_op.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_record_win_session_not_found():
+async def test_record_win_session_not_found(wallet_repo, game_session_service):
     """존재하지 않는 게임 세션에 대한 테스트"""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
     game_session_service.get_session.return_value = None # 세션 없음
     session_id = "invalid_session"
     
@@ -278,14 +274,11 @@ async def test_record_win_session_not_found():
     
     game_session_service.get_session.assert_called_once_with(session_id)
     wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
+    wallet_repo.apply_wallet_op.assert_not_called()
 
 @pytest.mark.asyncio
-async def test_record_win_user_not_found():
+async def test_record_win_user_not_found(wallet_repo, game_session_service):
     """존재하지 않는 플레이어에 대한 테스트"""
-    wallet_repo = AsyncMock()
-    game_session_service = AsyncMock()
     player_id = "nonexistent_user"
 
     game_session_service.get_session.return_value = {"id": "session789", "status": "active"} # 세션은 존재
@@ -304,5 +297,137 @@ async def test_record_win_user_not_found():
     
     game_session_service.get_session.assert_called_once_with("session789")
     wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, "USD")
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called() 
\ No newline at end of file
+    wallet_repo.apply_wallet_op.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_record_win_concurrent_lookups(wallet_repo, game_session_service, cache_service):
+    """세션/잔액 동시 조회 모드 테스트 (세션이 없으면 잔액 조회 결과와 무관하게 실패)"""
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(Decimal("100.00")), 1)
+    wallet_repo.apply_wallet_op.return_value = ("txn_concurrent", {"player_id": "user123", "balance": to_minor(Decimal("150.00")), "currency": "USD"})
+
+    game_session_service.get_session.return_value = {"id": "session789", "status": "active"}
+    result = await record_win(
+        player_id="user123",
+        amount=Decimal("50.00"),
+        currency="USD",
+        game_id="game456",
+        session_id="session789",
+        wallet_repo=wallet_repo,
+        game_session_service=game_session_service,
+        cache_service=cache_service,
+        concurrent_lookups=True
+    )
+
+    game_session_service.get_session.assert_called_once_with("session789")
+    wallet_repo.get_balance_by_player_id.assert_called_once_with("user123", "USD")
+    wallet_repo.apply_wallet_op.assert_called_once_with(
+        player_id="user123",
+        amount=to_minor(Decimal("50.00")),
+        currency="USD",
+        transaction_type="win",
+        new_balance=to_minor(Decimal("150.00")),
+        expected_version=1,
+        metadata=OpMetadata("game456", "session789")
+    )
+    assert result["balance"] == Decimal("150.00")
+
+    # 세션 없음: 잔액 조회는 이미 시작되었지만 거래는 생성되지 않음
+    game_session_service.get_session.return_value = None
+    wallet_repo.reset_mock()
+    with pytest.raises(GameSessionNotFoundError):
+        await record_win(
+            player_id="user123",
+            amount=Decimal("50.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo,
+            game_session_service=game_session_service,
+            concurrent_lookups=True
+        )
+    wallet_repo.apply_wallet_op.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_record_win_version_conflict_retry(wallet_repo):
+    """버전 충돌 시 최신 잔액/버전으로 재시도하고, 재시도 횟수를 넘으면 실패하는지 테스트"""
+    updated = {"player_id": "user123", "balance": to_minor(Decimal("170.00")), "currency": "USD"}
+    # 첫 조회 후 다른 요청이 먼저 갱신 (버전 1 -> 2)
+    wallet_repo.get_balance_by_player_id.side_effect = [(to_minor(Decimal("100.00")), 1), (to_minor(Decimal("120.00")), 2)]
+    wallet_repo.apply_wallet_op.side_effect = [None, ("txn_win_retry", updated)]
+
+    result = await record_win(
+        player_id="user123",
+        amount=Decimal("50.00"),
+        currency="USD",
+        game_id="game456",
+        session_id="session789",
+        wallet_repo=wallet_repo
+    )
+
+    assert result == {**updated, "balance": Decimal("170.00")}
+    assert wallet_repo.get_balance_by_player_id.call_count == 2
+    last_call = wallet_repo.apply_wallet_op.call_args_list[-1]
+    assert last_call.kwargs["new_balance"] == to_minor(Decimal("170.00"))
+    assert last_call.kwargs["expected_version"] == 2
+
+    # 계속 충돌하면 재시도 횟수 초과로 실패
+    # transaction() 컨텍스트 설정은 유지하고 잔액 조회/갱신 Mock 만 초기화
+    wallet_repo.get_balance_by_player_id.reset_mock(side_effect=True)
+    wallet_repo.apply_wallet_op.reset_mock(side_effect=True)
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(Decimal("100.00")), 1)
+    wallet_repo.apply_wallet_op.return_value = None
+    with pytest.raises(WalletOperationError):
+        await record_win(
+            player_id="user123",
+            amount=Decimal("50.00"),
+            currency="USD",
+            game_id="game456",
+            session_id="session789",
+            wallet_repo=wallet_repo
+        )
+    assert wallet_repo.apply_wallet_op.call_count == _MAX_VERSION_RETRIES
+
+@pytest.mark.asyncio
+async def test_record_win_version_conflict_invalidates_cache(wallet_repo, cache_service):
+    """캐시된 버전으로 충돌하면 캐시를 무효화하고 DB 의 최신 (잔액, 버전)으로 재시도하는지 테스트"""
+    updated = {"player_id": "user123", "balance": to_minor(Decimal("170.00")), "currency": "USD"}
+    cache_service.get.return_value = (to_minor(Decimal("100.00")), 1)
+    wallet_repo.get_balance_by_player_id.return_value = (to_minor(Decimal("120.00")), 2)
+    wallet_repo.apply_wallet_op.side_effect = [None, ("txn_win_stale", updated)]
+
+    await record_win(
+        player_id="user123",
+        amount=Decimal("50.00"),
+        currency="USD",
+        game_id="game456",
+        session_id="session789",
+        wallet_repo=wallet_repo,
+        cache_service=cache_service
+    )
+    await asyncio.gather(*pending_cache_tasks)
+
+    # 충돌 직후 동기 삭제 1회 + 성공 후 백그라운드 삭제 1회
+    assert cache_service.delete.await_count == 2
+    cache_service.delete.assert_any_await("balance:user123:USD")
+    assert wallet_repo.apply_wallet_op.call_args_list[-1].kwargs["expected_version"] == 2
+
+@pytest.mark.asyncio
+async def test_record_win_balance_cache_hit(cache_service):
+    """캐시에 (잔액, 버전)이 있으면 DB 잔액 조회 없이 승리를 기록하는지 테스트"""
+    cache_service.get.return_value = (to_minor(Decimal("100.00")), 3)
+    wallet_repo = StubWalletRepo(None, "txn_win_cached", {"player_id": "user123", "balance": to_minor(Decimal("150.00")), "currency": "USD"})
+
+    result = await record_win(
+        player_id="user123",
+        amount=Decimal("50.00"),
+        currency="USD",
+        game_id="game456",
+        session_id="session789",
+        wallet_repo=wallet_repo,
+        cache_service=cache_service
+    )
+
+    assert [c[0] for c in wallet_repo.calls] == ["apply_wallet_op"]
+    assert wallet_repo.calls[0][1]["expected_version"] == 3
+    cache_service.set.assert_not_called()
+    assert result["balance"] == Decimal("150.00")
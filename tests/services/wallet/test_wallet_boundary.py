@@ -2,518 +2,373 @@
 WalletService 경계값 테스트
 """
 import pytest
+from dataclasses import dataclass
 from decimal import Decimal
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
+import functools
+import logging
+import itertools
 import uuid
-
-# 실제 경로 확인 및 필요시 수정
-try:
-    from backend.services.wallet.wallet_service import WalletService
-    from backend.models.domain.wallet import Wallet, Transaction, TransactionType, TransactionStatus
-    from backend.schemas.wallet import DebitRequest, CreditRequest
-    from backend.core.exceptions import (
-        InsufficientFundsError, ValidationError, CurrencyMismatchError,
-        InvalidAmountError, WalletNotFoundError, PartnerMismatchError # 필요한 예외 추가
+from types import SimpleNamespace
+import enum
+
+from backend.db.repositories.partner_repository import PartnerRepository
+from tests.support.mock_reset import reset_mock_methods
+
+logger = logging.getLogger(__name__)
+
+# 이 모듈의 테스트는 모두 비동기
+pytestmark = pytest.mark.asyncio
+
+# 경계값 테스트용 대체 클래스/예외
+# 실제 스키마(pydantic gt=0 검증)와 예외(필수 생성자 인자)는 이 모듈이 검증하려는 서비스 계층보다
+# 먼저 실패하므로, 테스트가 사용하는 속성만 가진 대체 타입을 사용합니다.
+# (이전의 실제 모듈 임포트는 존재하지 않는 PartnerMismatchError 때문에 항상 실패해 이 경로만 사용되었음)
+class Wallet:
+    def __init__(self, **kwargs): self.__dict__.update(kwargs)
+
+class Transaction:
+    def __init__(self, **kwargs): self.__dict__.update(kwargs)
+
+class TransactionStatus(str, enum.Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+@dataclass(slots=True)
+class CreditRequest:
+    player_id: uuid.UUID
+    reference_id: str
+    amount: Decimal
+    currency: str
+
+@dataclass(slots=True)
+class DebitRequest:
+    player_id: uuid.UUID
+    reference_id: str
+    amount: Decimal
+    currency: str
+
+class InsufficientFundsError(Exception): pass
+class CurrencyMismatchError(Exception): pass
+class InvalidAmountError(Exception): pass
+
+# 기준 지갑 식별자 (테스트마다 uuid4 를 생성하지 않도록 모듈 상수로 고정)
+_WALLET_ID = uuid.UUID(int=1)
+_PLAYER_ID = uuid.UUID(int=2)
+_PARTNER_ID = uuid.UUID(int=3)
+
+# reference_id/round_id 접미사용 카운터 (테스트 전용 식별자이므로 uuid4 대신 단조 증가 값 사용)
+_CTR = itertools.count()
+
+# 성공 응답용 공유 트랜잭션 (테스트에서 id 를 검사하지 않으므로 모듈 로드 시 한 번만 생성)
+_OK_TX = Transaction(id=uuid.UUID(int=0), status=TransactionStatus.COMPLETED)
+
+@functools.lru_cache(maxsize=32)
+def _wallet(currency, balance):
+    """ (통화, 잔액) 별 지갑을 한 번만 생성 (읽기 전용으로 공유) """
+    return Wallet(
+        id=_WALLET_ID,
+        player_id=_PLAYER_ID,
+        partner_id=_PARTNER_ID,
+        balance=balance,
+        currency=currency,
+        is_active=True
     )
-except ImportError as e:
-    print(f"Warning: Could not import actual modules: {e}. Using placeholders.")
-    # Placeholder classes/exceptions if imports fail
-    class WalletService: 
-        def __init__(self, wr, pr): pass
-        async def credit(self, req, pid): pass
-        async def ensure_wallet_exists(self, pid, cur): return (AsyncMock(), False)
-    class Wallet: 
-        def __init__(self, **kwargs): self.__dict__.update(kwargs)
-    class CreditRequest: 
-        def __init__(self, **kwargs): self.__dict__.update(kwargs)
-    class DebitRequest: 
-        def __init__(self, **kwargs): self.__dict__.update(kwargs)
-    class InsufficientFundsError(Exception): pass
-    class ValidationError(Exception): pass
-    class CurrencyMismatchError(Exception): pass
-    class InvalidAmountError(Exception): pass
-    class WalletNotFoundError(Exception): pass
-    class PartnerMismatchError(Exception): pass
 
 # 글로벌 픽스처 정의
+# pytest-xdist(--dist loadfile, pytest.ini) 에서는 이 파일 전체가 한 워커에서 실행되므로
+# 세션 스코프 픽스처는 워커 안에서만 공유됨: wallet_service 는 테스트마다 초기화
 @pytest.fixture
-def wallet_service():
-    """지갑 서비스 모킹"""
-    # 저장소 모킹
-    mock_wallet_repo = AsyncMock()
-    mock_partner_repo = AsyncMock()
-    mock_redis = AsyncMock()
-    
-    # 서비스 인스턴스 생성 및 모킹
-    service = AsyncMock(spec=WalletService)
-    service.wallet_repo = mock_wallet_repo 
-    service.partner_repo = mock_partner_repo
-    service.redis = mock_redis
-    
-    # 내부 메서드 모킹
-    service._publish_transaction_event = AsyncMock()
-    service.ensure_wallet_exists = AsyncMock()
-    
-    # 저장소 메서드 모킹
-    service.wallet_repo.get_transaction_by_reference = AsyncMock(return_value=None)
-    
-    # 트랜잭션 처리 함수 모킹
-    service.credit = AsyncMock()
-    service.debit = AsyncMock()
-    service.place_bet = AsyncMock()
-    service.record_win = AsyncMock()
-    
+def wallet(request):
+    """지갑 (indirect 파라미터 (통화, 잔액) 으로 _wallet 캐시에서 조회)"""
+    currency, balance = request.param
+    return _wallet(currency, balance)
+
+def _configure_wallet_service_defaults(service):
+    """ 테스트마다 다시 적용하는 기본 반환값 """
+    service.wallet_repo.get_transaction_by_reference.return_value = None
+    # 저장소 갱신은 항상 성공으로 응답 (유효 입력 테스트가 그대로 사용)
+    service.wallet_repo.update_wallet_balance_and_create_transaction.return_value = _OK_TX
     return service
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance,expected_exception", [
-    (Decimal("-1.00"), "USD", Decimal("100.00"), InvalidAmountError),       # 음수 금액
-    (Decimal("0.00"), "USD", Decimal("100.00"), InvalidAmountError),        # 0 금액
-    (Decimal("0.001"), "USD", Decimal("100.00"), InvalidAmountError),       # USD 소수점 정밀도 초과 (InvalidAmountError가 더 적절할 수 있음)
-    (Decimal("0.1"), "JPY", Decimal("100"), InvalidAmountError),             # JPY 소수점 사용 (InvalidAmountError가 더 적절할 수 있음)
-    # Placeholder for max limit - replace 1000... with actual limit
-    (Decimal("1000000000.00"), "USD", Decimal("100.00"), InvalidAmountError),  # 최대 한도 초과 (InvalidAmountError 또는 다른 특정 예외)
-    # Additional cases
-    (Decimal("10.00"), "EUR", Decimal("100.00"), CurrencyMismatchError),   # 통화 불일치 (지갑은 USD)
-])
-async def test_credit_boundary_invalid_inputs(wallet_service, amount, currency, initial_balance, expected_exception):
-    """입금 시 잘못된 입력값(금액, 통화) 경계값 테스트"""
-    # 지갑 설정 (테스트 케이스와 일치하도록 통화 설정 - 여기서는 USD로 가정)
-    test_currency = "USD" 
-    wallet = Wallet(
-        id=uuid.uuid4(),
-        player_id=uuid.uuid4(),
-        partner_id=uuid.uuid4(),
-        balance=initial_balance,
-        currency=test_currency, # Wallet's currency
-        is_active=True
-    )
-    # Setup the mock return value for ensure_wallet_exists
-    # The service method under test ('credit') will likely call this first
-    wallet_service.ensure_wallet_exists.return_value = (wallet, False) # Simulate wallet exists
-    
-    # 요청 생성 (요청 통화는 parametrize에서 받아옴)
-    request = CreditRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-CREDIT-BOUNDARY-{str(uuid.uuid4())[:8]}",
-        amount=amount,
-        currency=currency # Request's currency
+# 모의 저장소가 제공하는 메서드 (spec_set 및 테스트마다 초기화 대상)
+_REPO_METHODS = (
+    "get_transaction_by_reference",
+    "update_wallet_balance_and_create_transaction",
+)
+
+def _build_wallet_service():
+    """지갑 서비스 모킹 생성 (세션 당 1회)
+
+    테스트가 사용하는 속성만 가진 SimpleNamespace 로 구성 (spec=WalletService 의 전체 속성 탐색 회피)
+    """
+    # 저장소 모킹
+    mock_wallet_repo = AsyncMock(spec_set=list(_REPO_METHODS))
+    mock_wallet_repo.get_transaction_by_reference = AsyncMock()
+    mock_wallet_repo.update_wallet_balance_and_create_transaction = AsyncMock()
+    # spec_set: 존재하지 않는 메서드 접근 시 AttributeError (자식 mock 무한 생성 방지)
+    mock_partner_repo = AsyncMock(spec_set=PartnerRepository)
+
+    service = SimpleNamespace(
+        wallet_repo=mock_wallet_repo,
+        partner_repo=mock_partner_repo,
+        redis=AsyncMock(),
+        # 내부 메서드 모킹
+        _publish_transaction_event=AsyncMock(),
+        ensure_wallet_exists=AsyncMock(),
+        # 트랜잭션 처리 함수 모킹
+        credit=AsyncMock(),
+        debit=AsyncMock(),
+        place_bet=AsyncMock(),
+        record_win=AsyncMock(),
     )
-    
-    print(f"\nTesting credit invalid: Wallet Currency={test_currency}, Request Currency={currency}, Amount={amount}, Expecting={expected_exception.__name__}")
+    return _configure_wallet_service_defaults(service)
 
-    # Configure side_effect *before* calling the method
-    wallet_service.credit.side_effect = expected_exception("Mock raising")
+# 테스트가 반환값/side_effect 를 설정하는 서비스 메서드 (테스트마다 초기화 대상)
+_SERVICE_METHODS = (
+    "credit", "debit", "place_bet", "record_win",
+    "ensure_wallet_exists", "_publish_transaction_event",
+)
 
-    with pytest.raises(expected_exception) as exc_info:
-        # Call the actual mock method inside the context manager
-        await wallet_service.credit(request=request)
+@pytest.fixture(scope="session")
+def wallet_service():
+    """지갑 서비스 모킹 (세션 당 1회 생성, _reset_wallet_service 가 테스트마다 초기화)"""
+    yield _build_wallet_service()
+
+@pytest.fixture(autouse=True)
+def _reset_wallet_service(wallet_service):
+    """ 세션 스코프 wallet_service 를 테스트마다 초기 상태로 되돌림 (Mock 재생성 대신 reset_mock) """
+    yield
+    for name in _SERVICE_METHODS:
+        getattr(wallet_service, name).reset_mock(return_value=True, side_effect=True)
+    reset_mock_methods(wallet_service.wallet_repo, _REPO_METHODS)
+    _configure_wallet_service_defaults(wallet_service)
+
+# 요청 클래스 (스키마에 없는 베팅/승리 요청은 테스트 전용 정의)
+@dataclass(slots=True)
+class PlaceBetRequest:
+    player_id: uuid.UUID
+    reference_id: str
+    round_id: str
+    game_id: str
+    amount: Decimal
+    currency: str
+
+@dataclass(slots=True)
+class RecordWinRequest:
+    player_id: uuid.UUID
+    reference_id: str
+    round_id: str
+    game_id: str
+    amount: Decimal
+    currency: str
+
+_REQUEST_CLS = {
+    "credit": CreditRequest,
+    "debit": DebitRequest,
+    "place_bet": PlaceBetRequest,
+    "record_win": RecordWinRequest,
+}
+
+def _next_ref(op):
+    """ 연산별 테스트 reference_id (카운터 기반) """
+    return f"TEST-{op.upper()}-{next(_CTR):08x}"
+
+def _build_request(op, wallet, params):
+    """ 파라미터(amount/currency)로 연산별 요청 생성 (베팅/승리는 round_id/game_id 추가) """
+    kwargs = dict(player_id=wallet.player_id, reference_id=_next_ref(op), **params)
+    if op in ("place_bet", "record_win"):
+        kwargs.update(round_id=f"ROUND-{next(_CTR):08x}", game_id="test_game_boundary")
+    return _REQUEST_CLS[op](**kwargs)
+
+@functools.lru_cache(maxsize=128)
+def D(s):
+    """ 같은 금액 문자열은 한 번만 파싱 (Decimal 은 불변이므로 공유해도 안전) """
+    return Decimal(s)
+
+# 여러 parametrize 에서 공유하는 금액 상수 (임포트 시 한 번만 파싱)
+USD_100 = D("100.00")
+USD_OVER_100 = D("100.01")
+USD_MIN = D("0.01")
+USD_LARGE = D("9999999.99")
+JPY_MIN = D("1")
+JPY_10000 = D("10000")
+
+async def _balance_check(request, partner_id=None, *, svc, exc_cls):
+    """ 잔액 확인 side_effect (functools.partial 로 svc/exc_cls 를 묶어 사용) """
+    fetched_wallet, _ = await svc.ensure_wallet_exists(request.player_id, request.currency)
+    if request.amount > fetched_wallet.balance:
+        raise exc_cls(f"Cannot apply {request.amount}, balance is {fetched_wallet.balance}")
+    # 잔액이 충분하면 성공 리턴
+    return _OK_TX
+
+# 모든 지갑 연산에 공통인 잘못된 입력 경계값 (지갑 통화는 USD)
+INVALID_CASES = [
+    pytest.param({"amount": D("-1.00"), "currency": "USD"}, ("USD", USD_100), InvalidAmountError, id="neg-usd"),          # 음수 금액
+    pytest.param({"amount": D("0.00"), "currency": "USD"}, ("USD", USD_100), InvalidAmountError, id="zero-usd"),          # 0 금액
+    pytest.param({"amount": D("0.001"), "currency": "USD"}, ("USD", USD_100), InvalidAmountError, id="precision-usd"),    # USD 소수점 정밀도 초과
+    pytest.param({"amount": D("0.1"), "currency": "JPY"}, ("USD", JPY_10000), InvalidAmountError, id="fraction-jpy"),        # JPY 소수점 사용
+    # Placeholder for max limit - replace 1000... with actual limit
+    pytest.param({"amount": D("1000000000.00"), "currency": "USD"}, ("USD", D("2000000000.00")), InvalidAmountError, id="over-max-usd"), # 최대 한도 초과 (충분한 잔액 가정)
+    pytest.param({"amount": D("10.00"), "currency": "EUR"}, ("USD", USD_100), CurrencyMismatchError, id="currency-mismatch"),  # 통화 불일치 (지갑은 USD)
+]
+
+@pytest.mark.parametrize("op", list(_REQUEST_CLS))
+@pytest.mark.parametrize("params,wallet,expected_exception", INVALID_CASES, indirect=["wallet"])
+async def test_boundary_invalid_inputs(wallet_service, wallet, op, params, expected_exception):
+    """입금/출금/베팅/승리 기록 시 잘못된 입력값(금액, 통화) 경계값 테스트"""
+    wallet_service.ensure_wallet_exists.return_value = (wallet, False)
 
-    # Optional: Verify the mock was called
-    wallet_service.credit.assert_awaited_once_with(request=request)
+    request = _build_request(op, wallet, params) # params["currency"] 는 요청 통화
 
-    # Reset side_effect for subsequent tests
-    wallet_service.credit.side_effect = None
+    method = getattr(wallet_service, op)
+    # Configure side_effect *before* calling the method (초기화는 _reset_wallet_service 가 담당)
+    method.side_effect = expected_exception("Mock raising")
 
-# --- Add more boundary tests below --- 
+    with pytest.raises(expected_exception):
+        await method(request=request, partner_id=wallet.partner_id)
 
-# Example: Test for valid credit amounts (should NOT raise InvalidAmountError etc.)
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("0.01"), "USD", Decimal("100.00")),       # 최소 금액 (USD)
-    (Decimal("1"), "JPY", Decimal("10000")),            # 최소 금액 (JPY)
-    (Decimal("9999999.99"), "USD", Decimal("100.00")), # 큰 금액 (USD)
-])
-async def test_credit_boundary_valid_inputs(wallet_service, amount, currency, initial_balance):
-    """입금 시 유효한 금액 경계값 테스트 (예외 발생 X)"""
-    wallet = Wallet(
-        id=uuid.uuid4(),
-        player_id=uuid.uuid4(),
-        partner_id=uuid.uuid4(),
-        balance=initial_balance,
-        currency=currency, # Wallet currency matches request currency
-        is_active=True
-    )
-    wallet_service.ensure_wallet_exists.return_value = (wallet, False)
-    wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
-    # Mock the repo update call to simulate success
-    wallet_service.wallet_repo.update_wallet_balance_and_create_transaction = AsyncMock(
-        return_value=Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    )
+async def test_credit_is_awaited_with_request(wallet_service):
+    """호출 형태(request/partner_id 키워드 인자) 확인 (파라미터화된 경계값 테스트에서는 생략)"""
+    wallet = _wallet("USD", USD_100)
+    request = _build_request("credit", wallet, {"amount": USD_MIN, "currency": wallet.currency})
 
-    request = CreditRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-CREDIT-VALID-{str(uuid.uuid4())[:8]}",
-        amount=amount,
-        currency=currency
-    )
+    await wallet_service.credit(request=request, partner_id=wallet.partner_id)
 
-    print(f"\nTesting valid credit: Currency={currency}, Amount={amount}")
-    try:
-        await wallet_service.credit(request, wallet.partner_id)
-        # If no exception is raised, the test passes for valid inputs
-        print("Credit call succeeded as expected.")
-    except (InvalidAmountError, ValidationError, CurrencyMismatchError) as e:
-        pytest.fail(f"Valid credit input raised unexpected exception: {e}")
+    wallet_service.credit.assert_awaited_once_with(request=request, partner_id=wallet.partner_id)
 
-# --- Debit Boundary Tests ---
+# --- Add more boundary tests below --- 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance,expected_exception", [
-    (Decimal("-1.00"), "USD", Decimal("100.00"), InvalidAmountError),       # 음수 금액
-    (Decimal("0.00"), "USD", Decimal("100.00"), InvalidAmountError),        # 0 금액
-    (Decimal("0.001"), "USD", Decimal("100.00"), InvalidAmountError),       # USD 소수점 정밀도 초과
-    (Decimal("0.1"), "JPY", Decimal("10000"), InvalidAmountError),           # JPY 소수점 사용
-    # Placeholder for max limit (assuming same as credit, adjust if different)
-    (Decimal("1000000000.00"), "USD", Decimal("2000000000.00"), InvalidAmountError), # 최대 한도 초과 (충분한 잔액 가정)
-    (Decimal("10.00"), "EUR", Decimal("100.00"), CurrencyMismatchError),   # 통화 불일치 (지갑은 USD)
-])
-async def test_debit_boundary_invalid_inputs(wallet_service, amount, currency, initial_balance, expected_exception):
-    """출금 시 잘못된 입력값(금액, 통화) 경계값 테스트"""
-    test_currency = "USD" # Wallet currency
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=test_currency, is_active=True
-    )
+# Example: Test for valid credit amounts (should NOT raise InvalidAmountError etc.)
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_MIN, "currency": "USD"}, ("USD", USD_100), id="credit-min-usd"),       # 최소 금액 (USD)
+    pytest.param({"amount": JPY_MIN, "currency": "JPY"}, ("JPY", JPY_10000), id="credit-min-jpy"),            # 최소 금액 (JPY)
+    pytest.param({"amount": USD_LARGE, "currency": "USD"}, ("USD", USD_100), id="credit-large-usd"), # 큰 금액 (USD)
+], indirect=["wallet"])
+async def test_credit_boundary_valid_inputs(wallet_service, wallet, params):
+    """입금 시 유효한 금액 경계값 테스트 (예외 발생 X)"""
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
 
-    request = DebitRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-DEBIT-INVALID-{str(uuid.uuid4())[:8]}",
-        amount=amount,
-        currency=currency # Request currency
-    )
-
-    print(f"\nTesting debit invalid: Wallet Currency={test_currency}, Request Currency={currency}, Amount={amount}, Expecting={expected_exception.__name__}")
-
-    # Configure side_effect *before* calling the method
-    wallet_service.debit.side_effect = expected_exception("Mock raising")
+    request = _build_request("credit", wallet, params)
 
-    with pytest.raises(expected_exception) as exc_info:
-        # Call the actual mock method inside the context manager
-        # Assuming partner_id is required for debit
-        await wallet_service.debit(request=request, partner_id=wallet.partner_id)
+    assert wallet_service.credit.side_effect is None
+    await wallet_service.credit(request, wallet.partner_id)
 
-    # Optional verification
-    wallet_service.debit.assert_awaited_once_with(request=request, partner_id=wallet.partner_id)
-    wallet_service.debit.side_effect = None # Reset side effect
+# --- Debit Boundary Tests ---
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("0.01"), "USD", Decimal("100.00")),       # 최소 금액 (USD)
-    (Decimal("1"), "JPY", Decimal("10000")),            # 최소 금액 (JPY)
-    (Decimal("9999999.99"), "USD", Decimal("10000000.00")), # 큰 금액 (USD, 충분한 잔액)
-])
-async def test_debit_boundary_valid_inputs(wallet_service, amount, currency, initial_balance):
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_MIN, "currency": "USD"}, ("USD", USD_100), id="debit-min-usd"),       # 최소 금액 (USD)
+    pytest.param({"amount": JPY_MIN, "currency": "JPY"}, ("JPY", JPY_10000), id="debit-min-jpy"),            # 최소 금액 (JPY)
+    pytest.param({"amount": USD_LARGE, "currency": "USD"}, ("USD", D("10000000.00")), id="debit-large-usd"), # 큰 금액 (USD, 충분한 잔액)
+], indirect=["wallet"])
+async def test_debit_boundary_valid_inputs(wallet_service, wallet, params):
     """출금 시 유효한 금액 경계값 테스트 (예외 발생 X)"""
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=currency, is_active=True
-    )
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
-    # Mock the repo update call to simulate success
-    wallet_service.wallet_repo.update_wallet_balance_and_create_transaction = AsyncMock(
-        return_value=Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    )
 
-    request = DebitRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-DEBIT-VALID-{str(uuid.uuid4())[:8]}",
-        amount=amount,
-        currency=currency
-    )
+    request = _build_request("debit", wallet, params)
+
+    assert wallet_service.debit.side_effect is None
+    await wallet_service.debit(request, wallet.partner_id)
 
-    print(f"\nTesting valid debit: Currency={currency}, Amount={amount}, Initial Balance={initial_balance}")
-    try:
-        await wallet_service.debit(request, wallet.partner_id)
-        print("Debit call succeeded as expected.")
-    except (InvalidAmountError, ValidationError, CurrencyMismatchError, InsufficientFundsError) as e:
-        pytest.fail(f"Valid debit input raised unexpected exception: {e}")
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("100.00"), "USD", Decimal("100.00")), # 잔액과 정확히 같은 금액 출금
-    (Decimal("100.01"), "USD", Decimal("100.00")), # 잔액보다 약간 큰 금액 출금
-    (Decimal("10000"), "JPY", Decimal("10000")),    # 잔액과 정확히 같은 금액 출금 (JPY)
-    (Decimal("10001"), "JPY", Decimal("10000")),    # 잔액보다 약간 큰 금액 출금 (JPY)
-])
-async def test_debit_boundary_insufficient_funds(wallet_service, amount, currency, initial_balance):
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_100, "currency": "USD"}, ("USD", USD_100), id="debit-exact-usd"), # 잔액과 정확히 같은 금액 출금
+    pytest.param({"amount": USD_OVER_100, "currency": "USD"}, ("USD", USD_100), id="debit-over-usd"),  # 잔액보다 약간 큰 금액 출금
+    pytest.param({"amount": JPY_10000, "currency": "JPY"}, ("JPY", JPY_10000), id="debit-exact-jpy"),    # 잔액과 정확히 같은 금액 출금 (JPY)
+    pytest.param({"amount": D("10001"), "currency": "JPY"}, ("JPY", JPY_10000), id="debit-over-jpy"),     # 잔액보다 약간 큰 금액 출금 (JPY)
+], indirect=["wallet"])
+async def test_debit_boundary_insufficient_funds(wallet_service, wallet, params):
     """출금 시 잔액 부족 경계값 테스트 (InsufficientFundsError 발생)"""
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=currency, is_active=True
-    )
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
     
-    # 서비스의 debit 메서드를 모킹하여 잔액 확인 로직 포함
-    original_debit = wallet_service.debit
-    
-    async def mock_debit_with_check(request, partner_id=None):
-        fetched_wallet, _ = await wallet_service.ensure_wallet_exists(request.player_id, request.currency)
-        if request.amount > fetched_wallet.balance:
-            raise InsufficientFundsError(f"Cannot debit {request.amount}, balance is {fetched_wallet.balance}")
-        # 잔액이 충분하면 성공 리턴
-        print("Mock debit: Sufficient funds, pretending success (for exact balance case)")
-        return Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    
-    wallet_service.debit.side_effect = mock_debit_with_check
-
-    request = DebitRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-DEBIT-INSUFFICIENT-{str(uuid.uuid4())[:8]}",
-        amount=amount,
-        currency=currency
+    # 서비스의 debit 메서드를 모킹하여 잔액 확인 로직 포함 (side_effect 는 _reset_wallet_service 가 초기화)
+    wallet_service.debit.side_effect = functools.partial(
+        _balance_check, svc=wallet_service, exc_cls=InsufficientFundsError
     )
 
-    print(f"\nTesting insufficient funds debit: Currency={currency}, Amount={amount}, Initial Balance={initial_balance}")
-    
-    if amount <= initial_balance:
+    request = _build_request("debit", wallet, params)
+
+    if params["amount"] <= wallet.balance:
         # 정확히 잔액만큼 출금 - 성공해야 함
         try:
             await wallet_service.debit(request, wallet.partner_id)
-            print("Debit call for exact balance succeeded as expected.")
         except InsufficientFundsError as e:
              pytest.fail(f"Debiting exact balance raised unexpected InsufficientFundsError: {e}")
         except Exception as e:
              pytest.fail(f"Debiting exact balance raised unexpected exception: {e}")
     else:
         # 잔액보다 많은 금액 출금 - InsufficientFundsError 발생해야 함
-        with pytest.raises(InsufficientFundsError) as exc_info:
+        with pytest.raises(InsufficientFundsError):
             await wallet_service.debit(request, wallet.partner_id)
-        print(f"Caught expected InsufficientFundsError: {exc_info.type.__name__}")
-
-    # 원래 mock으로 복원
-    wallet_service.debit = original_debit
 
 # --- Place Bet Boundary Tests ---
 
-# PlaceBetRequest 클래스 정의
-class PlaceBetRequest: 
-    def __init__(self, **kwargs): 
-        self.__dict__.update(kwargs)
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance,expected_exception", [
-    (Decimal("-10.00"), "USD", Decimal("100.00"), InvalidAmountError),      # 음수 베팅 금액
-    (Decimal("0.00"), "USD", Decimal("100.00"), InvalidAmountError),       # 0 베팅 금액
-    (Decimal("0.001"), "USD", Decimal("100.00"), InvalidAmountError),      # USD 소수점 정밀도 초과
-    (Decimal("0.5"), "JPY", Decimal("10000"), InvalidAmountError),          # JPY 소수점 사용
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_MIN, "currency": "USD"}, ("USD", D("1.00")), id="bet-min-usd"),        # 최소 베팅 금액 (USD)
+    pytest.param({"amount": JPY_MIN, "currency": "JPY"}, ("JPY", D("100")), id="bet-min-jpy"),             # 최소 베팅 금액 (JPY)
     # Add test for max bet limit if defined, e.g.:
-    # (Decimal("10001.00"), "USD", Decimal("20000.00"), InvalidAmountError), # 최대 베팅 한도 초과
-    (Decimal("10.00"), "EUR", Decimal("100.00"), CurrencyMismatchError),  # 통화 불일치 (지갑은 USD)
-])
-async def test_place_bet_boundary_invalid_inputs(wallet_service, amount, currency, initial_balance, expected_exception):
-    """베팅 시 잘못된 입력값(금액, 통화) 경계값 테스트"""
-    test_currency = "USD" # Wallet currency
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=test_currency, is_active=True
-    )
-    wallet_service.ensure_wallet_exists.return_value = (wallet, False)
-    # Assume place_bet might check for duplicate transaction references
-    wallet_service.wallet_repo.get_transaction_by_reference.return_value = None 
-
-    request = PlaceBetRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-BET-INVALID-{str(uuid.uuid4())[:8]}",
-        round_id=f"ROUND-{str(uuid.uuid4())[:8]}",
-        game_id="test_game_boundary",
-        amount=amount,
-        currency=currency
-    )
-
-    print(f"\nTesting place_bet invalid: Wallet Currency={test_currency}, Request Currency={currency}, Amount={amount}, Expecting={expected_exception.__name__}")
-    
-    # Configure side_effect *before* calling the method
-    wallet_service.place_bet.side_effect = expected_exception("Mock raising")
-
-    with pytest.raises(expected_exception) as exc_info:
-        # Call the actual mock method inside the context manager
-        # Assuming partner_id is required for place_bet
-        await wallet_service.place_bet(request=request, partner_id=wallet.partner_id)
-
-    # Optional verification
-    wallet_service.place_bet.assert_awaited_once_with(request=request, partner_id=wallet.partner_id)
-    wallet_service.place_bet.side_effect = None # Reset side effect
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("0.01"), "USD", Decimal("1.00")),        # 최소 베팅 금액 (USD)
-    (Decimal("1"), "JPY", Decimal("100")),             # 최소 베팅 금액 (JPY)
-    # Add test for max bet limit if defined, e.g.:
-    # (Decimal("10000.00"), "USD", Decimal("20000.00")), # 최대 베팅 금액
-])
-async def test_place_bet_boundary_valid_inputs(wallet_service, amount, currency, initial_balance):
+    # pytest.param({"amount": D("10000.00"), "currency": "USD"}, ("USD", D("20000.00")), id="bet-max-usd"), # 최대 베팅 금액
+], indirect=["wallet"])
+async def test_place_bet_boundary_valid_inputs(wallet_service, wallet, params):
     """베팅 시 유효한 금액 경계값 테스트 (예외 발생 X)"""
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=currency, is_active=True
-    )
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
-    # Mock repo/service calls to simulate successful bet placement
-    wallet_service.wallet_repo.update_wallet_balance_and_create_transaction = AsyncMock(
-        return_value=Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    )
     # Ensure place_bet method exists and is mocked for success
-    wallet_service.place_bet.return_value = Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-
-    request = PlaceBetRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-BET-VALID-{str(uuid.uuid4())[:8]}",
-        round_id=f"ROUND-{str(uuid.uuid4())[:8]}",
-        game_id="test_game_boundary",
-        amount=amount,
-        currency=currency
-    )
+    wallet_service.place_bet.return_value = _OK_TX
+
+    request = _build_request("place_bet", wallet, params)
 
-    print(f"\nTesting valid place_bet: Currency={currency}, Amount={amount}, Initial Balance={initial_balance}")
-    try:
-        await wallet_service.place_bet(request, wallet.partner_id)
-        print("Place bet call succeeded as expected.")
-    except (InvalidAmountError, ValidationError, CurrencyMismatchError, InsufficientFundsError) as e:
-        pytest.fail(f"Valid place_bet input raised unexpected exception: {e}")
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("100.00"), "USD", Decimal("100.00")), # 잔액과 정확히 같은 금액 베팅
-    (Decimal("100.01"), "USD", Decimal("100.00")), # 잔액보다 약간 큰 금액 베팅
-])
-async def test_place_bet_boundary_insufficient_funds(wallet_service, amount, currency, initial_balance):
+    assert wallet_service.place_bet.side_effect is None
+    await wallet_service.place_bet(request, wallet.partner_id)
+
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_100, "currency": "USD"}, ("USD", USD_100), id="bet-exact-usd"), # 잔액과 정확히 같은 금액 베팅
+    pytest.param({"amount": USD_OVER_100, "currency": "USD"}, ("USD", USD_100), id="bet-over-usd"),  # 잔액보다 약간 큰 금액 베팅
+], indirect=["wallet"])
+async def test_place_bet_boundary_insufficient_funds(wallet_service, wallet, params):
     """베팅 시 잔액 부족 경계값 테스트 (InsufficientFundsError 발생)"""
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=currency, is_active=True
-    )
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
     
-    # Mock the place_bet method to simulate the balance check
-    original_place_bet = wallet_service.place_bet
-    
-    async def mock_place_bet_with_check(request, partner_id=None):
-        fetched_wallet, _ = await wallet_service.ensure_wallet_exists(request.player_id, request.currency)
-        if request.amount > fetched_wallet.balance:
-            raise InsufficientFundsError(f"Cannot place bet {request.amount}, balance is {fetched_wallet.balance}")
-        print("Mock place_bet: Sufficient funds, pretending success (for exact balance case)")
-        return Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    
-    wallet_service.place_bet.side_effect = mock_place_bet_with_check
-
-    request = PlaceBetRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-BET-INSUFFICIENT-{str(uuid.uuid4())[:8]}",
-        round_id=f"ROUND-{str(uuid.uuid4())[:8]}",
-        game_id="test_game_boundary",
-        amount=amount,
-        currency=currency
+    # Mock the place_bet method to simulate the balance check (side_effect 는 _reset_wallet_service 가 초기화)
+    wallet_service.place_bet.side_effect = functools.partial(
+        _balance_check, svc=wallet_service, exc_cls=InsufficientFundsError
     )
 
-    print(f"\nTesting insufficient funds place_bet: Currency={currency}, Amount={amount}, Initial Balance={initial_balance}")
-    
-    if amount <= initial_balance:
+    request = _build_request("place_bet", wallet, params)
+
+    if params["amount"] <= wallet.balance:
         # 정확히 잔액만큼 베팅 - 성공해야 함
         try:
             await wallet_service.place_bet(request, wallet.partner_id)
-            print("Place bet call for exact balance succeeded as expected.")
         except InsufficientFundsError as e:
             pytest.fail(f"Betting exact balance raised unexpected InsufficientFundsError: {e}")
         except Exception as e:
             pytest.fail(f"Betting exact balance raised unexpected exception: {e}")
     else:
         # 잔액보다 많은 금액 베팅 - InsufficientFundsError 발생해야 함
-        with pytest.raises(InsufficientFundsError) as exc_info:
+        with pytest.raises(InsufficientFundsError):
             await wallet_service.place_bet(request, wallet.partner_id)
-        print(f"Caught expected InsufficientFundsError: {exc_info.type.__name__}")
-        
-    # 원래 mock으로 복원
-    wallet_service.place_bet = original_place_bet
 
 # --- Record Win Boundary Tests ---
 
-# RecordWinRequest 클래스 정의
-class RecordWinRequest:
-    def __init__(self, **kwargs): 
-        self.__dict__.update(kwargs)
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance,expected_exception", [
-    (Decimal("-50.00"), "USD", Decimal("50.00"), InvalidAmountError),       # 음수 승리 금액
-    (Decimal("0.00"), "USD", Decimal("50.00"), InvalidAmountError),        # 0 승리 금액
-    (Decimal("0.001"), "USD", Decimal("50.00"), InvalidAmountError),       # USD 소수점 정밀도 초과
-    (Decimal("0.5"), "JPY", Decimal("5000"), InvalidAmountError),          # JPY 소수점 사용
-    # Add test for max win limit if defined
-    (Decimal("10.00"), "EUR", Decimal("50.00"), CurrencyMismatchError),   # 통화 불일치 (지갑은 USD)
-])
-async def test_record_win_boundary_invalid_inputs(wallet_service, amount, currency, initial_balance, expected_exception):
-    """승리 기록 시 잘못된 입력값(금액, 통화) 경계값 테스트"""
-    test_currency = "USD" # Wallet currency
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=test_currency, is_active=True
-    )
-    wallet_service.ensure_wallet_exists.return_value = (wallet, False)
-    wallet_service.wallet_repo.get_transaction_by_reference.return_value = None # Assume win ref ID is checked
-
-    request = RecordWinRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-WIN-INVALID-{str(uuid.uuid4())[:8]}",
-        round_id=f"ROUND-{str(uuid.uuid4())[:8]}", # Should match a preceding bet potentially
-        game_id="test_game_boundary",
-        amount=amount,
-        currency=currency
-    )
-
-    print(f"\nTesting record_win invalid: Wallet Currency={test_currency}, Request Currency={currency}, Amount={amount}, Expecting={expected_exception.__name__}")
-    
-    # Configure side_effect *before* calling the method
-    wallet_service.record_win.side_effect = expected_exception("Mock raising")
-
-    with pytest.raises(expected_exception) as exc_info:
-        # Call the actual mock method inside the context manager
-        await wallet_service.record_win(request=request, partner_id=wallet.partner_id)
-        
-    # Optional verification
-    wallet_service.record_win.assert_awaited_once_with(request=request, partner_id=wallet.partner_id)
-    wallet_service.record_win.side_effect = None # Reset side effect
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("amount,currency,initial_balance", [
-    (Decimal("0.01"), "USD", Decimal("50.00")),        # 최소 승리 금액 (USD)
-    (Decimal("1"), "JPY", Decimal("5000")),             # 최소 승리 금액 (JPY)
-    (Decimal("9999999.99"), "USD", Decimal("50.00")),  # 큰 승리 금액 (USD)
-])
-async def test_record_win_boundary_valid_inputs(wallet_service, amount, currency, initial_balance):
+@pytest.mark.parametrize("params,wallet", [
+    pytest.param({"amount": USD_MIN, "currency": "USD"}, ("USD", D("50.00")), id="win-min-usd"),        # 최소 승리 금액 (USD)
+    pytest.param({"amount": JPY_MIN, "currency": "JPY"}, ("JPY", D("5000")), id="win-min-jpy"),             # 최소 승리 금액 (JPY)
+    pytest.param({"amount": USD_LARGE, "currency": "USD"}, ("USD", D("50.00")), id="win-large-usd"),  # 큰 승리 금액 (USD)
+], indirect=["wallet"])
+async def test_record_win_boundary_valid_inputs(wallet_service, wallet, params):
     """승리 기록 시 유효한 금액 경계값 테스트 (예외 발생 X)"""
-    wallet = Wallet(
-        id=uuid.uuid4(), player_id=uuid.uuid4(), partner_id=uuid.uuid4(),
-        balance=initial_balance, currency=currency, is_active=True
-    )
     wallet_service.ensure_wallet_exists.return_value = (wallet, False)
     wallet_service.wallet_repo.get_transaction_by_reference.return_value = None
-    # Mock repo/service calls for successful win recording
-    wallet_service.wallet_repo.update_wallet_balance_and_create_transaction = AsyncMock(
-        return_value=Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-    )
-    wallet_service.record_win.return_value = Transaction(id=uuid.uuid4(), status=TransactionStatus.COMPLETED)
-
-    request = RecordWinRequest(
-        player_id=wallet.player_id,
-        reference_id=f"TEST-WIN-VALID-{str(uuid.uuid4())[:8]}",
-        round_id=f"ROUND-{str(uuid.uuid4())[:8]}",
-        game_id="test_game_boundary",
-        amount=amount,
-        currency=currency
-    )
+    wallet_service.record_win.return_value = _OK_TX
+
+    request = _build_request("record_win", wallet, params)
 
-    print(f"\nTesting valid record_win: Currency={currency}, Amount={amount}")
-    try:
-        await wallet_service.record_win(request, wallet.partner_id)
-        print("Record win call succeeded as expected.")
-    except (InvalidAmountError, ValidationError, CurrencyMismatchError) as e:
-        pytest.fail(f"Valid record_win input raised unexpected exception: {e}")
+    assert wallet_service.record_win.side_effect is None
+    await wallet_service.record_win(request, wallet.partner_id)
 
 # TODO: Add tests for rollback boundaries if applicable
\ No newline at end of file
@@ -1,11 +1,12 @@
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, patch
 from decimal import Decimal
 
-# 필요한 예외 클래스 정의
-class InvalidAmountError(Exception):
-    pass
+from tests.support.balance_cache import pending_cache_tasks, schedule_cache_delete
+from tests.support.wallet_amounts import InvalidAmountError, from_minor, require_positive
+from tests.support.wallet_stubs import StubWalletRepo
 
+# 필요한 예외 클래스 정의
 class InsufficientFundsError(Exception):
     pass
 
@@ -24,7 +25,7 @@ async def withdraw_funds(player_id: str, amount: Decimal, currency: str, wallet_
         player_id (str): 사용자 ID
         amount (Decimal): 출금 금액
         currency (str): 통화 단위
-        wallet_repo: 지갑 저장소 객체
+        wallet_repo: 지갑 저장소 객체 (transaction() 컨텍스트 매니저 지원)
         cache_service: 캐시 서비스 객체 (기본값: None)
         
     Returns:
@@ -36,205 +37,112 @@ async def withdraw_funds(player_id: str, amount: Decimal, currency: str, wallet_
         UserNotFoundError: 사용자를 찾을 수 없는 경우
         WalletOperationError: 지갑 작업 중 오류 발생
     """
-    # 출금 금액 유효성 검사
-    if amount <= Decimal("0"):
-        raise InvalidAmountError("출금 금액은 0보다 커야 합니다")
-    
-    # 기존 잔액 조회
-    current_balance = await wallet_repo.get_balance_by_player_id(player_id, currency)
-    if current_balance is None:
-        raise UserNotFoundError(f"사용자 ID {player_id}를 찾을 수 없습니다")
-    
-    # 잔액 부족 검사
-    if current_balance < amount:
-        raise InsufficientFundsError(f"잔액 부족: 현재 잔액 {current_balance}, 요청 금액 {amount}")
-    
-    # 새 잔액 계산
-    new_balance = current_balance - amount
-    
-    # 트랜잭션 생성
-    transaction_id = await wallet_repo.create_transaction(
-        player_id=player_id,
-        amount=amount, # 출금은 보통 음수로 기록하지 않고 type으로 구분
-        currency=currency,
-        transaction_type="withdraw",
-        status="completed"
-    )
-    
-    # 잔액 업데이트
-    updated_balance_data = await wallet_repo.update_balance(
-        player_id=player_id,
-        new_balance=new_balance,
-        currency=currency,
-        transaction_id=transaction_id
-    )
+    # 출금 금액 유효성 검사 (이후 비교/차감은 모두 정수 연산)
+    amount_minor = require_positive(amount, "출금")
+    
+    # 차감과 거래 기록을 한 트랜잭션에서 수행 (거래 기록에 실패하면 차감도 롤백)
+    async with wallet_repo.transaction() as txn:
+        # 잔액이 충분할 때만 원자적으로 차감 (조건부 UPDATE ... RETURNING)
+        new_balance_minor = await txn.try_debit(player_id, currency, amount_minor)
+        if new_balance_minor is None:
+            # 실패한 경우에만 잔액을 조회해 원인 구분
+            current_balance_minor = await txn.get_balance_by_player_id(player_id, currency)
+            if current_balance_minor is None:
+                raise UserNotFoundError(f"사용자 ID {player_id}를 찾을 수 없습니다")
+            raise InsufficientFundsError(f"잔액 부족: 현재 잔액 {from_minor(current_balance_minor)}, 요청 금액 {amount}")
+
+        # 차감이 반영된 경우에만 트랜잭션 생성
+        transaction_id = await txn.create_transaction(
+            player_id=player_id,
+            amount=amount_minor, # 출금은 보통 음수로 기록하지 않고 type으로 구분
+            currency=currency,
+            transaction_type="withdraw",
+            status="completed"
+        )
+        if transaction_id is None:
+            # 예외로 트랜잭션 범위를 벗어나므로 위의 차감이 롤백됨 (원장 기록 없는 차감 방지)
+            raise WalletOperationError(f"Failed to record withdrawal transaction for player {player_id}")
 
-    # 업데이트 실패 시 처리
-    if updated_balance_data is None:
-        raise WalletOperationError(f"Failed to update balance for player {player_id} during withdrawal")
+    updated_balance_data = {
+        "player_id": player_id,
+        "balance": from_minor(new_balance_minor),
+        "currency": currency,
+        "transaction_id": transaction_id
+    }
 
     # 캐시 업데이트 (캐시 서비스가 있는 경우)
+    # 캐시 삭제는 best-effort 이므로 응답을 기다리지 않고 백그라운드 태스크로 예약
     if cache_service:
-        try:
-            await cache_service.delete(f"balance:{player_id}:{currency}")
-        except Exception as e:
-            print(f"Warning: Failed to delete cache for {player_id}:{currency} during withdrawal - {e}")
-            pass
+        schedule_cache_delete(cache_service, player_id, currency)
     
     return updated_balance_data
 
-# 테스트 케이스
+# 테스트 케이스 (저장소는 호출을 calls 에 기록하는 StubWalletRepo 사용)
+_PLAYER_ID = "user123"
+_CURRENCY = "USD"
+
+# (저장소 잔액, try_debit 결과, create_transaction 결과)는 모두 최소 단위 / None 은 실패를 의미
 @pytest.mark.asyncio
-async def test_withdraw_funds_success():
-    """정상적인 출금 처리를 테스트합니다."""
-    # Mock 객체 생성
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    # Mock 동작 설정
-    player_id = "user123"
-    currency = "USD"
-    current_balance = Decimal("100.00")
-    withdraw_amount = Decimal("50.00")
-    transaction_id = "txn_withdraw_123"
-    expected_new_balance = Decimal("50.00")
-    
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    wallet_repo.update_balance.return_value = {
-        "player_id": player_id,
-        "balance": expected_new_balance,
-        "currency": currency,
-        "updated_at": "2023-01-01T12:00:00Z"
-    }
-    
-    # 함수 실행
-    result = await withdraw_funds(
-        player_id=player_id,
-        amount=withdraw_amount,
-        currency=currency,
+@pytest.mark.parametrize("balance,debited,tx_id,amount,exc,msg,ops", [
+    pytest.param(None, 500000, "txn_withdraw_123", Decimal("50.00"), None, None,
+                 ["try_debit", "create_transaction"], id="success"),
+    pytest.param(None, None, None, Decimal("-10.00"), InvalidAmountError, "0보다 커야 합니다",
+                 [], id="negative_amount"),
+    pytest.param(None, None, None, Decimal("0"), InvalidAmountError, "0보다 커야 합니다",
+                 [], id="zero_amount"),
+    pytest.param(None, None, None, Decimal("50.00"), UserNotFoundError, f"사용자 ID {_PLAYER_ID}를 찾을 수 없습니다",
+                 ["try_debit", "balance"], id="user_not_found"),
+    pytest.param(300000, None, None, Decimal("50.00"), InsufficientFundsError,
+                 "잔액 부족: 현재 잔액 30.00, 요청 금액 50.00",
+                 ["try_debit", "balance"], id="insufficient_balance"),
+    pytest.param(None, 500000, None, Decimal("50.00"), WalletOperationError,
+                 f"Failed to record withdrawal transaction for player {_PLAYER_ID}",
+                 ["try_debit", "create_transaction"], id="create_transaction_fails"),
+])
+async def test_withdraw_funds(balance, debited, tx_id, amount, exc, msg, ops, cache_service):
+    """출금 성공/실패 경로를 한 매트릭스로 테스트합니다."""
+    wallet_repo = StubWalletRepo(balance=balance, tx_id=tx_id, debited_balance=debited)
+    withdrawal = withdraw_funds(
+        player_id=_PLAYER_ID,
+        amount=amount,
+        currency=_CURRENCY,
         wallet_repo=wallet_repo,
         cache_service=cache_service
     )
-    
-    # 검증
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_called_once_with(
-        player_id=player_id,
-        amount=withdraw_amount,
-        currency=currency,
-        transaction_type="withdraw",
-        status="completed"
-    )
-    wallet_repo.update_balance.assert_called_once_with(
-        player_id=player_id,
-        new_balance=expected_new_balance,
-        currency=currency,
-        transaction_id=transaction_id
-    )
-    cache_service.delete.assert_called_once_with(f"balance:{player_id}:{currency}")
-    
-    assert result["player_id"] == player_id
-    assert isinstance(result["balance"], Decimal)
-    assert result["balance"] == expected_new_balance
-    assert result["currency"] == currency
-
-@pytest.mark.asyncio
-async def test_withdraw_funds_invalid_amount():
-    """잘못된 출금 금액(0 또는 음수)을 테스트합니다."""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    
-    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
-        await withdraw_funds(
-            player_id="user123",
-            amount=Decimal("-10.00"),
-            currency="USD",
-            wallet_repo=wallet_repo,
-            cache_service=cache_service
-        )
-    
-    with pytest.raises(InvalidAmountError, match="0보다 커야 합니다"):
-        await withdraw_funds(
-            player_id="user123",
-            amount=Decimal("0"),
-            currency="USD",
-            wallet_repo=wallet_repo,
-            cache_service=cache_service
-        )
-    
-    wallet_repo.get_balance_by_player_id.assert_not_called()
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
-
-@pytest.mark.asyncio
-async def test_withdraw_funds_user_not_found():
-    """존재하지 않는 사용자 테스트"""
-    wallet_repo = AsyncMock()
-    wallet_repo.get_balance_by_player_id.return_value = None
-    player_id = "nonexistent_user"
-
-    with pytest.raises(UserNotFoundError, match=f"사용자 ID {player_id}를 찾을 수 없습니다"):
-        await withdraw_funds(
-            player_id=player_id,
-            amount=Decimal("50.00"),
-            currency="USD",
-            wallet_repo=wallet_repo
-        )
-    
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, "USD")
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
 
-@pytest.mark.asyncio
-async def test_withdraw_funds_insufficient_balance():
-    """잔액 부족 테스트"""
-    wallet_repo = AsyncMock()
-    player_id = "user123"
-    currency = "USD"
-    current_balance = Decimal("30.00")
-    withdraw_amount = Decimal("50.00")
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    
-    with pytest.raises(InsufficientFundsError, match=f"잔액 부족: 현재 잔액 {current_balance}, 요청 금액 {withdraw_amount}"):
-        await withdraw_funds(
-            player_id=player_id,
-            amount=withdraw_amount,
-            currency=currency,
-            wallet_repo=wallet_repo
-        )
-    
-    wallet_repo.get_balance_by_player_id.assert_called_once_with(player_id, currency)
-    wallet_repo.create_transaction.assert_not_called()
-    wallet_repo.update_balance.assert_not_called()
+    if exc is not None:
+        with pytest.raises(exc, match=msg):
+            await withdrawal
+        assert [call[0] for call in wallet_repo.calls] == ops
+        # 차감 후 거래 기록에 실패하면 같은 트랜잭션이 롤백되어 차감도 취소됨
+        assert wallet_repo.transactions == (["rollback"] if ops else [])
+        # 출금이 실패하면 캐시를 삭제하지 않음
+        cache_service.delete.assert_not_called()
+        return
 
-@pytest.mark.asyncio
-async def test_withdraw_funds_update_balance_fails():
-    """잔액 업데이트 실패 테스트"""
-    wallet_repo = AsyncMock()
-    cache_service = AsyncMock()
-    player_id = "user123"
-    currency = "USD"
-    current_balance = Decimal("100.00")
-    withdraw_amount = Decimal("50.00")
-    transaction_id = "txn_update_fail"
+    result = await withdrawal
+    # 백그라운드 캐시 삭제 태스크 완료 대기
+    await asyncio.gather(*pending_cache_tasks)
+    # 성공 경로에서는 잔액을 따로 조회하지 않음
+    assert wallet_repo.calls == [
+        ("try_debit", _PLAYER_ID, _CURRENCY, 500000),
+        ("create_transaction", {
+            "player_id": _PLAYER_ID,
+            "amount": 500000,
+            "currency": _CURRENCY,
+            "transaction_type": "withdraw",
+            "status": "completed",
+        }),
+    ]
+    assert wallet_repo.transactions == ["commit"]
+    cache_service.delete.assert_called_once_with(f"balance:{_PLAYER_ID}:{_CURRENCY}")
 
-    wallet_repo.get_balance_by_player_id.return_value = current_balance
-    wallet_repo.create_transaction.return_value = transaction_id
-    # Simulate update_balance failing by returning None
-    wallet_repo.update_balance.return_value = None 
-    
-    with pytest.raises(WalletOperationError, match=f"Failed to update balance for player {player_id} during withdrawal"):
-        await withdraw_funds(
-            player_id=player_id,
-            amount=withdraw_amount,
-            currency=currency,
-            wallet_repo=wallet_repo,
-            cache_service=cache_service # Include cache service if it should be called before failure
-        )
-    
-    wallet_repo.get_balance_by_player_id.assert_called_once()
-    wallet_repo.create_transaction.assert_called_once()
-    wallet_repo.update_balance.assert_called_once()
-    # Cache should not be deleted if update failed
-    cache_service.delete.assert_not_called() 
\ No newline at end of file
+    assert result == {
+        "player_id": _PLAYER_ID,
+        "balance": Decimal("50.00"),
+        "currency": _CURRENCY,
+        "transaction_id": tx_id,
+    }
+    assert isinstance(result["balance"], Decimal)
+    # 통화 자릿수 유지 (최소 단위 변환으로 "50" 이 되지 않음)
+    assert str(result["balance"]) == "50.00"
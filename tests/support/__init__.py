@@ -0,0 +1,3 @@
+"""
+테스트 공용 헬퍼 모듈
+"""
@@ -0,0 +1,92 @@
+"""
+지갑 테스트 공용 잔액 캐시 헬퍼
+
+place_bet/record_win/withdraw_funds 는 같은 `balance:{player_id}:{currency}` 키를 사용하므로
+키 생성, read-through 조회, 무효화를 한 곳에서 관리합니다. 캐시 값은 항상 저장소의
+get_balance_by_player_id 가 반환하는 (잔액 최소 단위, 버전) 튜플 한 가지 형태만 저장합니다.
+"""
+import asyncio
+import logging
+import weakref
+from functools import lru_cache
+from typing import Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# read-through 잔액 캐시 TTL(초). 쓰기 시 delete 로 무효화되므로 짧게 유지
+BALANCE_CACHE_TTL = 60
+
+# 진행 중인 백그라운드 캐시 무효화 태스크 (테스트/종료 시 대기용, 완료되면 제거)
+pending_cache_tasks: Set[asyncio.Task] = set()
+
+# 캐시 미스 시 같은 (player_id, currency) 에 대한 DB 조회가 몰리지 않도록 하는 키별 잠금
+_balance_fill_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+BalanceRow = Tuple[int, int]
+
+
+@lru_cache(maxsize=4096)
+def balance_cache_key(player_id: str, currency: str) -> str:
+    """잔액 캐시 키 (플레이어/통화 조합은 반복되므로 문자열 생성을 캐시)"""
+    return f"balance:{player_id}:{currency}"
+
+
+def _on_cache_delete_done(task: asyncio.Task) -> None:
+    pending_cache_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("cache delete failed: %s", task.exception())
+
+
+def schedule_cache_delete(cache_service, player_id: str, currency: str) -> asyncio.Task:
+    """잔액 캐시 삭제를 fire-and-forget 태스크로 예약합니다."""
+    task = asyncio.create_task(cache_service.delete(balance_cache_key(player_id, currency)))
+    pending_cache_tasks.add(task)
+    task.add_done_callback(_on_cache_delete_done)
+    return task
+
+
+async def invalidate_balance_cache(cache_service, player_id: str, currency: str) -> None:
+    """오래된 것으로 확인된 캐시 항목을 즉시 삭제합니다 (재조회 전에 완료되어야 하는 경우)."""
+    if cache_service:
+        await cache_service.delete(balance_cache_key(player_id, currency))
+
+
+def _as_balance_row(value: Any) -> Optional[BalanceRow]:
+    """캐시 값이 (잔액, 버전) 형태이면 튜플로 돌려주고, 아니면 None (이전 형식/손상된 값)."""
+    if isinstance(value, (tuple, list)) and len(value) == 2 and all(type(v) is int for v in value):
+        return value[0], value[1]
+    return None
+
+
+async def _read_cached(cache_service, key: str) -> Optional[BalanceRow]:
+    cached = await cache_service.get(key)
+    if cached is None:
+        return None
+    row = _as_balance_row(cached)
+    if row is None:
+        # 버전이 없는 값은 낙관적 갱신에 사용할 수 없으므로 미스로 처리하고 제거
+        logger.warning("discarding malformed balance cache entry %s", key)
+        await cache_service.delete(key)
+    return row
+
+
+async def get_balance_cached(cache_service, wallet_repo, player_id: str, currency: str) -> Optional[BalanceRow]:
+    """(잔액, 버전)을 캐시에서 먼저 읽고, 미스이면 DB 에서 읽어 캐시를 채웁니다 (read-through)."""
+    if not cache_service:
+        return await wallet_repo.get_balance_by_player_id(player_id, currency)
+    key = balance_cache_key(player_id, currency)
+    row = await _read_cached(cache_service, key)
+    if row is not None:
+        return row
+    lock = _balance_fill_locks.get((player_id, currency))
+    if lock is None:
+        lock = _balance_fill_locks[(player_id, currency)] = asyncio.Lock()
+    async with lock:
+        # 잠금 대기 중 다른 요청이 이미 캐시를 채웠을 수 있음
+        row = await _read_cached(cache_service, key)
+        if row is not None:
+            return row
+        row = await wallet_repo.get_balance_by_player_id(player_id, currency)
+        if row is not None:
+            await cache_service.set(key, row, ex=BALANCE_CACHE_TTL)
+        return row
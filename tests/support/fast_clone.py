@@ -0,0 +1,34 @@
+"""
+테스트용 객체 고속 복제 헬퍼
+
+템플릿 객체를 `__init__` 없이 복제하여 생성자/검증 오버헤드를 피합니다.
+세션에 연결되지 않은(detached) 인메모리 테스트 객체에만 사용하세요.
+"""
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# SQLAlchemy 인스턴스 상태 키 (복제본 간에 공유되면 안 됨)
+_SA_STATE_KEY = "_sa_instance_state"
+
+
+def fast_clone(obj: T, **overrides: Any) -> T:
+    """
+    obj의 속성을 복사한 새 인스턴스를 반환합니다. overrides로 일부 속성을 덮어씁니다.
+
+    SQLAlchemy 모델은 클래스 매니저로 새 인스턴스 상태를 만들어 계측(instrumentation)을
+    유지하고, overrides는 setattr로 적용하여 hybrid property setter(예: Transaction.amount)도 동작합니다.
+    """
+    manager = getattr(type(obj), "_sa_class_manager", None)  # 매핑되지 않은 클래스는 None
+    if manager is None:
+        cls = type(obj)
+        new = cls.__new__(cls) # SimpleNamespace 등 C 타입은 object.__new__ 사용 불가
+        new.__dict__.update(obj.__dict__)
+        new.__dict__.update(overrides)
+        return new
+
+    new = manager.new_instance()
+    new.__dict__.update({k: v for k, v in obj.__dict__.items() if k != _SA_STATE_KEY})
+    for key, value in overrides.items():
+        setattr(new, key, value)
+    return new
@@ -0,0 +1,15 @@
+"""
+공유(모듈/세션 스코프) Mock 초기화 헬퍼
+
+부모 Mock 에 reset_mock(return_value=True) 를 적용하면 __bool__/__aenter__ 등 매직 메서드 설정까지
+지워지므로, 테스트가 설정하는 메서드 이름을 명시적으로 받아 메서드 단위로만 초기화합니다.
+"""
+from typing import Iterable
+from unittest.mock import Mock
+
+
+def reset_mock_methods(mock: Mock, names: Iterable[str]) -> None:
+    """mock 의 호출 기록과 names 에 해당하는 메서드의 호출 기록/반환값/side_effect 를 초기화합니다."""
+    mock.reset_mock()
+    for name in names:
+        getattr(mock, name).reset_mock(return_value=True, side_effect=True)
@@ -0,0 +1,55 @@
+"""
+지갑 테스트 공용 금액/메타데이터 헬퍼
+
+place_bet/record_win/withdraw_funds 는 저장소와 금액/잔액을 정수 최소 단위(1 단위 = 10000)로 주고받고,
+API 경계에서만 Decimal 로 변환합니다. 금액 검증/변환 규칙이 모듈마다 달라지지 않도록 한 곳에 둡니다.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Union
+
+# 지갑 금액 고정 소수 자릿수 (1 = 10^-4 통화 단위)
+MINOR_PER_UNIT = 10000
+# API 경계에서 돌려주는 금액의 통화 자릿수 (예: "30.00")
+CURRENCY_QUANT = Decimal("0.01")
+
+
+@dataclass(frozen=True, slots=True)
+class OpMetadata:
+    """지갑 연산 메타데이터 (호출마다 dict 를 만들지 않도록 slots 객체 사용, orjson 이 그대로 직렬화)"""
+    game_id: str
+    session_id: str
+
+
+def to_minor(amount: Decimal) -> int:
+    """Decimal 금액을 정수 최소 단위(BIGINT 컬럼 값)로 변환합니다."""
+    return int((amount * MINOR_PER_UNIT).to_integral_value())
+
+
+def from_minor(amount_minor: int) -> Decimal:
+    """정수 최소 단위를 API 경계에서 사용할 Decimal 금액으로 변환합니다 (통화 자릿수 0.01 로 고정)."""
+    return (Decimal(amount_minor) / MINOR_PER_UNIT).quantize(CURRENCY_QUANT)
+
+
+class InvalidAmountError(Exception):
+    """금액이 0 이하인 경우"""
+
+
+def require_positive(amount: Union[int, Decimal], op: str) -> int:
+    """금액이 0보다 큰지 검사하고 정수 최소 단위로 변환해 반환합니다. (Cython 컴파일 후보)
+
+    int 금액은 Decimal 연산 없이 바로 비교/변환하고, float 는 정밀도 손실 때문에 거부합니다.
+    bool 은 int 의 하위 클래스라 True 가 1 단위로 통과하므로 int 검사 전에 거부합니다.
+    """
+    if isinstance(amount, bool):
+        raise TypeError(f"{op} 금액에 bool 은 사용할 수 없습니다 (Decimal 또는 int 사용)")
+    if type(amount) is int:
+        if amount <= 0:
+            raise InvalidAmountError(f"{op} 금액은 0보다 커야 합니다")
+        return amount * MINOR_PER_UNIT
+    if isinstance(amount, float):
+        raise TypeError(f"{op} 금액에 float 는 사용할 수 없습니다 (Decimal 또는 int 사용)")
+    amount_minor = to_minor(amount)
+    if amount_minor <= 0:
+        raise InvalidAmountError(f"{op} 금액은 0보다 커야 합니다")
+    return amount_minor
@@ -0,0 +1,57 @@
+"""
+지갑 저장소 경량 스텁
+
+성공 경로 테스트에서 AsyncMock 대신 사용합니다. 고정된 값을 반환하고 호출만 `calls`에
+튜플로 기록하므로 AsyncMock 의 호출 기록(_Call 생성, call_args_list 관리) 비용이 없습니다.
+side_effect 나 patch 가 필요한 테스트는 계속 AsyncMock 을 사용하세요.
+"""
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+
+class StubWalletRepo:
+    """place_bet/record_win/withdraw_funds 가 사용하는 저장소 메서드만 구현한 스텁"""
+
+    def __init__(
+        self,
+        balance: Any = None,
+        tx_id: Optional[str] = None,
+        updated: Optional[dict] = None,
+        debited_balance: Any = None,
+    ):
+        self._balance = balance
+        self._tx_id = tx_id
+        self._op_result = (tx_id, updated)
+        self._debited_balance = debited_balance
+        self.calls: List[Tuple[Any, ...]] = []
+        # transaction() 범위의 종료 결과 ("commit" 또는 "rollback") 기록
+        self.transactions: List[str] = []
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator["StubWalletRepo"]:
+        try:
+            yield self
+        except BaseException:
+            self.transactions.append("rollback")
+            raise
+        self.transactions.append("commit")
+
+    async def get_balance_by_player_id(self, player_id: str, currency: str) -> Any:
+        self.calls.append(("balance", player_id, currency))
+        return self._balance
+
+    async def debit_atomic(self, **kwargs: Any) -> Tuple[Optional[str], Optional[dict]]:
+        self.calls.append(("debit_atomic", kwargs))
+        return self._op_result
+
+    async def apply_wallet_op(self, **kwargs: Any) -> Tuple[Optional[str], Optional[dict]]:
+        self.calls.append(("apply_wallet_op", kwargs))
+        return self._op_result
+
+    async def try_debit(self, player_id: str, currency: str, amount: Any) -> Any:
+        self.calls.append(("try_debit", player_id, currency, amount))
+        return self._debited_balance
+
+    async def create_transaction(self, **kwargs: Any) -> Optional[str]:
+        self.calls.append(("create_transaction", kwargs))
+        return self._tx_id
@@ -0,0 +1,57 @@
+import io
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+from backend.core.logging import DeferredFormatQueueHandler, JsonFormatter
+
+
+def test_queue_logging_keeps_structured_exception():
+    """큐를 거친 ERROR 로그도 JSON exception 필드(트레이스백 포함)를 유지하는지 테스트"""
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream = io.StringIO()
+    output_handler = logging.StreamHandler(stream)
+    output_handler.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, output_handler)
+
+    test_logger = logging.getLogger("tests.unit.core.queue_logging")
+    test_logger.propagate = False
+    queue_handler = DeferredFormatQueueHandler(log_queue)
+    test_logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_logger.exception("failed for %s", "player-1")
+    finally:
+        listener.stop()
+        test_logger.removeHandler(queue_handler)
+
+    log_data = json.loads(stream.getvalue())
+    assert log_data["message"] == "failed for player-1"
+    assert log_data["exception"]["type"] == "ValueError"
+    assert log_data["exception"]["message"] == "boom"
+    assert "Traceback" in log_data["exception"]["traceback"]
+    # 트레이스백이 메시지에 섞이지 않아야 함
+    assert "Traceback" not in log_data["message"]
+
+
+def test_deferred_queue_handler_does_not_format():
+    """prepare 는 exc_info 를 유지하고 포맷된 예외 텍스트를 만들지 않아야 함"""
+    log_queue: queue.Queue = queue.Queue(-1)
+    handler = DeferredFormatQueueHandler(log_queue)
+    try:
+        raise KeyError("k")
+    except KeyError:
+        record = logging.LogRecord("t", logging.ERROR, __file__, 1, "x=%d", (1,), exc_info=sys.exc_info())
+
+    handler.emit(record)
+    queued = log_queue.get_nowait()
+
+    assert queued is not record
+    assert queued.exc_info is not None
+    assert queued.exc_text is None
+    assert queued.getMessage() == "x=1"
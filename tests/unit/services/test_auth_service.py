@@ -62,19 +62,18 @@ async def test_authenticate_api_key_valid(auth_service):
     auth_service.redis.get.return_value = None
     
     # 리포지토리 모의 응답 설정
-    auth_service.partner_repo.get_active_api_key_by_hash.return_value = api_key_obj
-    auth_service.partner_repo.get_partner_by_id.return_value = partner
+    auth_service.partner_repo.get_active_api_key_with_partner_by_hash.return_value = (api_key_obj, partner)
     
-    # hash_api_key 함수 패치 (경로 수정 가능성)
-    with patch('backend.services.auth.auth_service.get_password_hash', return_value=api_key_hash):
+    # hash_api_key 함수 패치
+    with patch('backend.services.auth.auth_service.hash_api_key', return_value=api_key_hash):
         # 테스트 대상 함수 호출
         result_api_key, result_partner = await auth_service.authenticate_api_key(api_key)
         
         # 결과 검증
         assert result_api_key == api_key_obj
         assert result_partner == partner
-        auth_service.partner_repo.get_active_api_key_by_hash.assert_called_with(api_key_hash)
-        auth_service.partner_repo.get_partner_by_id.assert_called_with(api_key_obj.partner_id)
+        auth_service.partner_repo.get_active_api_key_with_partner_by_hash.assert_called_with(api_key_hash)
+        auth_service.partner_repo.get_partner_by_id.assert_not_called()
         auth_service.redis.set.assert_called_once()  # 캐시 저장 호출 확인
 
 @pytest.mark.asyncio
@@ -99,11 +98,10 @@ async def test_authenticate_api_key_expired(auth_service):
     auth_service.redis.get.return_value = None
     
     # 리포지토리 모의 응답 설정
-    auth_service.partner_repo.get_active_api_key_by_hash.return_value = api_key_obj
+    auth_service.partner_repo.get_active_api_key_with_partner_by_hash.return_value = (api_key_obj, MagicMock(status="active"))
     
-    # hash_api_key 함수 패치 (경로 확인 필요, 여기서는 get_password_hash 사용 가정)
-    # Use the same target as in the other test file for consistency
-    with patch('backend.core.security.get_password_hash', return_value=api_key_hash):
+    # hash_api_key 함수 패치
+    with patch('backend.services.auth.auth_service.hash_api_key', return_value=api_key_hash):
         # 예외 발생 확인
         with pytest.raises(AuthenticationError) as exc_info:
             await auth_service.authenticate_api_key(api_key)
@@ -119,9 +117,7 @@ async def test_verify_ip_whitelist_allowed(auth_service):
     client_ip = "192.168.1.1"
     
     # 허용된 IP 목록 설정
-    allowed_ips = [
-        MagicMock(ip_address=client_ip)
-    ]
+    allowed_ips = frozenset({client_ip})
     
     # 리포지토리 모의 응답 설정
     auth_service.partner_repo.get_allowed_ips.return_value = allowed_ips
@@ -141,9 +137,7 @@ async def test_verify_ip_whitelist_not_allowed(auth_service):
     client_ip = "192.168.1.2"
     
     # 허용된 IP 목록 설정 (테스트 IP는 포함되지 않음)
-    allowed_ips = [
-        MagicMock(ip_address="192.168.1.1")
-    ]
+    allowed_ips = frozenset({"192.168.1.1"})
     
     # 리포지토리 모의 응답 설정
     auth_service.partner_repo.get_allowed_ips.return_value = allowed_ips
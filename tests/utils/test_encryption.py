@@ -6,50 +6,50 @@ from unittest.mock import patch, MagicMock
 
 from backend.utils.encryption import (
     encrypt_aes_gcm, decrypt_aes_gcm, 
-    DataEncryptor, get_encryptor, _get_aes_gcm_key
+    DataEncryptor, get_encryptor, _get_aes_gcm_key, reset_key_cache, set_aes_gcm_key
 )
 
 # AES-GCM 테스트를 위한 픽스처
-@pytest.fixture
+@pytest.fixture(scope="module")
 def setup_aes_gcm_key():
-    """AES-GCM 테스트를 위한 환경 설정"""
+    """AES-GCM 테스트를 위한 키 설정 (모듈 당 1회, 환경 변수 대신 set_aes_gcm_key 로 주입)
+
+    주입된 키는 모든 AES-GCM 호출에 적용되므로 다른 테스트 모듈로 새지 않도록 모듈 종료 시 해제
+    """
     # 32바이트(256비트) 키 생성
-    original_key = os.getenv("AESGCM_KEY_B64")
-    test_key = base64.urlsafe_b64encode(os.urandom(32)).decode('utf-8')
-    
-    # 환경 변수 설정
-    os.environ["AESGCM_KEY_B64"] = test_key
+    key_bytes = os.urandom(32)
+    set_aes_gcm_key(key_bytes)
     
-    yield test_key
+    yield base64.urlsafe_b64encode(key_bytes).decode('utf-8')
     
     # 원래 상태로 복원
-    if original_key:
-        os.environ["AESGCM_KEY_B64"] = original_key
-    else:
-        # 키가 원래 없었다면 삭제
-        if "AESGCM_KEY_B64" in os.environ:
-             del os.environ["AESGCM_KEY_B64"]
+    set_aes_gcm_key(None)
+    reset_key_cache()
 
-# Fernet 테스트를 위한 픽스처
 @pytest.fixture
-def setup_fernet_key():
-    """Fernet 테스트를 위한 환경 설정"""
+def env_aes_gcm_key(monkeypatch):
+    """주입된 키를 해제하고 환경 변수 경로(AESGCM_KEY_B64)로 키를 읽도록 설정"""
+    monkeypatch.setattr("backend.utils.encryption._aes_gcm_key_override", None)
+    monkeypatch.delenv("AESGCM_KEY_B64", raising=False)
+    yield monkeypatch
+    reset_key_cache()
+
+# Fernet 테스트를 위한 픽스처
+@pytest.fixture(scope="session")
+def fernet_test_key():
+    """Fernet 테스트 키 (세션 당 1회 생성)"""
     from cryptography.fernet import Fernet
-    
-    original_key = os.getenv("ENCRYPTION_KEY")
-    test_key = Fernet.generate_key().decode()
-    
-    os.environ["ENCRYPTION_KEY"] = test_key
-    
-    yield test_key
-    
-    # 원래 상태로 복원
-    if original_key:
-        os.environ["ENCRYPTION_KEY"] = original_key
-    else:
-        # 키가 원래 없었다면 삭제
-        if "ENCRYPTION_KEY" in os.environ:
-            del os.environ["ENCRYPTION_KEY"]
+    return Fernet.generate_key().decode()
+
+@pytest.fixture
+def setup_fernet_key(fernet_test_key, monkeypatch):
+    """Fernet 테스트를 위한 환경 설정
+
+    루트 conftest 의 autouse setup_env 가 테스트마다 ENCRYPTION_KEY 를 덮어쓰므로
+    환경 변수 설정은 테스트 단위로 유지 (키 생성만 세션 당 1회)
+    """
+    monkeypatch.setenv("ENCRYPTION_KEY", fernet_test_key)
+    return fernet_test_key
 
 # _get_aes_gcm_key 함수 직접 테스트
 def test_get_aes_gcm_key_valid(setup_aes_gcm_key):
@@ -60,35 +60,35 @@ def test_get_aes_gcm_key_valid(setup_aes_gcm_key):
     assert len(base64.urlsafe_b64decode(setup_aes_gcm_key)) == 32
     assert len(key) == 32
 
-def test_get_aes_gcm_key_missing():
+def test_get_aes_gcm_key_missing(env_aes_gcm_key):
     """환경 변수가 없을 때 None을 반환하는지 테스트"""
-    original_key = os.getenv("AESGCM_KEY_B64")
-    if "AESGCM_KEY_B64" in os.environ:
-        del os.environ["AESGCM_KEY_B64"]
-
     key = _get_aes_gcm_key()
     assert key is None
 
-    # 원래 상태 복원 (테스트 실행 전 키가 있었다면)
-    if original_key:
-        os.environ["AESGCM_KEY_B64"] = original_key
-
-def test_get_aes_gcm_key_invalid_length():
+def test_get_aes_gcm_key_invalid_length(env_aes_gcm_key):
     """키 길이가 잘못되었을 때 None을 반환하는지 테스트"""
-    original_key = os.getenv("AESGCM_KEY_B64")
     # 잘못된 길이의 키 설정 (32바이트가 아님)
     invalid_key_b64 = base64.urlsafe_b64encode(os.urandom(16)).decode('utf-8')
-    os.environ["AESGCM_KEY_B64"] = invalid_key_b64
+    env_aes_gcm_key.setenv("AESGCM_KEY_B64", invalid_key_b64)
 
     key = _get_aes_gcm_key()
     assert key is None
 
-    # 원래 상태 복원
-    if original_key:
-        os.environ["AESGCM_KEY_B64"] = original_key
-    else:
-        if "AESGCM_KEY_B64" in os.environ:
-            del os.environ["AESGCM_KEY_B64"]
+def test_get_aes_gcm_key_decodes_once(env_aes_gcm_key):
+    """같은 키 값은 한 번만 디코딩되는지 테스트"""
+    env_aes_gcm_key.setenv("AESGCM_KEY_B64", base64.urlsafe_b64encode(os.urandom(32)).decode('utf-8'))
+    reset_key_cache()
+    with patch('backend.utils.encryption.base64.urlsafe_b64decode', wraps=base64.urlsafe_b64decode) as mock_decode:
+        first = _get_aes_gcm_key()
+        second = _get_aes_gcm_key()
+    assert first == second
+    assert mock_decode.call_count == 1
+
+
+def test_set_aes_gcm_key_invalid_length():
+    """32바이트가 아닌 키 주입 시 ValueError 발생 테스트"""
+    with pytest.raises(ValueError):
+        set_aes_gcm_key(os.urandom(16))
 
 
 # AES-GCM 테스트
@@ -183,6 +183,10 @@ def test_get_encryptor_singleton(setup_fernet_key):
     # 동일한 인스턴스인지 확인
     assert encryptor1 is encryptor2
 
+def test_data_encryptor_reuses_fernet_per_key(setup_fernet_key):
+    """같은 키로 생성한 DataEncryptor 는 캐시된 Fernet 인스턴스를 공유"""
+    assert DataEncryptor().cipher is DataEncryptor().cipher
+
 def test_data_encryptor_different_keys(setup_fernet_key):
     """다른 키로 생성된 Encryptor는 데이터를 복호화할 수 없음"""
     from cryptography.fernet import Fernet